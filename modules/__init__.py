@@ -10,5 +10,26 @@ from .command_handler import CommandHandler
 from .process_detector import ProcessDetector
 from .pacman_handler import PacmanHandler
 from .location_weather import LocationWeatherService
+from .prompt_cache import PromptCache
+from .speech_pipeline import SentenceChunker, SpeechPipeline
+from .prompt_builder import PromptBuilder, PromptSection
+from .conversation_memory import ConversationMemory
+from .response_cache import ResponseCache
+from .intent_router import IntentRouter, Route
+from .startup import BackgroundLoader, StartupProfiler
+from .llm_tuner import tune as tune_llm
+from .model_server import ModelClient, ModelServer
+from .llm_scheduler import GenerationJob, LLMScheduler
+from .speculative import GGUFDraftModel, create_draft
+from .structured_actions import Action, parse_action
+from .length_policy import EarlyStopper, LengthPolicy
+from .presets import measure_speed, resolve_preset
+from .model_router import ModelRouter
+from .context_compressor import ContextCompressor
+from .perf_metrics import PerfMetrics
+from .gpu_telemetry import GPUTelemetry
+from .metrics_history import MetricsHistory
+from .alert_engine import AlertEngine
+from .process_table import ProcessTable
 
-__all__ = ['SearchEngine', 'SystemMonitor', 'CommandHandler', 'ProcessDetector', 'PacmanHandler', 'LocationWeatherService']
+__all__ = ['SearchEngine', 'SystemMonitor', 'CommandHandler', 'ProcessDetector', 'PacmanHandler', 'LocationWeatherService', 'PromptCache', 'SentenceChunker', 'SpeechPipeline', 'PromptBuilder', 'PromptSection', 'ConversationMemory', 'ResponseCache', 'IntentRouter', 'Route', 'BackgroundLoader', 'StartupProfiler', 'tune_llm', 'ModelClient', 'ModelServer', 'GenerationJob', 'LLMScheduler', 'GGUFDraftModel', 'create_draft', 'Action', 'parse_action', 'EarlyStopper', 'LengthPolicy', 'measure_speed', 'resolve_preset', 'ModelRouter', 'ContextCompressor', 'PerfMetrics', 'GPUTelemetry', 'MetricsHistory', 'AlertEngine', 'ProcessTable']
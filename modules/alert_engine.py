@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+WavesAI Alert Engine Module
+Threshold rules with hysteresis, hold times and cool-downs, evaluated on the sampler's snapshots
+"""
+
+import time
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class AlertRule:
+    """Raise when metric >= threshold for hold seconds; clear once it drops below threshold - margin"""
+    name: str
+    metric: str
+    threshold: float
+    message: str                      # Formatted with {value}
+    critical: Optional[float] = None
+    critical_message: str = None
+    clear_message: str = None
+    margin: float = 5.0
+    hold: float = 0.0
+
+    def level(self, value: float) -> Optional[str]:
+        if self.critical is not None and value >= self.critical:
+            return 'critical'
+        if value >= self.threshold:
+            return 'warning'
+        return None
+
+    def describe(self, value: float, level: str) -> str:
+        template = self.critical_message if level == 'critical' and self.critical_message else self.message
+        return template.format(value=value)
+
+
+@dataclass
+class AlertEvent:
+    kind: str       # 'raise', 'escalate' or 'clear'
+    rule: str
+    severity: str   # 'warning' or 'critical' ('ok' for clear)
+    value: float
+    message: str
+    at: float
+
+
+class _RuleState:
+    __slots__ = ('above_since', 'severity', 'silent', 'last_raised', 'last_severity')
+
+    def __init__(self):
+        self.above_since = None
+        self.severity = None    # Active severity, None when the alert is not raised
+        self.silent = False     # Raised during the cool-down: neither raise nor clear is published
+        self.last_raised = float('-inf')
+        self.last_severity = None   # Severity of the last published raise/escalate
+
+
+def default_rules(thresholds: Dict = None) -> List[AlertRule]:
+    """The standard rule set; thresholds overrides the warning levels (performance.max_* in config)"""
+    t = dict(cpu=85, ram=80, swap=80, disk=85, cpu_temp=80, gpu_temp=85)
+    t.update({k: v for k, v in (thresholds or {}).items() if v is not None})
+    return [
+        AlertRule('cpu', 'cpu', t['cpu'], "CPU usage is elevated at {value:.0f}%",
+                  critical=max(95, t['cpu']), hold=15,
+                  critical_message="Sir, CPU usage is critically high at {value:.0f}%. Would you like me to identify the process?",
+                  clear_message="CPU usage back to {value:.0f}%"),
+        AlertRule('ram', 'ram', t['ram'], "Memory usage is high at {value:.0f}%",
+                  critical=max(90, t['ram']),
+                  critical_message="Sir, memory usage is at {value:.0f}%. Consider closing some applications.",
+                  clear_message="Memory usage back to {value:.0f}%"),
+        AlertRule('swap', 'swap', t['swap'], "Swap usage is high at {value:.0f}%. System may be slow.",
+                  clear_message="Swap usage back to {value:.0f}%"),
+        AlertRule('disk', 'disk', t['disk'], "Disk space is running low ({value:.0f}% used)",
+                  critical=max(95, t['disk']), margin=2,
+                  critical_message="Sir, disk space is critically low ({value:.0f}% used). Shall I clean up temporary files?",
+                  clear_message="Disk usage back to {value:.0f}%"),
+        AlertRule('cpu_temp', 'cpu_temp', t['cpu_temp'], "CPU temperature is elevated at {value:.0f}°C",
+                  critical=t['cpu_temp'] + 10, hold=10,
+                  critical_message="Sir, CPU temperature is critically high at {value:.0f}°C. Consider checking cooling.",
+                  clear_message="CPU temperature back to {value:.0f}°C"),
+        AlertRule('gpu_temp', 'gpu_temp', t['gpu_temp'], "GPU temperature is elevated at {value:.0f}°C",
+                  critical=t['gpu_temp'] + 10, hold=10,
+                  critical_message="Sir, GPU temperature is critically high at {value:.0f}°C. Consider checking cooling.",
+                  clear_message="GPU temperature back to {value:.0f}°C"),
+        AlertRule('zombies', 'zombies', 1, "Found {value:.0f} zombie process(es)", critical=6, margin=0.5,
+                  critical_message="Sir, found {value:.0f} zombie processes. Would you like me to clean them up?",
+                  clear_message="Zombie processes cleared"),
+    ]
+
+
+class AlertEngine:
+    """Turns a stream of metric values into raise/escalate/clear events
+
+    evaluate() is called once per sampler snapshot and only compares numbers, so it never
+    samples anything itself. An alert is raised after its value stays at or above the
+    threshold for the rule's hold time, and cleared only when the value falls below
+    threshold - margin, so a reading hovering at the limit does not flap. A rule that
+    re-raises within cooldown seconds of its previous raise stays quiet (no raise and no
+    matching clear) unless it comes back at a higher severity than was last published.
+    Events are handed to subscribers on a dispatch thread, so a slow subscriber (speech,
+    notify-send) never delays sampling.
+    """
+
+    def __init__(self, rules: List[AlertRule] = None, cooldown: float = 300):
+        self.rules = rules if rules is not None else default_rules()
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self._state: Dict[str, _RuleState] = {rule.name: _RuleState() for rule in self.rules}
+        self._active: Dict[str, AlertEvent] = {}
+        self._subscribers: List[Callable[[AlertEvent], None]] = []
+        self._queue: "queue.Queue[AlertEvent]" = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[AlertEvent], None]):
+        with self.lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="wavesai-alerts", daemon=True)
+                self._dispatcher.start()
+
+    def unsubscribe(self, callback: Callable[[AlertEvent], None]):
+        with self.lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def evaluate(self, values: Dict[str, float], now: float = None) -> List[AlertEvent]:
+        """Update every rule with the latest values (missing or None values leave a rule as it is)"""
+        now = time.time() if now is None else now
+        events = []
+        with self.lock:
+            for rule in self.rules:
+                value = values.get(rule.metric)
+                if value is None:
+                    continue
+                event = self._step(rule, self._state[rule.name], float(value), now)
+                if event is not None:
+                    events.append(event)
+        for event in events:
+            self._queue.put(event)
+        return events
+
+    def active(self) -> List[AlertEvent]:
+        """Alerts currently raised (including ones kept quiet by the cool-down)"""
+        with self.lock:
+            return list(self._active.values())
+
+    def check(self, values: Dict[str, float]) -> List[str]:
+        """Messages for every rule the values exceed right now, ignoring hold times and state"""
+        messages = []
+        for rule in self.rules:
+            value = values.get(rule.metric)
+            level = rule.level(float(value)) if value is not None else None
+            if level:
+                messages.append(rule.describe(float(value), level))
+        return messages
+
+    def _step(self, rule: AlertRule, state: _RuleState, value: float, now: float) -> Optional[AlertEvent]:
+        level = rule.level(value)
+        if state.severity is not None:
+            if value < rule.threshold - rule.margin:
+                state.severity = None
+                state.above_since = None
+                self._active.pop(rule.name, None)
+                if state.silent:
+                    return None
+                message = (rule.clear_message or rule.name + " back to normal ({value:.0f})").format(value=value)
+                return AlertEvent('clear', rule.name, 'ok', value, message, now)
+            if level == 'critical' and state.severity == 'warning':
+                state.severity = 'critical'
+                event = AlertEvent('escalate', rule.name, 'critical', value, rule.describe(value, 'critical'), now)
+                self._active[rule.name] = event
+                # Getting worse is always worth hearing about, cool-down or not
+                state.silent = False
+                state.last_raised = now
+                state.last_severity = 'critical'
+                return event
+            return None
+
+        if level is None:
+            state.above_since = None
+            return None
+        if state.above_since is None:
+            state.above_since = now
+        if now - state.above_since < rule.hold:
+            return None
+        state.severity = level
+        event = AlertEvent('raise', rule.name, level, value, rule.describe(value, level), now)
+        self._active[rule.name] = event
+        # The cool-down only holds back repeats at the same or a lower severity
+        worse = level == 'critical' and state.last_severity != 'critical'
+        state.silent = now - state.last_raised < self.cooldown and not worse
+        if state.silent:
+            return None
+        state.last_raised = now
+        state.last_severity = level
+        return event
+
+    def _dispatch(self):
+        while True:
+            event = self._queue.get()
+            with self.lock:
+                subscribers = list(self._subscribers)
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception:
+                    pass
@@ -10,25 +10,34 @@ from typing import Optional, Dict
 from .pacman_handler import PacmanHandler
 from .process_detector import ProcessDetector
 from .error_analyzer import get_error_analyzer
+from .intent_router import IntentRouter
+from .metrics_history import MetricsHistory, answer_history_query, parse_history_query
 
 
 class CommandHandler:
     """Handles command parsing and execution"""
     
-    def __init__(self):
+    def __init__(self, intent_router: IntentRouter = None, metrics_history: MetricsHistory = None):
         self.pacman_handler = PacmanHandler()
         self.process_detector = ProcessDetector()
+        self.intent_router = intent_router or IntentRouter()
+        self.metrics_history = metrics_history
     
     def smart_execute(self, user_input: str, system_context: Dict) -> Optional[str]:
         """Handle common queries without AI inference"""
         lower_input = user_input.lower().strip()
+        route = self.intent_router.route(user_input)
         
         # Time/Date queries
-        time_keywords = ['what time', 'what is the time', 'tell me the time', 'current time', 
-                        'what\'s the time', 'time is it', 'show time']
-        if any(keyword in lower_input for keyword in time_keywords):
+        if route.intent == 'time':
             return f"The current time is {system_context['current_time']}, sir."
         
+        # Trend questions ("what was my CPU an hour ago") are answered from the metrics history
+        if self.metrics_history is not None:
+            query = parse_history_query(user_input)
+            if query:
+                return answer_history_query(self.metrics_history, query)
+        
         # System update commands
         if any(phrase in lower_input for phrase in ['update system', 'update arch', 'system update', 
                                                       'upgrade system', 'pacman -syu', 'pacman update']):
@@ -46,15 +55,9 @@ class CommandHandler:
         if lower_input.startswith('launch ') or lower_input.startswith('run '):
             return self._handle_launch_command(lower_input)
         
-        # News queries - let AI handle with search context
-        news_keywords = ['latest news', 'indian news', 'world news', 'breaking news', 'news today', 'current news']
-        if any(keyword in lower_input for keyword in news_keywords):
-            return None  # Let AI handle with search context
-        
-        # Weather queries - let AI handle with weather context
-        weather_keywords = ['weather', 'temperature', 'climate', 'forecast', 'rain', 'sunny', 'cloudy']
-        if any(keyword in lower_input for keyword in weather_keywords):
-            return None  # Let AI handle with weather context
+        # News and weather queries - let AI handle with search/weather context
+        if route.intent in ('news', 'weather'):
+            return None
         
         # Quick system stats
         if lower_input in ['stats', 'quick status', 'system']:
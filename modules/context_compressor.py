@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+WavesAI Context Compressor Module
+Extractive compression of retrieved text: BM25-ranked sentences kept within a token budget
+"""
+
+import re
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+STOPWORDS = frozenset("""a an and are as at be but by can could did do does for from had has have how i in
+into is it its me my no not of on or our so than that the their them then there these they this to was
+we were what when where which who whom why will with would you your tell give show about latest""".split())
+
+
+def _terms(text: str) -> List[str]:
+    terms = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOPWORDS or len(word) < 2:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]  # Crude plural folding: "elections" matches "election"
+        terms.append(word)
+    return terms
+
+
+class _Block:
+    """A paragraph of retrieved text: header and attribution lines travel with its sentences"""
+
+    def __init__(self, section: int):
+        self.section = section
+        self.lines: List[tuple] = []  # (kind, indent, text) with kind 'header', 'source' or 'body'
+        self.units: List[int] = []    # Indices into the compressor's unit list
+
+
+class ContextCompressor:
+    """Ranks retrieved sentences against the query with BM25 and keeps the best ones
+
+    Retrieved text is split into sections (banner lines such as "📚 WIKIPEDIA KNOWLEDGE:"),
+    paragraphs and sentences. Sentences (and numbered headline titles) are scored with
+    BM25, with a small bonus for leading sentences and earlier paragraphs so that
+    queries sharing no terms with the text fall back to reading order. The best units
+    are added greedily while they fit; each kept sentence brings its paragraph's header
+    and "Source:" lines, so attribution survives. The result keeps the original order.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    LEAD_BONUS = 0.15
+    POSITION_BONUS = 0.1
+
+    _banner = re.compile(r"^\W+\s*[A-Z][A-Z ]{3,}.*:\s*$")
+    _source = re.compile(r"^\*?\s*(Source|Score)\b", re.IGNORECASE)
+    _header = re.compile(r"^(\d+\.\s+)?\*\*[^*]+\*\*:?\s*$")
+    _numbered = re.compile(r"^\d+\.\s+")
+    _sentence = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+
+    def __init__(self):
+        self.last: Dict = {}
+
+    def compress(self, text: str, query: str, budget: int,
+                 count: Callable[[str], int] = None) -> str:
+        """Text cut down to at most ~budget tokens of the sentences most relevant to query"""
+        count = count or (lambda s: len(s) // 4 + 1)
+        before = count(text)
+        if before <= budget:
+            self.last = {'before': before, 'after': before, 'units': 0, 'kept': 0}
+            return text
+
+        banners, blocks, units = self._split(text)
+        scores = self._scores([u[1] for u in units], query)
+        n_blocks = max(1, len(blocks))
+        for i, (block_index, _text, lead) in enumerate(units):
+            scores[i] += self.LEAD_BONUS * lead + self.POSITION_BONUS * (1 - block_index / n_blocks)
+
+        # Headline titles are paid for with their paragraph's header lines
+        unit_cost = [0 if self._numbered.match(u[1]) else count(u[1]) + 1 for u in units]
+        block_cost = [sum(count(line) + 1 for kind, _, line in b.lines if kind != 'body') for b in blocks]
+        banner_cost = {i: count(b) + 2 for i, b in banners.items()}
+        used = 0
+        kept = set()
+        open_blocks = set()
+        open_sections = set()
+        for i in np.argsort(-scores, kind='stable'):
+            block_index = units[i][0]
+            section = blocks[block_index].section
+            cost = unit_cost[i]
+            if block_index not in open_blocks:
+                cost += block_cost[block_index] + 2
+            if section not in open_sections and section in banner_cost:
+                cost += banner_cost[section]
+            if used + cost > budget:
+                continue
+            used += cost
+            kept.add(int(i))
+            open_blocks.add(block_index)
+            open_sections.add(section)
+
+        result = self._render(banners, blocks, units, kept)
+        self.last = {'before': before, 'after': count(result), 'units': len(units), 'kept': len(kept)}
+        return result
+
+    def _split(self, text: str):
+        banners: Dict[int, str] = {}
+        blocks: List[_Block] = []
+        units: List[tuple] = []  # (block index, text, is_lead)
+        section = -1
+        for paragraph in re.split(r"\n\s*\n", text):
+            block = None
+            for raw in paragraph.split("\n"):
+                line = raw.strip()
+                if not line:
+                    continue
+                if self._banner.match(line):
+                    section += 1
+                    banners[section] = line
+                    block = None
+                    continue
+                if block is None:
+                    block = _Block(section)
+                    blocks.append(block)
+                indent = raw[:len(raw) - len(raw.lstrip())]
+                if self._source.match(line.strip('* ')):
+                    block.lines.append(('source', indent, line))
+                elif self._header.match(line):
+                    block.lines.append(('header', indent, line))
+                    if self._numbered.match(line):
+                        # Headline titles are content too: score them like sentences
+                        block.units.append(len(units))
+                        units.append((len(blocks) - 1, line, True))
+                else:
+                    parts = [s for s in self._sentence.split(line) if s.strip()]
+                    body = []
+                    for part in parts:
+                        body.append(len(units))
+                        units.append((len(blocks) - 1, part, not block.units))
+                        block.units.append(body[-1])
+                    block.lines.append(('body', indent, body))
+        return banners, blocks, units
+
+    def _scores(self, texts: List[str], query: str) -> np.ndarray:
+        """BM25 score of each text against the query terms"""
+        vocab = {t: i for i, t in enumerate(dict.fromkeys(_terms(query)))}
+        scores = np.zeros(len(texts))
+        if not vocab or not texts:
+            return scores
+        tf = np.zeros((len(texts), len(vocab)))
+        lengths = np.zeros(len(texts))
+        for row, text in enumerate(texts):
+            terms = _terms(text)
+            lengths[row] = len(terms)
+            for term in terms:
+                col = vocab.get(term)
+                if col is not None:
+                    tf[row, col] += 1
+        df = (tf > 0).sum(axis=0)
+        idf = np.log1p((len(texts) - df + 0.5) / (df + 0.5))
+        norm = self.K1 * (1 - self.B + self.B * lengths / max(lengths.mean(), 1.0))
+        return (tf * (self.K1 + 1) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+    def _render(self, banners, blocks, units, kept) -> str:
+        sections: Dict[int, List[str]] = {}
+        for block in blocks:
+            if not any(u in kept for u in block.units):
+                continue
+            lines = []
+            for kind, indent, content in block.lines:
+                if kind != 'body':
+                    lines.append(indent + content)
+                    continue
+                sentences = [units[u][1] for u in content if u in kept]
+                if sentences:
+                    lines.append(indent + " ".join(sentences))
+            sections.setdefault(block.section, []).append("\n".join(lines))
+        out = []
+        for section, paragraphs in sections.items():
+            if section in banners:
+                paragraphs = [banners[section] + "\n" + paragraphs[0]] + paragraphs[1:]
+            out.append("\n\n".join(paragraphs))
+        return "\n\n".join(out)
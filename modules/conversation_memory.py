@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+WavesAI Conversation Memory Module
+Keeps recent turns in the prompt and folds older ones into a rolling summary
+"""
+
+import re
+from typing import Callable, List, Tuple
+
+
+class ConversationMemory:
+    """Multi-turn history rendered as Llama 3 turns right after the static system prompt
+
+    The rendered history only ever grows between compactions, so llama.cpp's prefix matching
+    reuses the KV cache for everything already seen and only the newest turn is evaluated.
+    When the message or token limit is exceeded the oldest half of the turns is folded into
+    the summary in one step (not one turn at a time), which keeps the prefix stable for the
+    following turns instead of shifting it on every message.
+    """
+
+    def __init__(self, max_messages: int = 10, max_tokens: int = 2048,
+                 counter: Callable[[str], int] = None, max_reply_chars: int = 2000):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.max_reply_chars = max_reply_chars
+        self.counter = counter or (lambda text: len(text) // 4 + 1)
+        self.turns: List[Tuple[str, str, int]] = []  # (user, assistant, tokens)
+        self.summary_lines: List[str] = []
+        self.compactions = 0
+
+    def add_turn(self, user: str, assistant: str):
+        """Record a completed exchange"""
+        user = user.strip()
+        assistant = assistant.strip()
+        if not user or not assistant:
+            return
+        if len(assistant) > self.max_reply_chars:
+            assistant = assistant[:self.max_reply_chars].rstrip() + " …"
+        tokens = self.counter(self._render_turn(user, assistant))
+        self.turns.append((user, assistant, tokens))
+        if self._over_limit():
+            self.compact()
+
+    def clear(self):
+        self.turns = []
+        self.summary_lines = []
+
+    def _over_limit(self) -> bool:
+        if len(self.turns) * 2 > self.max_messages:
+            return True
+        return self.token_count() > self.max_tokens
+
+    def token_count(self) -> int:
+        summary = self._render_summary()
+        return sum(t[2] for t in self.turns) + (self.counter(summary) if summary else 0)
+
+    def compact(self):
+        """Fold the oldest half of the turns into the summary"""
+        keep = len(self.turns) // 2
+        folded, self.turns = self.turns[:len(self.turns) - keep], self.turns[len(self.turns) - keep:]
+        for user, assistant, _ in folded:
+            self.summary_lines.append(f"- User: {self._clip(user, 160)} | WavesAI: {self._gist(assistant)}")
+
+        # The summary gets at most a quarter of the budget; drop its oldest lines beyond that
+        while len(self.summary_lines) > 1 and self.counter(self._render_summary()) > self.max_tokens // 4:
+            self.summary_lines.pop(0)
+        # A single huge turn can still exceed the budget; drop turns until it fits
+        while self.turns and self.token_count() > self.max_tokens:
+            self.turns.pop(0)
+        self.compactions += 1
+
+    def _gist(self, text: str) -> str:
+        """First sentence or two of a reply"""
+        text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
+        text = re.sub(r'\s+', ' ', text).strip()
+        sentences = re.split(r'(?<=[.!?])\s+', text)
+        gist = ""
+        for sentence in sentences:
+            if gist and len(gist) + len(sentence) > 200:
+                break
+            gist = f"{gist} {sentence}".strip()
+        return self._clip(gist, 240)
+
+    def _clip(self, text: str, limit: int) -> str:
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+    def _render_summary(self) -> str:
+        if not self.summary_lines:
+            return ""
+        return ("<|start_header_id|>system<|end_header_id|>\n\nSummary of the earlier conversation:\n"
+                + "\n".join(self.summary_lines) + "<|eot_id|>")
+
+    def _render_turn(self, user: str, assistant: str) -> str:
+        return (f"<|start_header_id|>user<|end_header_id|>\n\n{user}<|eot_id|>"
+                f"<|start_header_id|>assistant<|end_header_id|>\n\n{assistant}<|eot_id|>")
+
+    def render(self) -> str:
+        """History in Llama 3 format, to follow the static system message"""
+        return self._render_summary() + "".join(self._render_turn(u, a) for u, a, _ in self.turns)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+WavesAI GPU Telemetry Module
+NVIDIA GPU utilisation, VRAM and temperature from NVML in-process, or one streaming nvidia-smi
+"""
+
+import time
+import shutil
+import atexit
+import threading
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+
+QUERY_FIELDS = 'index,utilization.gpu,memory.used,memory.total,temperature.gpu'
+BACKENDS = ('auto', 'nvml', 'smi', 'off')
+
+
+class GPUTelemetry:
+    """Latest reading per NVIDIA GPU without forking a process per sample
+
+    Backends, tried in order for 'auto':
+      nvml - pynvml (nvidia-ml-py) queries the driver in-process, microseconds per read
+      smi  - one long-running `nvidia-smi --loop-ms` child whose CSV lines a reader thread
+             parses; read() returns the most recent line per GPU
+      none - no driver or no GPU: read() returns None immediately
+
+    The backend is chosen lazily on the first read. nvml and popen can be replaced with
+    stand-ins (an object with the pynvml functions, a callable returning a Popen-like object
+    with a line-iterable stdout) to exercise this without a GPU.
+    """
+
+    def __init__(self, backend: str = 'auto', loop_ms: int = 1000, nvml=None,
+                 popen: Callable = None, stale_after: float = None):
+        self.requested = backend if backend in BACKENDS else 'auto'
+        self.loop_ms = loop_ms
+        self.stale_after = stale_after or max(5.0, loop_ms / 1000 * 5)
+        self.backend: Optional[str] = None
+        self._nvml = nvml
+        self._handles: List = []
+        self._popen = popen
+        self._process = None
+        self._latest: Dict[int, Dict] = {}
+        self._updated = 0.0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._first_line = threading.Event()
+        self._reader: Optional[threading.Thread] = None
+
+    def read(self, index: int = 0) -> Optional[Dict]:
+        """{'utilization', 'memory_used_mb', 'memory_total_mb', 'temperature'} for one GPU, or None"""
+        gpus = self.read_all()
+        return gpus.get(index) if gpus else None
+
+    def read_all(self) -> Dict[int, Dict]:
+        if self.backend is None:
+            with self._start_lock:
+                if self.backend is None:
+                    self._start()
+        if self.backend == 'nvml':
+            try:
+                return {i: self._nvml_sample(h) for i, h in enumerate(self._handles)}
+            except Exception:
+                return {}
+        if self.backend == 'smi':
+            with self._lock:
+                if time.time() - self._updated > self.stale_after:
+                    return {}
+                return {i: dict(gpu) for i, gpu in self._latest.items()}
+        return {}
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        if self.backend == 'nvml':
+            try:
+                self._nvml.nvmlShutdown()
+            except Exception:
+                pass
+        self.backend = None
+
+    # Backend selection
+
+    def _start(self):
+        order = {'auto': ('nvml', 'smi'), 'nvml': ('nvml',), 'smi': ('smi',), 'off': ()}[self.requested]
+        for name in order:
+            if getattr(self, f'_start_{name}')():
+                self.backend = name
+                return
+        self.backend = 'none'
+
+    def _start_nvml(self) -> bool:
+        try:
+            if self._nvml is None:
+                import pynvml
+                self._nvml = pynvml
+            self._nvml.nvmlInit()
+            count = self._nvml.nvmlDeviceGetCount()
+            self._handles = [self._nvml.nvmlDeviceGetHandleByIndex(i) for i in range(count)]
+            return bool(self._handles)
+        except Exception:
+            self._handles = []
+            return False
+
+    def _nvml_sample(self, handle) -> Dict:
+        nvml = self._nvml
+        memory = nvml.nvmlDeviceGetMemoryInfo(handle)
+        return {
+            "utilization": float(nvml.nvmlDeviceGetUtilizationRates(handle).gpu),
+            "memory_used_mb": memory.used / (1024 ** 2),
+            "memory_total_mb": memory.total / (1024 ** 2),
+            "temperature": float(nvml.nvmlDeviceGetTemperature(handle, getattr(nvml, 'NVML_TEMPERATURE_GPU', 0)))
+        }
+
+    def _start_smi(self) -> bool:
+        args = ['nvidia-smi', f'--query-gpu={QUERY_FIELDS}', '--format=csv,noheader,nounits',
+                f'--loop-ms={self.loop_ms}']
+        try:
+            if self._popen is None:
+                if not shutil.which('nvidia-smi'):
+                    return False
+                self._process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                                 text=True, bufsize=1)
+                atexit.register(self.close)
+            else:
+                self._process = self._popen(args)
+        except (OSError, ValueError):
+            return False
+        self._reader = threading.Thread(target=self._read_stream, args=(self._process,),
+                                        name="wavesai-gpu", daemon=True)
+        self._reader.start()
+        # No GPU or no driver: nvidia-smi exits at once without a line, so fail fast
+        self._first_line.wait(timeout=2.0)
+        with self._lock:
+            ok = bool(self._latest)
+        if not ok:
+            self.close()
+        return ok
+
+    def _read_stream(self, process):
+        try:
+            for line in process.stdout:
+                gpu = parse_smi_line(line)
+                if gpu is None:
+                    continue
+                with self._lock:
+                    self._latest[gpu.pop('index')] = gpu
+                    self._updated = time.time()
+                self._first_line.set()
+        except Exception:
+            pass
+        finally:
+            self._first_line.set()
+            with self._lock:
+                self._updated = 0.0  # Child is gone: report no GPU rather than a frozen reading
+
+
+def parse_smi_line(line: str) -> Optional[Dict]:
+    """One CSV line of QUERY_FIELDS (nounits) as a reading, or None if it is not one"""
+    parts = [p.strip() for p in line.split(',')]
+    if len(parts) != 5:
+        return None
+    try:
+        index = int(parts[0])
+        values = [float(p) for p in parts[1:]]
+    except ValueError:
+        return None  # e.g. "[N/A]" or "[Not Supported]"
+    return {"index": index, "utilization": values[0], "memory_used_mb": values[1],
+            "memory_total_mb": values[2], "temperature": values[3]}
+
+
+def format_gpu(gpu: Optional[Dict]) -> str:
+    """Display string used in the system context ("N/A" without a GPU)"""
+    if not gpu:
+        return "N/A"
+    return (f"GPU: {gpu['utilization']:.0f}% | VRAM: {gpu['memory_used_mb']:.0f}/{gpu['memory_total_mb']:.0f}MB"
+            f" | Temp: {gpu['temperature']:.0f}°C")
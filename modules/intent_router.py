@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+WavesAI Intent Router Module
+Classifies user input into intents in one pass over a pre-compiled phrase trie
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class Route:
+    """Result of routing one input"""
+    intent: str
+    matches: Set[str] = field(default_factory=set)
+    region: Optional[str] = None
+
+    @property
+    def is_command(self) -> bool:
+        return self.intent in ('command', 'file')
+
+
+class IntentRouter:
+    """Single-pass intent classifier built once at startup
+
+    All phrases are expanded and compiled into one word-level trie (an Aho-Corasick style
+    automaton without failure links - phrases are a few words long, so restarting the walk at
+    each word is cheap). One walk over the tokenized input finds every intent. Imperative
+    commands and questions only count at the start of the input (after politeness such as
+    "please" or "can you"), which stops words like "is" or "start" in the middle of a sentence
+    from misrouting it. Ties are broken by PRIORITY.
+
+    Phrase syntax: words separated by spaces, "a|b" for alternatives, "[a|b]" for optional.
+    """
+
+    PRIORITY = ['file', 'command', 'time', 'chat', 'news', 'weather', 'location', 'info']
+
+    # Politeness skipped before an anchored phrase ("please open", "can you tell me")
+    LEAD = ["please", "hey|ok|okay wavesai|jarvis", "can|could|would|will you [please]",
+            "i want|need you to"]
+
+    # Phrases that only count at the start of the input
+    ANCHORED = {
+        'command': [
+            "open|close|kill|start|stop|restart|install|uninstall|reinstall|re-install|remove|delete",
+            "execute|run|launch|update|upgrade|reboot|shutdown|poweroff|halt|suspend|hibernate|lock",
+            "logout|mute|unmute", "list|show files", "show directory", "find|kill process", "search package",
+        ],
+        'chat': ["hi|hello|hey|yo|thanks", "thank you", "good morning|evening|night|afternoon"],
+        'info': [
+            "what|who|when|where|why|how|which|whose|define|explain|describe|search",
+            "what's|who's|where's|how's",
+            "look up", "tell me about", "is|are|was|were|does|do|did|can|could|should|will",
+        ],
+    }
+
+    # Phrases that count anywhere
+    PHRASES = {
+        'file': [
+            "write [this|that|it] to|into [a|the] file", "save this|that|it to|into",
+            "create|make [a] file", "write_to_file",
+        ],
+        'command': ["sudo", "pacman"],
+        'time': [
+            "what [is] the time", "what's the time", "what time", "tell me the time", "current time",
+            "time is it", "show time",
+        ],
+        'chat': ["how are you", "who are you", "what can you do", "what is|what's your name", "tell me a joke"],
+        'news': ["news", "headline|headlines", "breaking", "current events", "ndtv|bbc|cnn|reuters"],
+        'weather': [
+            "weather", "forecast", "rain|raining|rainy", "sunny", "cloudy", "humid|humidity", "climate",
+            "temperature outside|today|in|at", "hot|cold|warm outside|today",
+        ],
+        'location': [
+            "where am i", "where i am", "my [current] location", "current location", "which city am i",
+        ],
+        'info': ["meaning of", "wikipedia", "history of"],
+    }
+
+    REGIONS = {
+        'usa': ['usa', 'america', 'american', 'united states', 'us news'],
+        'uk': ['uk', 'britain', 'british', 'england', 'united kingdom'],
+        'canada': ['canada', 'canadian'],
+        'australia': ['australia', 'australian'],
+        'germany': ['germany', 'german'],
+        'france': ['france', 'french'],
+        'italy': ['italy', 'italian'],
+        'spain': ['spain', 'spanish'],
+        'russia': ['russia', 'russian'],
+        'china': ['china', 'chinese'],
+        'japan': ['japan', 'japanese'],
+        'south korea': ['korea', 'korean', 'south korea'],
+        'india': ['india', 'indian'],
+        'brazil': ['brazil', 'brazilian'],
+        'mexico': ['mexico', 'mexican'],
+        'argentina': ['argentina', 'argentinian'],
+        'south africa': ['south africa', 'south african'],
+        'egypt': ['egypt', 'egyptian'],
+        'nigeria': ['nigeria', 'nigerian'],
+        'thailand': ['thailand', 'thai'],
+        'singapore': ['singapore', 'singaporean'],
+        'malaysia': ['malaysia', 'malaysian'],
+        'indonesia': ['indonesia', 'indonesian'],
+        'philippines': ['philippines', 'filipino'],
+        'vietnam': ['vietnam', 'vietnamese'],
+        'turkey': ['turkey', 'turkish'],
+        'israel': ['israel', 'israeli'],
+        'uae': ['uae', 'emirates', 'dubai'],
+        'saudi arabia': ['saudi', 'saudi arabia'],
+        'world': ['world', 'global', 'international'],
+        'local': ['local', 'my area', 'here', 'current location'],
+    }
+
+    # A file name plus a writing verb also means a file request ("write a poem to poem.txt")
+    FILE_VERBS = {'write', 'create', 'generate', 'save'}
+    FILE_EXTENSIONS = {'txt', 'md', 'py', 'js', 'html', 'css', 'json', 'sh', 'csv'}
+
+    _token = re.compile(r"[a-z0-9_'\-]+(?:\.[a-z0-9_\-]+)*|\?")
+
+    def __init__(self):
+        self.anchored = self._compile(self.ANCHORED)
+        self.phrases = self._compile(self.PHRASES)
+        self.lead = self._compile({'lead': self.LEAD})
+        self.regions = self._compile(self.REGIONS)
+        self._last: Tuple[Optional[str], Optional[Route]] = (None, None)
+
+    @staticmethod
+    def _expand(spec: str) -> List[Tuple[str, ...]]:
+        """All word sequences described by a phrase spec"""
+        sequences = [()]
+        for part in spec.split():
+            optional = part.startswith('[') and part.endswith(']')
+            choices = part.strip('[]').split('|')
+            grown = [seq + (choice,) for seq in sequences for choice in choices]
+            sequences = grown + sequences if optional else grown
+        return sequences
+
+    def _compile(self, table: Dict[str, List[str]]) -> Dict:
+        """Build a word trie; terminal nodes hold the labels under the '$' key"""
+        root: Dict = {}
+        for label, specs in table.items():
+            for spec in specs:
+                for words in self._expand(spec):
+                    node = root
+                    for word in words:
+                        node = node.setdefault(word, {})
+                    node.setdefault('$', set()).add(label)
+        return root
+
+    @staticmethod
+    def _walk(trie: Dict, words: List[str], start: int) -> Tuple[Set[str], int]:
+        """Labels of every phrase starting at words[start], and the end of the longest one"""
+        labels = set()
+        end = start
+        node = trie
+        for i in range(start, len(words)):
+            node = node.get(words[i])
+            if node is None:
+                break
+            if '$' in node:
+                labels |= node['$']
+                end = i + 1
+        return labels, end
+
+    def route(self, text: str) -> Route:
+        """Classify text; repeated calls with the same input are served from the last result"""
+        # One read of the memo: other threads may replace it between two index lookups
+        last_text, last_route = self._last
+        if text == last_text:
+            return last_route
+        words = self._token.findall(text.lower())
+        matches = set()
+
+        # Skip leading politeness, then look for anchored phrases at the start
+        start = 0
+        while True:
+            labels, end = self._walk(self.lead, words, start)
+            if not labels:
+                break
+            start = end
+        matches |= self._walk(self.anchored, words, start)[0]
+
+        phrases = self.phrases
+        for i, word in enumerate(words):
+            if word in phrases:
+                matches |= self._walk(phrases, words, i)[0]
+        if words and words[-1] == '?':
+            matches.add('info')
+        if 'file' not in matches and any(
+                '.' in word and word.rsplit('.', 1)[1] in self.FILE_EXTENSIONS for word in words):
+            if any(word in self.FILE_VERBS for word in words):
+                matches.add('file')
+
+        intent = next((name for name in self.PRIORITY if name in matches), 'chat')
+        region = self.detect_region(words) if intent == 'news' else None
+        route = Route(intent, matches, region)
+        self._last = (text, route)
+        return route
+
+    def detect_region(self, text) -> Optional[str]:
+        """First country/region mentioned (longest alias at that position wins), else None"""
+        words = self._token.findall(text.lower()) if isinstance(text, str) else text
+        regions = self.regions
+        for i, word in enumerate(words):
+            if word in regions:
+                node = regions
+                found = None
+                for j in range(i, len(words)):
+                    node = node.get(words[j])
+                    if node is None:
+                        break
+                    if '$' in node:
+                        found = next(iter(node['$']))
+                if found:
+                    return found
+        return None
+
+
+# Labelled inputs used to measure misroutes; keep adding real-world failures here
+FIXTURES: List[Tuple[str, str]] = [
+    ("open firefox", "command"),
+    ("please close discord", "command"),
+    ("can you install htop", "command"),
+    ("kill process chrome", "command"),
+    ("run the backup script", "command"),
+    ("update system", "command"),
+    ("sudo pacman -Syu", "command"),
+    ("what time is it", "time"),
+    ("tell me the time", "time"),
+    ("latest news", "news"),
+    ("what's the latest news in india", "news"),
+    ("show me today's headlines", "news"),
+    ("any breaking news from the us?", "news"),
+    ("bbc world updates", "news"),
+    ("what's the weather like", "weather"),
+    ("will it rain tomorrow in mumbai", "weather"),
+    ("weather forecast for london", "weather"),
+    ("is it cold outside", "weather"),
+    ("where am i", "location"),
+    ("what is my current location", "location"),
+    ("what is kubernetes", "info"),
+    ("who was alan turing", "info"),
+    ("explain quantum entanglement", "info"),
+    ("define entropy", "info"),
+    ("how does a transformer model work", "info"),
+    ("is python dynamically typed?", "info"),
+    ("tell me about the roman empire", "info"),
+    ("history of linux", "info"),
+    ("hello", "chat"),
+    ("how are you", "chat"),
+    ("thank you so much", "chat"),
+    ("who are you", "chat"),
+    ("my cpu temperature is high, what should i do", "chat"),
+    ("this is great", "chat"),
+    ("i think the start was slow", "chat"),
+    ("that was a nice answer", "chat"),
+    ("the updates are installed", "chat"),
+    ("write this to a file called notes.txt", "file"),
+    ("create a file named todo.md", "file"),
+    ("hot reload is not working in my react app", "chat"),
+    ("write a short poem to poem.txt", "file"),
+    ("generate a summary of the news in india", "news"),
+]
+
+
+def legacy_route(text: str) -> str:
+    """The substring scans this router replaces, reduced to a single label for comparison
+
+    (In the app these scans were spread over several call sites that each lowercased the
+    input again, so the real per-turn cost was a multiple of this.)
+    """
+    lower = text.lower()
+    info_keywords = ['what', 'who', 'when', 'where', 'why', 'how', 'tell me', 'explain', 'about', 'is', 'are', 'was', 'were', 'define', 'meaning', 'search']
+    news_keywords = ['news', 'headlines', 'breaking', 'latest news', 'current events', 'updates', 'indian news', 'us news', 'uk news', 'world news', 'local news', 'ndtv', 'bbc', 'cnn', 'reuters', 'news today', 'current news', 'breaking news']
+    command_keywords = ['open', 'close', 'kill', 'start', 'stop', 'install', 'remove', 'delete', 'create file', 'write to', 'execute', 'run', 'launch']
+    weather_keywords = ['weather', 'temperature', 'climate', 'forecast', 'rain', 'sunny', 'cloudy', 'hot', 'cold', 'warm']
+    location_keywords = ['location', 'where am i', 'my location', 'current location', 'where i am']
+    time_keywords = ['what time', 'what is the time', 'tell me the time', 'current time', 'what\'s the time', 'time is it', 'show time']
+    if (any(k in lower for k in ['write', 'create', 'generate']) and
+            any(i in lower for i in [' in ', ' to ', '.txt', '.md', '.py', '.js', '.html', '.css'])):
+        return 'file'
+    if any(k in lower for k in time_keywords):
+        return 'time'
+    if lower.startswith(('open ', 'close ', 'kill ', 'launch ', 'run ', 'install ', 'update', 'sudo ')):
+        return 'command'
+    if any(k in lower for k in news_keywords):
+        return 'news'
+    if any(k in lower for k in weather_keywords):
+        return 'weather'
+    if any(k in lower for k in location_keywords):
+        return 'location'
+    if any(k in lower for k in command_keywords):
+        return 'command'
+    if any(k in lower for k in info_keywords):
+        return 'info'
+    return 'chat'
+
+
+def evaluate_fixtures(router: IntentRouter = None) -> Dict:
+    """Misroutes of the compiled router and of the legacy scans over FIXTURES"""
+    router = router or IntentRouter()
+    misroutes = [(text, expected, router.route(text).intent) for text, expected in FIXTURES
+                 if router.route(text).intent != expected]
+    legacy = [(text, expected, legacy_route(text)) for text, expected in FIXTURES
+              if legacy_route(text) != expected]
+    return {'total': len(FIXTURES), 'misroutes': misroutes, 'legacy_misroutes': legacy}
+
+
+def benchmark(iterations: int = 2000) -> Dict:
+    """Per-call cost (microseconds) of building, routing and the legacy scans"""
+    start = time.perf_counter()
+    router = IntentRouter()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    texts = [text for text, _ in FIXTURES]
+    start = time.perf_counter()
+    for i in range(iterations):
+        router._last = (None, None)  # Measure real routing, not the repeat memo
+        router.route(texts[i % len(texts)])
+    route_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        legacy_route(texts[i % len(texts)])
+    legacy_us = (time.perf_counter() - start) / iterations * 1e6
+    return {'build_ms': build_ms, 'route_us': route_us, 'legacy_us': legacy_us, 'iterations': iterations}
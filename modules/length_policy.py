@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+WavesAI Length Policy Module
+Maps intent and length cues to a token budget and stops streams at a sentence end past it
+"""
+
+import re
+from typing import Dict, Optional
+
+
+class LengthPolicy:
+    """Token budget per turn
+
+    The soft budget is where the answer should end; the stream is cut at the first sentence
+    end after it. max_tokens is a hard cap with headroom so the model can finish that
+    sentence. Intents that produce files or structured output keep the configured maximum.
+    """
+
+    DEFAULT_BUDGETS = {'short': 220, 'normal': 600, 'detailed': 1400, 'voice': 200}
+    INTENT_TIERS = {'weather': 'short', 'location': 'short', 'time': 'short', 'command': 'short',
+                    'news': 'detailed', 'info': 'normal', 'chat': 'normal'}
+    UNLIMITED_INTENTS = {'file'}
+    HEADROOM = 1.4
+    TOKENS_PER_WORD = 1.4
+
+    _short = re.compile(r"\b(in short|briefly|brief|quick(ly)?|tl;?dr|in (a|one) (sentence|line)|one[- ]liner|"
+                        r"short answer|in a few words|just tell me|summari[sz]e|summary)\b")
+    _detailed = re.compile(r"\b(in detail|detailed|elaborate|in depth|in-depth|thorough(ly)?|comprehensive|"
+                           r"step[- ]by[- ]step|everything about|explain fully|long answer|full explanation)\b")
+    _words = re.compile(r"\b(?:in|within|under|about)\s+(\d{2,4})\s+words\b")
+
+    def __init__(self, budgets: Dict[str, int] = None, enabled: bool = True):
+        self.budgets = dict(self.DEFAULT_BUDGETS)
+        if budgets:
+            self.budgets.update(budgets)
+        self.enabled = enabled
+        self.turns = 0
+        self.early_stops = 0
+        self.tokens_saved = 0
+
+    def budget(self, user_input: str, intent: str = 'chat', spoken: bool = False) -> Optional[Dict]:
+        """{'tier', 'soft', 'max_tokens'} for this turn, or None to keep the configured maximum"""
+        if not self.enabled or intent in self.UNLIMITED_INTENTS:
+            return None
+        text = user_input.lower()
+        match = self._words.search(text)
+        asked_detail = bool(self._detailed.search(text))
+        if match:
+            tier, soft = 'words', int(int(match.group(1)) * self.TOKENS_PER_WORD)
+        elif asked_detail:
+            tier, soft = 'detailed', self.budgets['detailed']
+        elif self._short.search(text):
+            tier, soft = 'short', self.budgets['short']
+        else:
+            tier = self.INTENT_TIERS.get(intent, 'normal')
+            soft = self.budgets[tier]
+        if spoken and not asked_detail:
+            tier, soft = 'voice', min(soft, self.budgets['voice'])
+        return {'tier': tier, 'soft': soft, 'max_tokens': int(soft * self.HEADROOM) + 32}
+
+    def record(self, stats: Dict, default_cap: int):
+        """Account one finished turn; tokens_saved is an upper bound (the old cap minus what was generated)"""
+        self.turns += 1
+        if stats.get('early_stop'):
+            self.early_stops += 1
+        saved = 0
+        if stats.get('early_stop') or stats.get('tokens', 0) >= stats.get('max_tokens', default_cap):
+            saved = max(0, default_cap - stats.get('tokens', 0))
+        stats['tokens_saved'] = saved
+        self.tokens_saved += saved
+
+    def stats(self) -> Dict:
+        return {'turns': self.turns, 'early_stops': self.early_stops, 'tokens_saved': self.tokens_saved}
+
+
+class EarlyStopper:
+    """Signals the end of a stream at the first completed sentence past the soft budget
+
+    A sentence only counts as complete once the next token confirms it: terminal
+    punctuation followed by whitespace or a capital. That token is the start of the next
+    sentence, so feed() returning True means "stop before this token". Dots after digits
+    (list markers, "Python 3.12"), initials, dotted words ("e.g.", "U.S.") and common
+    abbreviations are not ends, and neither is a blank line after a colon.
+    """
+
+    _sentence_end = re.compile(r'[.!?]["\')\]]?$')
+    _word_before_dot = re.compile(r'(\S+)\.["\')\]]?$')
+    _abbreviations = frozenset('''mr mrs ms dr prof sr jr st vs etc eg ie approx no fig inc ltd co
+        dept est min max vol ver'''.split())
+
+    def __init__(self, soft_budget: int):
+        self.soft_budget = soft_budget
+        self.tokens = 0
+        self.text = ""
+        self.in_code = False
+
+    def feed(self, token: str) -> bool:
+        """True if the text so far ends a sentence and token starts the next one (drop the token)"""
+        if self.tokens >= self.soft_budget and not self.in_code and self._ends(token):
+            return True
+        self.tokens += 1
+        # Fences ending inside this token, including ones split across tokens
+        tail = self.text[-2:]
+        fences = sum(1 for m in re.finditer('```', tail + token) if m.end() > len(tail))
+        if fences % 2:
+            self.in_code = not self.in_code
+        self.text = (self.text + token)[-200:]
+        return False
+
+    def _ends(self, token: str) -> bool:
+        text = self.text
+        if text.endswith('\n\n'):
+            return not text.rstrip().endswith(':')
+        if not self._sentence_end.search(text) or not re.match(r'\s|[A-Z]', token):
+            return False
+        if text.rstrip('"\')]').endswith('.'):
+            match = self._word_before_dot.search(text)
+            word = match.group(1).lower().lstrip('("\'[') if match else ''
+            if not word or word[-1].isdigit() or len(word) == 1 or '.' in word or word in self._abbreviations:
+                return False
+        return True
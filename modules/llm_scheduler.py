@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+WavesAI LLM Scheduler Module
+Runs every generation on one worker thread in priority order, with cancellation and preemption
+"""
+
+import time
+import heapq
+import queue
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+PRIORITY_INTERACTIVE = 0  # The answer the user is waiting for
+PRIORITY_ERROR = 1        # Conversational explanation of a failed command
+PRIORITY_BACKGROUND = 2   # Summaries nobody is blocked on
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_ERROR: 'error', PRIORITY_BACKGROUND: 'background'}
+
+_END = object()
+
+
+class GenerationJob:
+    """One queued generation; consume it with tokens() or result()
+
+    A job preempted by a more urgent one is restarted from scratch later. Tokens it already
+    handed out are not sent again: the rerun's first tokens are dropped up to that point, so
+    tokens() and result() always see the same text.
+    """
+
+    def __init__(self, name: str, run: Callable[['GenerationJob'], Iterator[str]], priority: int,
+                 should_cancel: Callable[[], bool] = None, on_done: Callable[['GenerationJob'], None] = None):
+        self.name = name
+        self.run = run
+        self.priority = priority
+        self.should_cancel = should_cancel
+        self.on_done = on_done
+        self.status = 'queued'
+        self.stats: Dict = {}
+        self.pieces: List[str] = []
+        self.preemptions = 0
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.enqueued = self.submitted
+        self.started: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.queue_s = 0.0
+        self.canceled = False
+        self.cancel_requested_at: Optional[float] = None
+        self.output = queue.Queue()
+        self.finished = threading.Event()
+
+    def cancel(self):
+        if self.cancel_requested_at is None:
+            self.cancel_requested_at = time.time()
+        self.canceled = True
+
+    def is_canceled(self) -> bool:
+        if self.canceled:
+            return True
+        try:
+            return bool(self.should_cancel and self.should_cancel())
+        except Exception:
+            return False
+
+    def tokens(self) -> Iterator[str]:
+        """Yield tokens as they are generated; closing the iterator early cancels the job"""
+        try:
+            while True:
+                token = self.output.get()
+                if token is _END:
+                    return
+                yield token
+        finally:
+            if not self.finished.is_set():
+                self.cancel()
+
+    def result(self, timeout: float = None) -> str:
+        """Block until the job ends and return its full text ("" if canceled)"""
+        self.finished.wait(timeout)
+        return ''.join(self.pieces) if self.status == 'done' else ""
+
+    @property
+    def queue_ms(self) -> float:
+        waiting = time.time() - self.enqueued if self.status == 'queued' else 0.0
+        return (self.queue_s + waiting) * 1000
+
+    def summary(self) -> Dict:
+        return {'name': self.name, 'priority': PRIORITY_NAMES.get(self.priority, self.priority),
+                'status': self.status, 'queue_ms': self.queue_ms, 'preemptions': self.preemptions,
+                'run_ms': (self.finished_at - self.started) * 1000 if self.started and self.finished_at else None}
+
+
+class LLMScheduler:
+    """Priority queue in front of the model with a single worker thread
+
+    llama.cpp can only run one generation at a time, so every caller submits a job instead of
+    calling the model itself. Before each token the worker checks the job's cancellation token
+    and whether a strictly more urgent job is waiting; if so the running job is stopped and put
+    back in the queue, and it starts over once the urgent work is done (resuming its output
+    where the previous run left off).
+    """
+
+    def __init__(self, history: int = 50, on_finish: Callable[[GenerationJob], None] = None):
+        self.heap: List[tuple] = []
+        self.counter = itertools.count()
+        self.cond = threading.Condition()
+        self.current: Optional[GenerationJob] = None
+        self.recent = deque(maxlen=history)
+        self.worker: Optional[threading.Thread] = None
+        self.running = True
+        self.on_finish = on_finish  # Called on the worker for every finished job, before its on_done
+
+    def submit(self, run: Callable[[GenerationJob], Iterator[str]], priority: int = PRIORITY_INTERACTIVE,
+               should_cancel: Callable[[], bool] = None, name: str = "generation",
+               on_done: Callable[[GenerationJob], None] = None) -> GenerationJob:
+        job = GenerationJob(name, run, priority, should_cancel, on_done)
+        with self.cond:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._work, name="wavesai-llm", daemon=True)
+                self.worker.start()
+            heapq.heappush(self.heap, (priority, next(self.counter), job))
+            self.cond.notify()
+        return job
+
+    def in_worker(self) -> bool:
+        """True on the worker thread, where waiting on another job would deadlock"""
+        return threading.current_thread() is self.worker
+
+    def pending(self) -> int:
+        with self.cond:
+            return len(self.heap)
+
+    def shutdown(self):
+        with self.cond:
+            self.running = False
+            for _, _, job in self.heap:
+                job.cancel()
+            self.cond.notify()
+
+    def _should_yield(self, job: GenerationJob) -> bool:
+        with self.cond:
+            return bool(self.heap) and self.heap[0][0] < job.priority
+
+    def _work(self):
+        while True:
+            with self.cond:
+                while self.running and not self.heap:
+                    self.cond.wait()
+                if not self.running and not self.heap:
+                    return
+                _, _, job = heapq.heappop(self.heap)
+                self.current = job
+            job.queue_s += time.time() - job.enqueued
+            if job.is_canceled():
+                self._finish(job, 'canceled')
+                continue
+            if job.started is None:
+                job.started = time.time()
+            job.status = 'running'
+            sent = len(job.pieces)  # Already streamed before a preemption; the rerun skips these
+            position = 0
+            stream = None
+            outcome = 'done'
+            try:
+                stream = iter(job.run(job))
+                for token in stream:
+                    if job.is_canceled():
+                        outcome = 'canceled'
+                        break
+                    position += 1
+                    if position > sent:
+                        job.pieces.append(token)
+                        job.output.put(token)
+                    if self._should_yield(job):
+                        outcome = 'preempted'
+                        break
+            except Exception as e:
+                job.error = str(e)
+                outcome = 'failed'
+            finally:
+                if stream is not None and hasattr(stream, 'close'):
+                    try:
+                        stream.close()
+                    except Exception:
+                        pass
+            if outcome == 'preempted':
+                job.preemptions += 1
+                job.status = 'queued'
+                job.enqueued = time.time()
+                with self.cond:
+                    heapq.heappush(self.heap, (job.priority, next(self.counter), job))
+                    self.current = None
+                continue
+            self._finish(job, outcome)
+
+    def _finish(self, job: GenerationJob, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        job.stats['queue_ms'] = job.queue_ms
+        with self.cond:
+            self.current = None
+            self.recent.append(job)
+        job.output.put(_END)
+        job.finished.set()
+        if self.on_finish:
+            try:
+                self.on_finish(job)
+            except Exception:
+                pass
+        if job.on_done:
+            try:
+                job.on_done(job)
+            except Exception:
+                pass
+
+    def stats(self) -> List[Dict]:
+        """Summaries of recently finished jobs, newest last"""
+        with self.cond:
+            return [job.summary() for job in self.recent]
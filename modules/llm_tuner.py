@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+WavesAI LLM Tuner Module
+Sweeps llama.cpp runtime parameters on this machine and picks the fastest stable settings
+"""
+
+import json
+import time
+import shutil
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+
+# Fixed prompt set so runs are comparable across configurations (short, medium, long)
+TUNE_PROMPTS = [
+    "<|start_header_id|>user<|end_header_id|>\n\nWhat is the capital of France?<|eot_id|>"
+    "<|start_header_id|>assistant<|end_header_id|>\n\n",
+    "<|start_header_id|>system<|end_header_id|>\n\nYou are WavesAI, a helpful Linux assistant.<|eot_id|>"
+    "<|start_header_id|>user<|end_header_id|>\n\nExplain the difference between a process and a thread, "
+    "and when a program should use each. Mention memory sharing, scheduling and typical pitfalls.<|eot_id|>"
+    "<|start_header_id|>assistant<|end_header_id|>\n\n",
+    "<|start_header_id|>system<|end_header_id|>\n\nYou are WavesAI, a helpful Linux assistant. "
+    + "Answer clearly and concisely, use the context below when it is relevant. " * 12
+    + "\n\nCONTEXT:\n" + "The Linux kernel schedules runnable tasks with the Completely Fair Scheduler. " * 30
+    + "<|eot_id|><|start_header_id|>user<|end_header_id|>\n\nSummarize the context in two sentences."
+    "<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n",
+]
+
+# What a "typical turn" costs: used to rank configurations by end-to-end latency
+TYPICAL_PROMPT_TOKENS = 1000
+TYPICAL_REPLY_TOKENS = 200
+
+
+def measure(model_path: str, n_ctx: int, threads: int, n_batch: int, gpu_layers: int,
+            gen_tokens: int = 64, repeats: int = 2) -> Dict:
+    """Load the model with the given settings and measure prompt-eval and generation tokens/sec"""
+    from llama_cpp import Llama
+
+    result = {'threads': threads, 'batch_size': n_batch, 'gpu_layers': gpu_layers, 'ok': False}
+    llm = None
+    try:
+        start = time.perf_counter()
+        llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=threads, n_batch=n_batch,
+                    n_gpu_layers=gpu_layers, seed=0, verbose=False)
+        result['load_s'] = time.perf_counter() - start
+
+        prompt_tps, gen_tps = [], []
+        for _ in range(repeats):
+            for prompt in TUNE_PROMPTS:
+                n_prompt = len(llm.tokenize(prompt.encode('utf-8'), special=True))
+                llm.reset()  # No KV prefix reuse between runs
+                start = time.perf_counter()
+                first = None
+                n_gen = 0
+                for _chunk in llm(prompt, max_tokens=gen_tokens, temperature=0.0, stream=True):
+                    if first is None:
+                        first = time.perf_counter()
+                    n_gen += 1
+                end = time.perf_counter()
+                if first is None:
+                    continue
+                prompt_tps.append(n_prompt / max(first - start, 1e-6))
+                if n_gen > 1:
+                    gen_tps.append((n_gen - 1) / max(end - first, 1e-6))
+
+        if not prompt_tps or not gen_tps:
+            result['error'] = "no tokens generated"
+            return result
+        result['prompt_tps'] = statistics.median(prompt_tps)
+        result['gen_tps'] = statistics.median(gen_tps)
+        # Relative spread of generation speed: noisy configs (thermal throttling, swapping) are unstable
+        result['spread'] = (max(gen_tps) - min(gen_tps)) / result['gen_tps']
+        result['turn_s'] = TYPICAL_PROMPT_TOKENS / result['prompt_tps'] + TYPICAL_REPLY_TOKENS / result['gen_tps']
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        del llm
+    return result
+
+
+def candidate_values(current: Dict, quick: bool = False) -> Dict[str, List[int]]:
+    """Values to try for each parameter, derived from this machine's cores and the current config"""
+    physical = psutil.cpu_count(logical=False) or 4
+    logical = psutil.cpu_count(logical=True) or physical
+    threads = sorted({max(1, physical // 2), physical, logical, current.get('threads', physical)})
+    batches = [256, 512] if quick else [128, 256, 512, 1024]
+    gpu = current.get('gpu_layers', 0)
+    gpu_layers = [gpu] if quick else sorted({0, gpu // 2, gpu, 99})
+    try:
+        import llama_cpp
+        if hasattr(llama_cpp, 'llama_supports_gpu_offload') and not llama_cpp.llama_supports_gpu_offload():
+            gpu_layers = [0]  # CPU-only build
+    except Exception:
+        pass
+    return {'gpu_layers': gpu_layers, 'threads': threads, 'batch_size': batches}
+
+
+def tune(model_path: str, n_ctx: int, current: Dict, quick: bool = False, repeats: int = 2,
+         max_spread: float = 0.15, progress: Callable[[Dict], None] = None) -> Optional[Dict]:
+    """Coordinate-descent sweep: GPU layers, then threads, then batch size
+
+    Each parameter is swept with the best values found so far for the others, which needs
+    far fewer model loads than a full grid. Returns the fastest stable result (or None).
+    """
+    best = {'threads': current.get('threads', 4), 'batch_size': current.get('batch_size', 512),
+            'gpu_layers': current.get('gpu_layers', 0)}
+    tried: Dict[tuple, Dict] = {}
+    winner = None
+    for param, values in candidate_values(current, quick).items():
+        for value in values:
+            settings = dict(best, **{param: value})
+            key = (settings['threads'], settings['batch_size'], settings['gpu_layers'])
+            if key not in tried:
+                tried[key] = measure(model_path, n_ctx, settings['threads'], settings['batch_size'],
+                                     settings['gpu_layers'], repeats=repeats)
+                tried[key]['stable'] = tried[key]['ok'] and tried[key]['spread'] <= max_spread
+                if progress:
+                    progress(tried[key])
+            result = tried[key]
+            if result['stable'] and (winner is None or result['turn_s'] < winner['turn_s']):
+                winner = result
+        if winner:
+            best = {k: winner[k] for k in ('threads', 'batch_size', 'gpu_layers')}
+    return winner
+
+
+def write_settings(config_path: Path, settings: Dict) -> Path:
+    """Write threads/batch_size/gpu_layers into the model block; keeps a .bak of the old file"""
+    config_path = Path(config_path)
+    with open(config_path, 'r') as f:
+        cfg = json.load(f)
+    backup = config_path.with_suffix('.json.bak')
+    shutil.copy2(config_path, backup)
+    model = cfg.setdefault('model', {})
+    for key in ('threads', 'batch_size', 'gpu_layers'):
+        model[key] = settings[key]
+    tmp = config_path.with_suffix('.json.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(cfg, f, indent=2, ensure_ascii=False)
+    tmp.replace(config_path)
+    return backup
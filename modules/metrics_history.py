@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+WavesAI Metrics History Module
+Multi-resolution ring buffers of system metrics with window queries and trend answers
+"""
+
+import os
+import re
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# name: (label, unit)
+METRICS = {
+    'cpu': ('CPU', '%'),
+    'ram': ('RAM', '%'),
+    'swap': ('swap', '%'),
+    'disk': ('disk', '%'),
+    'load': ('load average', ''),
+    'cpu_temp': ('CPU temperature', '°C'),
+    'gpu': ('GPU', '%'),
+    'vram': ('VRAM', 'MB'),
+    'gpu_temp': ('GPU temperature', '°C'),
+}
+NAMES = list(METRICS)
+
+# (seconds per bucket, buckets): 1 s for 10 minutes, 1 min for 24 hours
+DEFAULT_TIERS = ((1, 600), (60, 1440))
+
+
+def snapshot_values(metrics: Dict) -> Dict[str, float]:
+    """Pick the tracked values out of a SystemMonitor snapshot's 'metrics' dict"""
+    gpu = metrics.get('gpu') or {}
+    load = metrics.get('load_avg') or (None,)
+    return {'cpu': metrics.get('cpu_percent'), 'ram': metrics.get('ram_percent'),
+            'swap': metrics.get('swap_percent'), 'disk': metrics.get('disk_percent'), 'load': load[0],
+            'cpu_temp': metrics.get('cpu_temp'), 'gpu': gpu.get('utilization'),
+            'vram': gpu.get('memory_used_mb'), 'gpu_temp': gpu.get('temperature')}
+
+
+class _Tier:
+    """Fixed-size ring of time buckets; each bucket keeps sum, count, min and max per metric"""
+
+    def __init__(self, step: int, slots: int, width: int):
+        self.step = step
+        self.slots = slots
+        self.buckets = np.full(slots, -1, dtype=np.int64)  # Absolute bucket number held by each slot
+        self.sums = np.zeros((slots, width))
+        self.counts = np.zeros((slots, width), dtype=np.int32)
+        self.mins = np.full((slots, width), np.nan)
+        self.maxs = np.full((slots, width), np.nan)
+
+    @property
+    def span(self) -> int:
+        return self.step * self.slots
+
+    def add(self, t: float, values: np.ndarray):
+        bucket = int(t // self.step)
+        slot = bucket % self.slots
+        if self.buckets[slot] != bucket:
+            self.buckets[slot] = bucket
+            self.sums[slot] = 0
+            self.counts[slot] = 0
+            self.mins[slot] = np.nan
+            self.maxs[slot] = np.nan
+        present = ~np.isnan(values)
+        self.sums[slot, present] += values[present]
+        self.counts[slot, present] += 1
+        self.mins[slot] = np.fmin(self.mins[slot], values)
+        self.maxs[slot] = np.fmax(self.maxs[slot], values)
+
+    def select(self, start: float, end: float) -> np.ndarray:
+        """Slots whose buckets fall inside [start, end], in time order"""
+        first, last = int(start // self.step), int(end // self.step)
+        mask = (self.buckets >= first) & (self.buckets <= last)
+        slots = np.flatnonzero(mask)
+        return slots[np.argsort(self.buckets[slots])]
+
+
+class MetricsHistory:
+    """System metrics over time at several resolutions, for questions about the past
+
+    Samples go into every tier; a query uses the finest tier that still covers its window.
+    Percentiles are computed over bucket means, so at 1-minute resolution they describe
+    minute averages rather than individual samples.
+    """
+
+    def __init__(self, path: str = None, tiers=DEFAULT_TIERS, persist_interval: float = 60):
+        self.path = path
+        self.persist_interval = persist_interval
+        self.tiers = [_Tier(step, slots, len(NAMES)) for step, slots in tiers]
+        self.lock = threading.Lock()
+        self.last_saved = time.time()
+        self.samples = 0
+        if path:
+            self.load()
+
+    def add(self, values: Dict[str, float], t: float = None):
+        """Record one sample ({metric: value}, missing or None values are skipped)"""
+        t = time.time() if t is None else t
+        row = np.array([np.nan if values.get(name) is None else float(values[name]) for name in NAMES])
+        with self.lock:
+            for tier in self.tiers:
+                tier.add(t, row)
+            self.samples += 1
+        if self.path and t - self.last_saved >= self.persist_interval:
+            self.save()
+
+    def _tier_for(self, start: float, now: float) -> _Tier:
+        for tier in self.tiers:
+            if now - start <= tier.span:
+                return tier
+        return self.tiers[-1]
+
+    def stats(self, metric: str, window: float, end: float = None) -> Optional[Dict]:
+        """{'min', 'max', 'max_at', 'avg', 'p50', 'p95', 'last', 'buckets', 'step'} over [end - window, end]"""
+        column = NAMES.index(metric)
+        now = time.time()
+        end = now if end is None else end
+        start = end - window
+        with self.lock:
+            tier = self._tier_for(start, now)
+            slots = tier.select(start, end)
+            counts = tier.counts[slots, column]
+            slots = slots[counts > 0]
+            if not len(slots):
+                return None
+            means = tier.sums[slots, column] / tier.counts[slots, column]
+            total = tier.counts[slots, column].sum()
+            top = int(np.nanargmax(tier.maxs[slots, column]))
+            p50, p95 = np.percentile(means, [50, 95])
+            return {'min': float(np.nanmin(tier.mins[slots, column])),
+                    'max': float(tier.maxs[slots[top], column]),
+                    'max_at': float(tier.buckets[slots[top]] * tier.step),
+                    'avg': float(tier.sums[slots, column].sum() / total),
+                    'p50': float(p50), 'p95': float(p95), 'last': float(means[-1]),
+                    'buckets': int(len(slots)), 'step': tier.step}
+
+    def value_at(self, metric: str, t: float) -> Optional[Tuple[float, float]]:
+        """(value, bucket time) of the bucket nearest to t, within two buckets"""
+        column = NAMES.index(metric)
+        with self.lock:
+            tier = self._tier_for(t, time.time())
+            slots = tier.select(t - 2 * tier.step, t + 2 * tier.step)
+            slots = slots[tier.counts[slots, column] > 0]
+            if not len(slots):
+                return None
+            times = tier.buckets[slots] * tier.step + tier.step / 2
+            best = slots[int(np.argmin(np.abs(times - t)))]
+            return (float(tier.sums[best, column] / tier.counts[best, column]), float(tier.buckets[best] * tier.step))
+
+    def context(self, window: float = 3600, metrics=('cpu', 'ram', 'gpu', 'cpu_temp', 'gpu_temp')) -> str:
+        """One compact line for the LLM prompt, e.g. 'Last 60 min: CPU avg 23% max 91% at 14:02 | ...'"""
+        parts = []
+        for metric in metrics:
+            s = self.stats(metric, window)
+            if not s:
+                continue
+            label, unit = METRICS[metric]
+            parts.append(f"{label} avg {s['avg']:.0f}{unit} max {s['max']:.0f}{unit} at "
+                         f"{datetime.fromtimestamp(s['max_at']).strftime('%H:%M')}")
+        return f"Last {window / 60:.0f} min: " + " | ".join(parts) if parts else ""
+
+    # Persistence
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            arrays = {'names': np.array(NAMES)}
+            for i, tier in enumerate(self.tiers):
+                arrays.update({f't{i}_step': np.array([tier.step, tier.slots]), f't{i}_buckets': tier.buckets.copy(),
+                               f't{i}_sums': tier.sums.copy(), f't{i}_counts': tier.counts.copy(),
+                               f't{i}_mins': tier.mins.copy(), f't{i}_maxs': tier.maxs.copy()})
+            self.last_saved = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.tmp.npz"
+            np.savez_compressed(tmp, **arrays)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def load(self) -> bool:
+        """Restore saved tiers whose layout matches this instance (others start empty)"""
+        try:
+            with np.load(self.path) as data:
+                if list(data['names']) != NAMES:
+                    return False
+                with self.lock:
+                    for i, tier in enumerate(self.tiers):
+                        if f't{i}_step' not in data or list(data[f't{i}_step']) != [tier.step, tier.slots]:
+                            continue
+                        tier.buckets = data[f't{i}_buckets'].copy()
+                        tier.sums = data[f't{i}_sums'].copy()
+                        tier.counts = data[f't{i}_counts'].copy()
+                        tier.mins = data[f't{i}_mins'].copy()
+                        tier.maxs = data[f't{i}_maxs'].copy()
+            return True
+        except (OSError, KeyError, ValueError):
+            return False
+
+
+# Natural-language trend questions: "what was my cpu an hour ago", "peak ram usage today"
+
+_METRIC_WORDS = [
+    ('cpu_temp', r"cpu temp(erature)?|processor temp(erature)?|cpu heat"),
+    ('gpu_temp', r"gpu temp(erature)?|graphics temp(erature)?"),
+    ('vram', r"vram|gpu memory|video memory"),
+    ('gpu', r"gpu|graphics card"),
+    ('cpu', r"cpu|processor"),
+    ('ram', r"ram|memory"),
+    ('swap', r"swap"),
+    ('disk', r"disk|storage"),
+    ('load', r"load average|system load|load"),
+]
+_UNITS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hr': 3600, 'hour': 3600,
+          'd': 86400, 'day': 86400}
+_NUMBERS = {'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'ten': 10, 'fifteen': 15,
+            'twenty': 20, 'thirty': 30, 'few': 3, 'couple of': 2, 'half an': 0.5}
+_AMOUNT = r"(\d+(?:\.\d+)?|half an|couple of|a|an|one|two|three|four|five|ten|fifteen|twenty|thirty|few)"
+_UNIT = r"(seconds?|secs?|minutes?|mins?|hours?|hrs?|days?|[smhd])"
+_ago = re.compile(rf"\b{_AMOUNT}\s*{_UNIT}\s+ago\b")
+_window = re.compile(rf"\b(?:last|past|previous|over the last|in the last)\s+(?:{_AMOUNT}\s*)?{_UNIT}\b")
+_trend = re.compile(r"\b(peak|peaked|spike|spiked|highest|lowest|max(imum)?|min(imum)?|average|avg|"
+                    r"earlier|while i was away)\b")
+# Without one of these the question is about hardware in general ("when was the first gpu released")
+_cue = re.compile(r"\b(my|mine|usage|used|utili[sz]ation|load|temp|temperature|this (machine|computer|pc|laptop|system))\b")
+
+
+def _seconds(amount: Optional[str], unit: str) -> float:
+    unit = unit.rstrip('s') if len(unit) > 1 else unit
+    n = 1.0 if amount is None else float(_NUMBERS.get(amount, amount))
+    return n * _UNITS.get(unit, 60)
+
+
+def parse_history_query(text: str) -> Optional[Dict]:
+    """{'metric', 'at'} for a point in the past or {'metric', 'window'} for a span, else None"""
+    lower = text.lower()
+    if not _cue.search(lower):
+        return None
+    metric = next((name for name, pattern in _METRIC_WORDS if re.search(rf"\b({pattern})\b", lower)), None)
+    if metric is None:
+        return None
+    match = _ago.search(lower)
+    if match:
+        return {'metric': metric, 'at': _seconds(match.group(1), match.group(2))}
+    match = _window.search(lower)
+    if match:
+        return {'metric': metric, 'window': _seconds(match.group(1), match.group(2))}
+    if re.search(r"\btoday\b", lower):
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        return {'metric': metric, 'window': time.time() - midnight, 'label': 'today'}
+    if _trend.search(lower) and not re.search(r"\b(now|right now|currently|current)\b", lower):
+        return {'metric': metric, 'window': 3600}
+    return None
+
+
+# (question, expected metric or None), checked by evaluate_fixtures() and `wavesctl bench intent`
+FIXTURES: List[Tuple[str, Optional[str]]] = [
+    ("what was my cpu an hour ago", 'cpu'),
+    ("what was my cpu usage 10 minutes ago", 'cpu'),
+    ("peak ram usage today", 'ram'),
+    ("how busy was my gpu over the last 2 hours", 'gpu'),
+    ("what was the highest cpu temperature earlier", 'cpu_temp'),
+    ("average memory usage in the last 30 minutes", 'ram'),
+    ("did my gpu spike while i was away", 'gpu'),
+    ("when was the first gpu released", None),
+    ("what was the first processor made by intel", None),
+    ("what did the news say about disk drives today", None),
+    ("what were the best graphics cards of 2020", None),
+    ("history of the cpu", None),
+    ("what is my cpu usage", None),
+    ("how much ram does my laptop have", None),
+    ("how much memory is used right now", None),
+]
+
+
+def evaluate_fixtures() -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """(question, expected, parsed) for every fixture parse_history_query gets wrong"""
+    wrong = []
+    for text, expected in FIXTURES:
+        query = parse_history_query(text)
+        got = query['metric'] if query else None
+        if got != expected:
+            wrong.append((text, expected, got))
+    return wrong
+
+
+def _span(seconds: float) -> str:
+    """'an hour', '30 minutes', '1.5 hours'"""
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            n = round(seconds / size, 1)
+            if n == 1:
+                return f"{'an' if unit == 'hour' else 'a'} {unit}"
+            return f"{n:g} {unit}s"
+    return f"{seconds:.0f} seconds"
+
+
+def answer_history_query(history: MetricsHistory, query: Dict) -> str:
+    """Spoken-style answer for a parse_history_query() result"""
+    metric = query['metric']
+    label, unit = METRICS[metric]
+    if 'at' in query:
+        found = history.value_at(metric, time.time() - query['at'])
+        if not found:
+            return f"I have no {label} readings from {_span(query['at'])} ago, sir."
+        value, at = found
+        return (f"Your {label} was at {value:.0f}{unit} {_span(query['at'])} ago "
+                f"({datetime.fromtimestamp(at).strftime('%H:%M')}), sir.")
+    s = history.stats(metric, query['window'])
+    span = query.get('label') or "the last " + re.sub(r"^an? ", "", _span(query['window']))
+    if not s:
+        return f"I have no {label} readings for {span}, sir."
+    peak = datetime.fromtimestamp(s['max_at']).strftime('%H:%M')
+    return (f"{'Today' if span == 'today' else 'Over ' + span} your {label} averaged {s['avg']:.0f}{unit} "
+            f"(low {s['min']:.0f}{unit}, peak {s['max']:.0f}{unit} at {peak}, 95th percentile "
+            f"{s['p95']:.0f}{unit}), sir.")
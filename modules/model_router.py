@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+WavesAI Model Router Module
+Sends short-form tasks to a small GGUF model and keeps the main model for long answers
+"""
+
+import time
+import statistics
+from typing import Dict, Iterator, List, Optional
+
+
+DEFAULT_SMALL_TASKS = ('error_explanation', 'command_summary', 'intent_disambiguation')
+
+SMALL_SYSTEM = ("You are WavesAI, a concise JARVIS-like assistant for a Linux desktop. Address the user as "
+                "'sir' when appropriate. Answer in at most three sentences.")
+
+
+def load_small_model(model_path: str, n_ctx: int = 2048, n_gpu_layers: int = 99, n_threads: int = None):
+    from llama_cpp import Llama
+    return Llama(model_path=model_path, n_ctx=n_ctx, n_gpu_layers=n_gpu_layers, n_threads=n_threads, verbose=False)
+
+
+class ModelRouter:
+    """Decides which model handles a task class, and runs short tasks on the small model
+
+    Short tasks get a compact system prompt and no retrieval, so the small model's prompt
+    evaluation stays in the tens of milliseconds. Without a small model everything goes to
+    the main model, as before.
+    """
+
+    def __init__(self, small_llm=None, tasks=DEFAULT_SMALL_TASKS, max_tokens: int = 160):
+        self.small_llm = small_llm
+        self.tasks = set(tasks)
+        self.max_tokens = max_tokens
+        self.timings: Dict[str, List[float]] = {}
+        self._grammars: Dict[tuple, object] = {}
+
+    def use_small(self, task: Optional[str]) -> bool:
+        return self.small_llm is not None and task in self.tasks
+
+    def prompt(self, text: str) -> str:
+        return (f"<|start_header_id|>system<|end_header_id|>\n\n{SMALL_SYSTEM}<|eot_id|>"
+                f"<|start_header_id|>user<|end_header_id|>\n\n{text}<|eot_id|>"
+                f"<|start_header_id|>assistant<|end_header_id|>\n\n")
+
+    def stream(self, text: str, task: str = None, llm=None, max_tokens: int = None,
+               temperature: float = 0.5) -> Iterator[str]:
+        """Stream a short answer from the small model (or the given llm)"""
+        llm = llm or self.small_llm
+        start = time.perf_counter()
+        try:
+            for chunk in llm(self.prompt(text), max_tokens=max_tokens or self.max_tokens, temperature=temperature,
+                             stop=["<|eot_id|>", "<|end_of_text|>"], stream=True):
+                token = chunk['choices'][0].get('text', '')
+                if token:
+                    yield token
+        finally:
+            if task:
+                self.timings.setdefault(task, []).append((time.perf_counter() - start) * 1000)
+
+    def disambiguate(self, text: str, candidates: List[str], llm=None) -> Optional[str]:
+        """Pick one of the candidate intents with a grammar-constrained one-word answer"""
+        llm = llm or self.small_llm
+        if llm is None or not candidates:
+            return None
+        key = tuple(candidates)
+        if key not in self._grammars:
+            try:
+                from llama_cpp import LlamaGrammar
+                rule = " | ".join(f'"{name}"' for name in candidates)
+                self._grammars[key] = LlamaGrammar.from_string(f"root ::= {rule}", verbose=False)
+            except Exception:
+                self._grammars[key] = None
+        labels = ", ".join(candidates)
+        question = (f"Classify the request into exactly one of: {labels}.\n"
+                    f"news = current events, weather = forecast or conditions, location = where the user is, "
+                    f"info = general knowledge.\nRequest: {text}\nLabel:")
+        start = time.perf_counter()
+        try:
+            kwargs = {'grammar': self._grammars[key]} if self._grammars[key] else {}
+            result = llm(self.prompt(question), max_tokens=4, temperature=0.0, **kwargs)
+            label = result['choices'][0]['text'].strip().lower()
+        except Exception:
+            return None
+        finally:
+            self.timings.setdefault('intent_disambiguation', []).append((time.perf_counter() - start) * 1000)
+        return label if label in candidates else None
+
+    def stats(self) -> Dict[str, Dict]:
+        return {task: {'count': len(ms), 'median_ms': statistics.median(ms)}
+                for task, ms in self.timings.items() if ms}
+
+
+# One representative prompt per task class
+BENCH_TASKS = {
+    'error_explanation': (
+        "The user tried to execute: pacman -S neovim\nThe command failed with this error:\n\n"
+        "Error Type: Permission denied\nError Details: error: you cannot perform this operation unless you are root.\n"
+        "Recommended Solution: Run the command with sudo\n\n"
+        "Explain this error to the user conversationally. Be brief (2-3 sentences)."),
+    'command_summary': (
+        "The user asked: 'what is using my memory'\nCommand executed: ps aux --sort=-%mem | head -5\nOutput:\n"
+        "USER PID %CPU %MEM COMMAND\nbowser 2211 4.1 12.3 firefox\nbowser 3120 1.2 6.8 code\n"
+        "bowser 1043 0.4 3.1 Xwayland\nroot 612 0.1 1.2 dockerd\n\n"
+        "Provide a brief, conversational summary of this information."),
+    'intent_disambiguation': "what's the weather news in Mumbai today",
+    'short_reply': "Say good morning and remind me to drink water, in one sentence.",
+}
+
+
+def benchmark(models: Dict[str, object], repeats: int = 3, progress=None) -> Dict[str, Dict[str, Dict]]:
+    """Latency per task class on each model: {model: {task: {'ttft_ms', 'total_ms', 'tokens'}}}"""
+    results = {}
+    router = ModelRouter()
+    for name, llm in models.items():
+        results[name] = {}
+        for task, text in BENCH_TASKS.items():
+            ttft, total, tokens = [], [], []
+            for _ in range(repeats):
+                llm.reset()
+                start = time.perf_counter()
+                if task == 'intent_disambiguation':
+                    router.disambiguate(text, ['info', 'news', 'weather'], llm=llm)
+                    ttft.append((time.perf_counter() - start) * 1000)
+                    total.append(ttft[-1])
+                    tokens.append(1)
+                    continue
+                first = None
+                n = 0
+                for _token in router.stream(text, llm=llm, temperature=0.0):
+                    if first is None:
+                        first = time.perf_counter()
+                    n += 1
+                end = time.perf_counter()
+                ttft.append(((first or end) - start) * 1000)
+                total.append((end - start) * 1000)
+                tokens.append(n)
+            results[name][task] = {'ttft_ms': statistics.median(ttft), 'total_ms': statistics.median(total),
+                                   'tokens': int(statistics.median(tokens))}
+            if progress:
+                progress(name, task, results[name][task])
+    return results
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+WavesAI Model Server Module
+Long-lived daemon that owns the model, Whisper and caches, with a thin client over a Unix socket
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+DEFAULT_SOCKET = str(Path.home() / ".wavesai/run/wavesai.sock")
+
+
+def _send(conn: socket.socket, message: Dict):
+    conn.sendall((json.dumps(message, default=str) + "\n").encode('utf-8'))
+
+
+class ModelServer:
+    """Serves one WavesAI instance to any number of local clients
+
+    Protocol: one JSON object per line. A client sends {"op": ..., ...} and reads replies;
+    "generate" streams {"token": ...} lines followed by {"done": true, "stats": {...}}.
+    Closing the connection mid-stream cancels the generation. Generations from all clients
+    go through the WavesAI instance's LLM scheduler, so an optional "priority" field orders
+    them and lets an interactive request preempt background work.
+    """
+
+    def __init__(self, ai, socket_path: str = DEFAULT_SOCKET, model_name: str = ""):
+        self.ai = ai
+        self.model_name = model_name
+        self.socket_path = Path(socket_path)
+        self.whisper_lock = threading.Lock()
+        self.whisper_model = None
+        self.running = False
+        self.started = time.time()
+        self.requests = 0
+
+    def serve_forever(self):
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if ModelClient(str(self.socket_path)).ping():
+                raise RuntimeError(f"a WavesAI daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # Stale socket from a crashed daemon
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        sock.listen(16)
+        sock.settimeout(0.5)  # Lets shutdown() be noticed without a connection
+        self.running = True
+        print(f"\033[1;32m[Daemon]\033[0m Listening on {self.socket_path} (pid {os.getpid()})", flush=True)
+        try:
+            while self.running:
+                try:
+                    conn, _ = sock.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                conn.settimeout(None)
+                threading.Thread(target=self._handle, args=(conn,), name="wavesai-client", daemon=True).start()
+        finally:
+            sock.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+            print("\033[1;33m[Daemon]\033[0m Stopped", flush=True)
+
+    def shutdown(self):
+        self.running = False
+
+    def _handle(self, conn: socket.socket):
+        with conn:
+            try:
+                for line in conn.makefile('rb'):
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        handler = getattr(self, f"op_{request.get('op')}", None)
+                        if handler is None:
+                            _send(conn, {'error': f"unknown op: {request.get('op')}"})
+                            continue
+                        self.requests += 1
+                        handler(conn, request)
+                    except (OSError, BrokenPipeError):
+                        raise
+                    except Exception as e:
+                        _send(conn, {'error': str(e)})
+            except OSError:
+                pass  # Client went away
+
+    def op_ping(self, conn, request):
+        _send(conn, {'ok': True, 'pid': os.getpid(), 'ready': self.ai.llm is not None,
+                     'model': self.model_name, 'preset': getattr(self.ai, 'active_preset', 'default'),
+                     'uptime': time.time() - self.started})
+
+    def op_generate(self, conn, request):
+        job = self.ai.submit_generation(request.get('text', ''), request.get('priority', 0),
+                                        remember=request.get('remember', False), name="client request",
+                                        allow_actions=request.get('allow_actions', True),
+                                        spoken=request.get('spoken', False), task=request.get('task'))
+        tokens = job.tokens()
+        try:
+            for token in tokens:
+                _send(conn, {'token': token})
+        finally:
+            tokens.close()  # Cancels the job when the client disconnected mid-stream
+        _send(conn, {'done': True, 'stats': job.stats})
+
+    def op_transcribe(self, conn, request):
+        with self.whisper_lock:
+            model = self._whisper(request.get('model', 'base'))
+            segments, _ = model.transcribe(request['path'], beam_size=5, language=request.get('language', 'en'),
+                                           vad_filter=True, condition_on_previous_text=False)
+            text = " ".join(s.text for s in segments).strip()
+        _send(conn, {'text': text})
+
+    def _whisper(self, name: str):
+        """Load faster-whisper once and keep it resident"""
+        if self.whisper_model is None:
+            from faster_whisper import WhisperModel
+            try:
+                self.whisper_model = WhisperModel(name, device="cuda", compute_type="float16")
+            except Exception:
+                self.whisper_model = WhisperModel(name, device="cpu", compute_type="int8")
+        return self.whisper_model
+
+    def op_preset(self, conn, request):
+        for line in self.ai.run_preset(request.get('name', '')):
+            _send(conn, {'line': line})
+        _send(conn, {'done': True, 'preset': self.ai.active_preset})
+
+    def op_forget(self, conn, request):
+        self.ai.conversation_memory.clear()
+        _send(conn, {'ok': True})
+
+    def op_cache(self, conn, request):
+        if request.get('action') == 'clear':
+            self.ai.response_cache.clear()
+        _send(conn, self.ai.response_cache.stats())
+
+    def op_stats(self, conn, request):
+        _send(conn, {'uptime': time.time() - self.started, 'requests': self.requests,
+                     'ready': self.ai.llm is not None, 'whisper_loaded': self.whisper_model is not None,
+                     'history': self.ai.perf_metrics.recent(20),
+                     'jobs': self.ai.llm_scheduler.stats(),
+                     'cache': self.ai.response_cache.stats(),
+                     'length_policy': self.ai.length_policy.stats(),
+                     'small_model': self.ai.model_router.stats()})
+
+    def op_shutdown(self, conn, request):
+        _send(conn, {'ok': True})
+        self.shutdown()
+
+
+class ModelClient:
+    """Thin client for ModelServer; connecting costs a few milliseconds"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 2.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.last_stats: Dict = {}
+
+    def _connect(self, timeout: Optional[float]) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(timeout)
+        return sock
+
+    def request(self, op: str, timeout: Optional[float] = None, **kwargs) -> Dict:
+        """Send one request and return its single reply; raises OSError if the daemon is unreachable"""
+        with self._connect(timeout if timeout is not None else self.timeout) as sock:
+            _send(sock, dict(kwargs, op=op))
+            line = sock.makefile('rb').readline()
+        if not line:
+            raise ConnectionError("daemon closed the connection")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    def ping(self) -> Optional[Dict]:
+        """Daemon info, or None if no daemon is listening"""
+        if not os.path.exists(self.socket_path):
+            return None
+        try:
+            return self.request('ping')
+        except (OSError, ValueError, RuntimeError):
+            return None
+
+    def stream(self, text: str, remember: bool = False, priority: int = 0, allow_actions: bool = True,
+               spoken: bool = False, task: str = None) -> Iterator[str]:
+        """Yield response tokens; closing the generator early cancels the generation on the daemon"""
+        self.last_stats = {}
+        with self._connect(None) as sock:
+            _send(sock, {'op': 'generate', 'text': text, 'remember': remember, 'priority': priority,
+                         'allow_actions': allow_actions, 'spoken': spoken, 'task': task})
+            for line in sock.makefile('rb'):
+                message = json.loads(line)
+                if 'token' in message:
+                    yield message['token']
+                elif message.get('done'):
+                    self.last_stats = message.get('stats') or {}
+                    return
+                elif 'error' in message:
+                    raise RuntimeError(message['error'])
+        raise ConnectionError("daemon closed the connection mid-stream")
+
+    def preset(self, name: str) -> Iterator[str]:
+        """Apply a preset on the daemon; yields its progress lines"""
+        with self._connect(None) as sock:
+            _send(sock, {'op': 'preset', 'name': name})
+            for line in sock.makefile('rb'):
+                message = json.loads(line)
+                if 'line' in message:
+                    yield message['line']
+                elif message.get('done'):
+                    return
+                elif 'error' in message:
+                    raise RuntimeError(message['error'])
+
+    def transcribe(self, path: str, model: str = 'base') -> str:
+        return self.request('transcribe', timeout=120, path=os.path.abspath(path), model=model)['text']
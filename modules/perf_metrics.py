@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+WavesAI Performance Metrics Module
+Per-turn LLM timings kept in a rolling buffer and a SQLite table, with p50/p95 summaries
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# Summarised metrics, in display order: (key, label, unit)
+METRICS = [
+    ('prompt_tokens', 'Prompt tokens', ''),
+    ('cached_tokens', 'Cached prefix', ''),
+    ('prompt_eval_ms', 'Prompt eval', 'ms'),
+    ('ttft_ms', 'First token', 'ms'),
+    ('tokens_per_sec', 'Generation', 'tok/s'),
+    ('tokens', 'Reply tokens', ''),
+    ('total_ms', 'Turn total', 'ms'),
+    ('queue_ms', 'Queued', 'ms'),
+    ('cancel_latency_ms', 'Cancel latency', 'ms'),
+    ('retrieval_ms', 'Retrieval', 'ms'),
+]
+
+_COLUMNS = [key for key, _, _ in METRICS]
+
+
+def cached_prefix_tokens(llm, prompt: str) -> Optional[int]:
+    """How many leading tokens of prompt are already in the model's KV cache (llama.cpp skips them)"""
+    try:
+        tokens = np.asarray(llm.tokenize(prompt.encode('utf-8'), add_bos=True, special=True))
+        current = np.asarray(llm._input_ids)
+        n = min(len(tokens), len(current))
+        mismatch = np.flatnonzero(tokens[:n] != current[:n])
+        return int(mismatch[0]) if len(mismatch) else n
+    except Exception:
+        return None
+
+
+class PerfMetrics:
+    """Rolling in-memory history of finished turns, mirrored to the perf_metrics table
+
+    Each record is the stats dict of one turn. Retrieval time per source arrives as
+    'retrieval_sources' ({name: ms}) and is summarised as 'retrieval.<name>'.
+    """
+
+    def __init__(self, db_path: str = None, history: int = 500, max_rows: int = 20000):
+        self.history = deque(maxlen=history)
+        self.max_rows = max_rows
+        self.lock = threading.Lock()
+        self.conn = None
+        self.writes = 0
+        if db_path:
+            try:
+                self.conn = sqlite3.connect(db_path, check_same_thread=False)
+                columns = ", ".join(f"{c} REAL" for c in _COLUMNS)
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS perf_metrics (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        created_at REAL,
+                        name TEXT,
+                        intent TEXT,
+                        model TEXT,
+                        status TEXT,
+                        {columns},
+                        extra TEXT
+                    )
+                """)
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_perf_metrics_time ON perf_metrics (created_at)")
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn = None
+
+    def record(self, stats: Dict, persist: bool = True):
+        """Add one finished turn (persist=False keeps it in memory only)"""
+        row = dict(stats, created_at=stats.get('created_at', time.time()))
+        self.history.append(row)
+        if not persist or self.conn is None:
+            return
+        extra = {k: v for k, v in row.items() if k not in _COLUMNS and k not in
+                 ('created_at', 'name', 'intent', 'model', 'status') and isinstance(v, (int, float, str, bool, dict))}
+        with self.lock:
+            try:
+                self.conn.execute(
+                    f"INSERT INTO perf_metrics (created_at, name, intent, model, status, {', '.join(_COLUMNS)}, extra) "
+                    f"VALUES ({', '.join('?' * (len(_COLUMNS) + 6))})",
+                    [row['created_at'], row.get('name'), row.get('intent'), row.get('model', 'main'),
+                     row.get('status')] + [row.get(c) for c in _COLUMNS] + [json.dumps(extra)])
+                self.writes += 1
+                if self.writes % 100 == 0:
+                    self.conn.execute("DELETE FROM perf_metrics WHERE id NOT IN "
+                                      "(SELECT id FROM perf_metrics ORDER BY id DESC LIMIT ?)", (self.max_rows,))
+                self.conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def recent(self, n: int = None) -> List[Dict]:
+        rows = list(self.history)
+        return rows[-n:] if n else rows
+
+    def load(self, since: float = None, limit: int = None) -> List[Dict]:
+        """Stored turns, oldest first (since is a unix timestamp)"""
+        if self.conn is None:
+            return []
+        query = f"SELECT created_at, name, intent, model, status, {', '.join(_COLUMNS)}, extra FROM perf_metrics"
+        args = []
+        if since is not None:
+            query += " WHERE created_at >= ?"
+            args.append(since)
+        query += " ORDER BY id DESC"
+        if limit:
+            query += " LIMIT ?"
+            args.append(limit)
+        with self.lock:
+            try:
+                fetched = self.conn.execute(query, args).fetchall()
+            except sqlite3.Error:
+                return []
+        rows = []
+        for values in reversed(fetched):
+            row = json.loads(values[-1] or '{}')
+            row.update(zip(['created_at', 'name', 'intent', 'model', 'status'] + _COLUMNS, values[:-1]))
+            rows.append({k: v for k, v in row.items() if v is not None})
+        return rows
+
+
+def summarize(rows: List[Dict]) -> Dict[str, Dict]:
+    """{metric: {'count', 'p50', 'p95', 'max'}} over the rows that have each metric
+
+    Canceled turns only count towards cancel latency, and cache hits only towards the
+    turn total, so neither skews the model timings.
+    """
+    values: Dict[str, List[float]] = {}
+    for row in rows:
+        canceled = row.get('canceled') or row.get('status') == 'canceled'
+        for key in _COLUMNS:
+            value = row.get(key)
+            if value is None or (canceled and key != 'cancel_latency_ms'):
+                continue
+            if row.get('cache_hit') and key != 'total_ms':
+                continue
+            values.setdefault(key, []).append(float(value))
+        for source, ms in (row.get('retrieval_sources') or {}).items():
+            values.setdefault(f'retrieval.{source}', []).append(float(ms))
+    summary = {}
+    for key, series in values.items():
+        data = np.asarray(series)
+        p50, p95 = np.percentile(data, [50, 95])
+        summary[key] = {'count': len(data), 'p50': float(p50), 'p95': float(p95), 'max': float(data.max())}
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict], indent: str = "  ") -> List[str]:
+    """Table lines for a summarize() result"""
+    if not summary:
+        return [f"{indent}No turns recorded yet."]
+    lines = [f"{indent}{'':<24} {'p50':>9} {'p95':>9} {'max':>9}   n"]
+    labels = [(key, f"{label} ({unit})" if unit else label, unit) for key, label, unit in METRICS]
+    labels += [(key, f"  {key.split('.', 1)[1]} (ms)", 'ms') for key in sorted(summary) if key.startswith('retrieval.')]
+    for key, label, unit in labels:
+        s = summary.get(key)
+        if not s:
+            continue
+        digits = 1 if unit == 'tok/s' else 0
+        lines.append(f"{indent}{label:<24} {s['p50']:9.{digits}f} {s['p95']:9.{digits}f} {s['max']:9.{digits}f}"
+                     f"   {s['count']}")
+    return lines
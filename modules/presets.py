@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+WavesAI Presets Module
+Turns the presets block of config.json into concrete runtime settings, and a quick speed probe
+"""
+
+import time
+from typing import Dict, Optional
+
+
+SPEED_PROBE_PROMPT = ("<|start_header_id|>user<|end_header_id|>\n\nCount from one to forty in words, "
+                      "separated by commas.<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n")
+
+
+def resolve_preset(presets: Dict, name: str, defaults: Dict) -> Optional[Dict]:
+    """Settings for a preset, starting from defaults ('default' returns the defaults unchanged)
+
+    Understood keys: gpu_layers, threads, batch_size, max_tokens, monitor_interval, plus the
+    flags reduce_monitoring, monitor_resources, disable_notifications and increase_priority.
+    Anything else in a preset is ignored.
+    """
+    if name == 'default':
+        return dict(defaults)
+    preset = presets.get(name)
+    if preset is None:
+        return None
+    settings = dict(defaults)
+    for key in ('gpu_layers', 'threads', 'batch_size', 'max_tokens', 'monitor_interval'):
+        if key in preset:
+            settings[key] = preset[key]
+    if preset.get('reduce_monitoring'):
+        settings['monitor_interval'] = max(settings['monitor_interval'], 5)
+        settings['alert_interval'] = max(settings['alert_interval'], 120)
+    if preset.get('monitor_resources'):
+        settings['monitor_interval'] = min(settings['monitor_interval'], 1)
+        settings['alert_interval'] = min(settings['alert_interval'], 10)
+    if preset.get('disable_notifications'):
+        settings['mute_alerts'] = True
+    if preset.get('increase_priority'):
+        settings['nice'] = -5
+    return settings
+
+
+def measure_speed(llm, max_tokens: int = 48) -> Optional[float]:
+    """Greedy generation tokens/sec on a fixed prompt (None if it fails)"""
+    try:
+        llm.reset()
+        first = None
+        n = 0
+        for _chunk in llm(SPEED_PROBE_PROMPT, max_tokens=max_tokens, temperature=0.0, top_k=1, stream=True):
+            if first is None:
+                first = time.perf_counter()
+            n += 1
+        if first is None or n < 2:
+            return None
+        return (n - 1) / (time.perf_counter() - first)
+    except Exception:
+        return None
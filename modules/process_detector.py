@@ -4,12 +4,31 @@ Smart Process Detector - Intelligent process name matching
 Handles common app name variations and aliases
 """
 
+import os
+import pwd
+import time
 import subprocess
 import re
 from typing import List, Dict, Optional
 
+import psutil
+
+
+_SUFFIXES = ['-bin', '-desktop', '.exe', '-browser', '-app']
+_PREFIXES = ['com.', 'org.', 'md.', '@']
+
+
+def _clean_name(text: str) -> str:
+    """Name with the common packaging suffixes/prefixes removed (as _fuzzy_match does)"""
+    for suffix in _SUFFIXES:
+        text = text.replace(suffix, '')
+    for prefix in _PREFIXES:
+        text = text.replace(prefix, '')
+    return text
+
+
 class ProcessDetector:
-    def __init__(self):
+    def __init__(self, max_age: float = 1.0):
         # Common app name mappings
         self.app_aliases = {
             # Code Editors
@@ -70,9 +89,99 @@ class ProcessDetector:
             'thunderbird': ['thunderbird', 'thunderbird-bin', 'org.mozilla.Thunderbird'],
             'keepass': ['keepassxc', 'keepass', 'org.keepassxc.KeePassXC'],
         }
+        
+        # Process list, re-read at most once per max_age seconds
+        self.max_age = max_age
+        self._processes: List[Dict] = []
+        self._scans: Dict[tuple, List[Dict]] = {}  # Lookup results for the current process list
+        self._refreshed_at = 0.0
+        self._users: Dict[int, str] = {}
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
     
     def get_all_processes(self) -> List[Dict]:
-        """Get all running processes with detailed info"""
+        """Get all running processes with detailed info
+        
+        Same fields as `ps aux` (user, pid, cpu, mem, command, name, as strings), read
+        straight from /proc (psutil where there is no /proc) instead of forking ps.
+        """
+        self._refresh()
+        return list(self._processes)
+    
+    def _refresh(self, force: bool = False):
+        if not force and self._processes and time.monotonic() - self._refreshed_at < self.max_age:
+            return
+        try:
+            processes = self._read_proc() if os.path.isdir('/proc/self') else self._read_psutil()
+        except Exception:
+            processes = []
+        self._processes = processes
+        self._scans = {}
+        self._refreshed_at = time.monotonic()
+    
+    def _user(self, uid: int) -> str:
+        user = self._users.get(uid)
+        if user is None:
+            try:
+                user = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                user = str(uid)
+            self._users[uid] = user
+        return user
+    
+    def _entry(self, pid: int, user: str, cpu: float, mem: float, comm: str, argv: List[str]) -> Dict:
+        command = ' '.join(argv) if argv else f'[{comm}]'
+        name = argv[0] if argv else f'[{comm}]'
+        return {'user': user, 'pid': str(pid), 'cpu': f"{cpu:.1f}", 'mem': f"{mem:.1f}",
+                'command': command, 'name': name}
+    
+    def _read_proc(self) -> List[Dict]:
+        """One pass over /proc: stat (name, CPU time, start, RSS), cmdline and the owner uid"""
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        with open('/proc/meminfo') as f:
+            mem_total = int(f.readline().split()[1]) * 1024
+        processes = []
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry.name}/stat', 'rb') as f:
+                    stat = f.read().decode('utf-8', 'replace')
+                with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                    cmdline = f.read()
+                uid = entry.stat().st_uid
+            except OSError:
+                continue  # Exited while we were reading
+            # comm is in parentheses and may itself contain spaces or parentheses
+            comm = stat[stat.index('(') + 1:stat.rindex(')')]
+            fields = stat[stat.rindex(')') + 2:].split()
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+            elapsed = uptime - int(fields[19]) / self._clock_ticks
+            cpu = cpu_seconds / elapsed * 100 if elapsed > 0 else 0.0  # Lifetime average, like ps
+            mem = int(fields[21]) * self._page_size / mem_total * 100
+            argv = [a.decode('utf-8', 'replace') for a in cmdline.split(b'\0') if a]
+            processes.append(self._entry(int(entry.name), self._user(uid), cpu, mem, comm, argv))
+        return processes
+    
+    def _read_psutil(self) -> List[Dict]:
+        """Fallback for systems without a Linux-style /proc"""
+        now = time.time()
+        processes = []
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    elapsed = now - proc.create_time()
+                    cpu = (times.user + times.system) / elapsed * 100 if elapsed > 0 else 0.0
+                    processes.append(self._entry(proc.pid, proc.username(), cpu, proc.memory_percent(),
+                                                 proc.name(), proc.cmdline()))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return processes
+    
+    def legacy_get_all_processes(self) -> List[Dict]:
+        """The previous `ps aux` implementation, kept for the benchmark"""
         try:
             # Use ps aux to get detailed process info
             result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
@@ -96,14 +205,31 @@ class ProcessDetector:
             return []
     
     def find_process_by_name(self, app_name: str) -> List[Dict]:
-        """Find processes matching the app name using smart detection"""
+        """Find processes matching the app name using smart detection
+        
+        Every process is checked against every alias with the substring and fuzzy rules of
+        the `ps aux` version, so helpers that only carry the alias in their command line
+        (`/usr/lib/firefox/firefox -contentproc`) are found too. The scan runs over the
+        cached /proc listing and its result is memoised until the next refresh.
+        """
+        app_name = app_name.lower().strip()
+        self._refresh()
+        possible_names = [name.lower() for name in self.app_aliases.get(app_name, [app_name])]
+        key = tuple(possible_names)
+        if key not in self._scans:
+            self._scans[key] = self._scan_processes(self._processes, possible_names)
+        return list(self._scans[key])
+    
+    def legacy_find_process_by_name(self, app_name: str) -> List[Dict]:
+        """The previous `ps aux` + nested scan lookup, kept for the benchmark"""
         app_name = app_name.lower().strip()
-        processes = self.get_all_processes()
+        return self._scan_processes(self.legacy_get_all_processes(),
+                                    self.app_aliases.get(app_name, [app_name]))
+    
+    def _scan_processes(self, processes: List[Dict], possible_names: List[str]) -> List[Dict]:
+        """Substring and fuzzy matching of every process against every name"""
         matches = []
         
-        # Get possible process names for this app
-        possible_names = self.app_aliases.get(app_name, [app_name])
-        
         for process in processes:
             command_lower = process['command'].lower()
             process_name = process['name'].lower()
@@ -149,14 +275,7 @@ class ProcessDetector:
     def _fuzzy_match(self, target: str, text: str) -> bool:
         """Fuzzy matching for process names"""
         # Remove common suffixes/prefixes
-        suffixes = ['-bin', '-desktop', '.exe', '-browser', '-app']
-        prefixes = ['com.', 'org.', 'md.', '@']
-        
-        clean_text = text
-        for suffix in suffixes:
-            clean_text = clean_text.replace(suffix, '')
-        for prefix in prefixes:
-            clean_text = clean_text.replace(prefix, '')
+        clean_text = _clean_name(text)
         
         # Check if target is contained in cleaned text
         if target in clean_text:
@@ -176,6 +295,7 @@ class ProcessDetector:
     
     def kill_process_smart(self, app_name: str) -> Dict:
         """Smart process killing with detailed feedback"""
+        self._refresh(force=True)  # Never act on a cached pid list
         matches = self.find_process_by_name(app_name)
         
         if not matches:
@@ -252,7 +372,8 @@ class ProcessDetector:
     
     def _search_alternative_patterns(self, app_name: str) -> List[Dict]:
         """Search for processes using alternative patterns"""
-        processes = self.get_all_processes()
+        self._refresh()
+        processes = self._processes
         matches = []
         
         for process in processes:
@@ -267,3 +388,49 @@ class ProcessDetector:
     def list_processes_for_app(self, app_name: str) -> List[Dict]:
         """List all processes related to an app"""
         return self.find_process_by_name(app_name)
+
+
+def benchmark(rounds: int = 20, names: List[str] = None) -> Dict:
+    """Milliseconds per process listing and per lookup: /proc + cached scan vs `ps aux` + scans
+
+    'differences' lists, per name, the pids that the lookup and the legacy `ps aux` lookup
+    disagree on (among processes present in both listings).
+    """
+    detector = ProcessDetector()
+    names = names or ['firefox', 'vscode', 'discord', 'spotify', 'python', 'bash']
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        detector._refresh(force=True)
+    refresh_ms = (time.perf_counter() - start) / rounds * 1000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        detector.legacy_get_all_processes()
+    ps_ms = (time.perf_counter() - start) / rounds * 1000
+    
+    # Lookups against an already read listing (memo cleared, so each one scans), then the
+    # legacy path that lists and scans each time
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            detector._scans = {}
+            detector.find_process_by_name(name)
+    lookup_ms = (time.perf_counter() - start) / (rounds * len(names)) * 1000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            detector.legacy_find_process_by_name(name)
+    legacy_lookup_ms = (time.perf_counter() - start) / (rounds * len(names)) * 1000
+    
+    detector._refresh(force=True)
+    legacy_processes = detector.legacy_get_all_processes()
+    common = {p['pid'] for p in detector._processes} & {p['pid'] for p in legacy_processes}
+    differences = {}
+    for name in names:
+        found = {p['pid'] for p in detector.find_process_by_name(name)} & common
+        legacy = {p['pid'] for p in detector._scan_processes(legacy_processes,
+                                                             detector.app_aliases.get(name, [name]))} & common
+        if found != legacy:
+            differences[name] = {'missing': sorted(legacy - found, key=int), 'extra': sorted(found - legacy, key=int)}
+    return {'processes': len(detector._processes), 'refresh_ms': refresh_ms, 'ps_ms': ps_ms,
+            'lookup_ms': lookup_ms, 'legacy_lookup_ms': legacy_lookup_ms, 'differences': differences}
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+WavesAI Prompt Builder Module
+Assembles prompts section by section inside the model's token budget
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class PromptSection:
+    """One piece of the prompt
+
+    Sections are concatenated in the order given, but the token budget is handed out by
+    priority (lower number first). Required sections are always kept whole; trimmable ones
+    get what is left. A template may wrap the section text: it must contain "{data}", and
+    only the data part is trimmed (the template itself counts as required).
+    """
+
+    def __init__(self, name: str, text: str, priority: int = 0, trimmable: bool = False,
+                 static: bool = False, template: str = None, max_tokens: int = None):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.trimmable = trimmable
+        self.static = static
+        self.template = template
+        self.max_tokens = max_tokens
+
+    def render(self, text: str = None) -> str:
+        text = self.text if text is None else text
+        if self.template is None:
+            return text
+        if not text:
+            return ""
+        return self.template.replace("{data}", text, 1)
+
+
+class PromptBuilder:
+    """Token-accounted prompt assembly with per-section budgets"""
+
+    TRIM_NOTE = "\n(…trimmed to fit the context window)"
+
+    def __init__(self, llm, n_ctx: int, max_tokens: int, min_reply_tokens: int = 512):
+        self.llm = llm
+        self.n_ctx = n_ctx
+        self.max_tokens = max_tokens
+        self.min_reply_tokens = min_reply_tokens
+        self.static_counts: Dict[str, int] = {}
+        self.last_report: Dict = {}
+
+    def count(self, text: str, static: bool = False) -> int:
+        """Token count with the loaded model's tokenizer; static sections are counted once"""
+        if not text:
+            return 0
+        if static and text in self.static_counts:
+            return self.static_counts[text]
+        try:
+            n = len(self.llm.tokenize(text.encode('utf-8'), add_bos=False, special=True))
+        except Exception:
+            n = len(text) // 4 + 1  # Rough estimate if the tokenizer is unavailable
+        if static:
+            if len(self.static_counts) > 64:
+                self.static_counts.clear()
+            self.static_counts[text] = n
+        return n
+
+    def reply_reserve(self) -> int:
+        """Tokens kept free for the answer (at most half of the window)"""
+        return max(min(self.max_tokens, self.n_ctx // 2), min(self.min_reply_tokens, self.n_ctx // 2))
+
+    def build(self, sections: List[PromptSection],
+              compress: Optional[Callable[[str, int], str]] = None) -> Tuple[str, Dict]:
+        """Fit sections into n_ctx minus the reply reserve; returns (prompt, report)
+
+        compress(text, budget) may shorten trimmable text smarter than cutting its tail;
+        the result is still hard-trimmed if it does not fit.
+        """
+        budget = self.n_ctx - self.reply_reserve()
+        used = 0
+        allotted: Dict[str, str] = {}
+        report = {'sections': {}, 'budget': budget}
+
+        # Required sections first, then trimmable ones by priority
+        ordered = sorted(sections, key=lambda s: (s.trimmable, s.priority))
+        for section in ordered:
+            if not section.trimmable:
+                cost = self.count(section.render(), static=section.static)
+                allotted[section.name] = section.text
+                report['sections'][section.name] = {'tokens': cost}
+                used += cost
+                continue
+
+            wrapper = self.count(section.template.replace("{data}", ""), static=True) if section.template else 0
+            available = budget - used - wrapper
+            if section.max_tokens is not None:
+                available = min(available, section.max_tokens)
+            full = self.count(section.text)
+            text = section.text
+            if full > available:
+                if available <= 0:
+                    text = ""
+                else:
+                    if compress:
+                        try:
+                            text = compress(text, available)
+                        except Exception:
+                            text = section.text
+                    text = self.trim(text, available)
+            cost = self.count(section.render(text)) if text else 0
+            allotted[section.name] = text
+            report['sections'][section.name] = {'tokens': cost, 'requested': full + wrapper,
+                                                'trimmed': text != section.text}
+            used += cost
+
+        prompt = "".join(section.render(allotted[section.name]) for section in sections)
+        report['sections'] = {section.name: report['sections'][section.name] for section in sections}
+        prompt_tokens = used + 1  # BOS is added by the model
+        report['prompt_tokens'] = prompt_tokens
+        report['reply_tokens'] = max(0, min(self.max_tokens, self.n_ctx - prompt_tokens))
+        self.last_report = report
+        return prompt, report
+
+    def trim(self, text: str, budget: int) -> str:
+        """Cut text to at most budget tokens, preferring paragraph, then line, then word breaks"""
+        if self.count(text) <= budget:
+            return text
+        budget -= self.count(self.TRIM_NOTE)
+        if budget <= 0:
+            return ""
+        for separator in ("\n\n", "\n", " "):
+            kept = self._take(text.split(separator), separator, budget)
+            if kept:
+                return kept + self.TRIM_NOTE
+        return ""
+
+    def _take(self, parts: List[str], separator: str, budget: int) -> str:
+        """Longest prefix of parts (joined by separator) that fits the budget"""
+        kept = []
+        used = 0
+        sep_cost = self.count(separator) if separator.strip() else 1
+        for part in parts:
+            cost = self.count(part) + (sep_cost if kept else 0)
+            if used + cost > budget:
+                break
+            kept.append(part)
+            used += cost
+        result = separator.join(kept).rstrip()
+        # Guard against tokenizer merges across the joins
+        while kept and self.count(result) > budget:
+            kept.pop()
+            result = separator.join(kept).rstrip()
+        return result
+
+    def format_report(self, report: Dict = None) -> str:
+        """One-line summary of where the tokens went"""
+        report = report or self.last_report
+        parts = []
+        for name, info in report.get('sections', {}).items():
+            if info.get('trimmed'):
+                parts.append(f"{name} {info['tokens']}/{info['requested']} (trimmed)")
+            else:
+                parts.append(f"{name} {info['tokens']}")
+        return (f"Prompt tokens: {' | '.join(parts)} = {report.get('prompt_tokens', 0)}"
+                f" | reply budget {report.get('reply_tokens', 0)}")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+WavesAI Prompt Cache Module
+Persists the evaluated llama.cpp state of the static system prompt prefix
+"""
+
+import os
+import time
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class PromptCache:
+    """Snapshots the KV state of the static prompt prefix and restores it across runs"""
+
+    def __init__(self, cache_dir: str = None, keep_files: int = 3):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".wavesai/cache/kv"
+        self.keep_files = keep_files
+        self.key = None
+        self.prefix_text = ""
+        self.prefix_tokens: List[int] = []
+        self.state = None
+
+    def make_key(self, model_path: str, prefix_text: str, n_ctx: int) -> str:
+        """Key the snapshot on model file, context size, llama.cpp build and prefix text"""
+        digest = hashlib.sha256()
+        digest.update(os.path.abspath(model_path).encode('utf-8'))
+        try:
+            stat = os.stat(model_path)
+            digest.update(f"{stat.st_size}:{int(stat.st_mtime)}".encode('utf-8'))
+        except OSError:
+            pass
+        try:
+            import llama_cpp
+            digest.update(getattr(llama_cpp, '__version__', '').encode('utf-8'))
+        except ImportError:
+            pass
+        digest.update(str(n_ctx).encode('utf-8'))
+        digest.update(prefix_text.encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def _state_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.state"
+
+    def prepare(self, llm, model_path: str, prefix_text: str, n_ctx: int) -> Dict:
+        """Restore the prefix state from disk, or evaluate it once and persist it"""
+        start = time.time()
+        self.prefix_text = prefix_text
+        self.prefix_tokens = list(llm.tokenize(prefix_text.encode('utf-8'), special=True))
+        self.key = self.make_key(model_path, prefix_text, n_ctx)
+        path = self._state_path(self.key)
+
+        if path.exists():
+            try:
+                with open(path, 'rb') as f:
+                    state = pickle.load(f)
+                if getattr(state, 'n_tokens', None) == len(self.prefix_tokens):
+                    llm.load_state(state)
+                    self.state = state
+                    try:
+                        os.utime(path, None)
+                    except OSError:
+                        pass
+                    return {"status": "restored", "tokens": len(self.prefix_tokens),
+                            "seconds": time.time() - start}
+            except Exception:
+                pass  # Corrupt or incompatible snapshot - rebuild below
+
+        llm.reset()
+        llm.eval(self.prefix_tokens)
+        self.state = llm.save_state()
+        saved = self._write_state(path, self.state)
+        return {"status": "built" if saved else "built (not saved)", "tokens": len(self.prefix_tokens),
+                "seconds": time.time() - start}
+
+    def _write_state(self, path: Path, state) -> bool:
+        """Atomically write a state snapshot and prune old ones"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._prune()
+            return True
+        except Exception:
+            return False
+
+    def _prune(self):
+        """Keep only the most recently used snapshots (each can be hundreds of MB)"""
+        try:
+            snapshots = sorted(self.cache_dir.glob("*.state"), key=lambda p: p.stat().st_mtime, reverse=True)
+            for old in snapshots[self.keep_files:]:
+                old.unlink()
+        except OSError:
+            pass
+
+    def has_prefix(self, llm) -> bool:
+        """Check whether the model's current KV cache still starts with the static prefix"""
+        n = len(self.prefix_tokens)
+        if not n:
+            return False
+        try:
+            current = llm._input_ids
+            return len(current) >= n and list(current[:n]) == self.prefix_tokens
+        except Exception:
+            return False
+
+    def ensure_loaded(self, llm) -> bool:
+        """Reload the prefix snapshot if another prompt evicted it; returns True if reloaded"""
+        if self.state is None or self.has_prefix(llm):
+            return False
+        try:
+            llm.load_state(self.state)
+            return True
+        except Exception:
+            return False
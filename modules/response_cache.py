@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+WavesAI Response Cache Module
+Reuses recent answers for repeated and near-duplicate questions
+"""
+
+import re
+import math
+import time
+import zlib
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+# Answers that depend on this machine, the clock or a live market are never worth replaying
+_VOLATILE = re.compile(
+    r"\b(cpu|gpu|vram|ram|memory usage|swap|disk|storage|battery|temp|temperature|hot|fan|uptime|"
+    r"process(es)?|my (computer|pc|laptop|machine|system)|this (computer|pc|laptop|machine|system)|"
+    r"time|date|day is it|today|tonight|tomorrow|yesterday|now|currently|right now|this (week|month|year)|"
+    r"price|prices|cost|costs|worth|stock|stocks|share price|market cap|exchange rate|"
+    r"bitcoin|btc|ethereum|eth|crypto|score|scores|live)\b")
+
+
+def is_volatile(text: str) -> bool:
+    """True for questions about local machine state, the current time/date or live prices"""
+    return bool(_VOLATILE.search(text.lower()))
+
+
+# Words that change what is being asked; present tense (is/are) is the unmarked default
+_MARKERS = {'was': 'past', 'were': 'past', 'did': 'past', 'will': 'future',
+            'not': 'not', 'no': 'not', 'never': 'not'}
+
+
+def _markers(key: str) -> set:
+    return {_MARKERS[w] for w in key.split() if w in _MARKERS}
+
+
+class ResponseCache:
+    """SQLite-backed answer cache keyed on a normalized query plus a hashed n-gram embedding
+
+    Exact normalized matches are looked up by index; otherwise the fresh entries of the same
+    intent are scored by cosine similarity and the best one is used if it clears the threshold.
+    Past/future tense and negation stay in the key, and a near match that differs in them is
+    never reused ("who was ..." is not "who is ...").
+    Each intent has its own TTL (news goes stale in minutes, encyclopedic answers last days).
+    """
+
+    DIM = 512
+    KEY_VERSION = 2  # Bump when normalize() changes
+    DEFAULT_TTLS = {'news': 900, 'weather': 1800, 'location': 3600, 'info': 7 * 86400}
+
+    _contractions = {
+        "what's": "what is", "who's": "who is", "where's": "where is", "how's": "how is",
+        "it's": "it is", "that's": "that is", "whats": "what is", "whos": "who is",
+        "isn't": "is not", "aren't": "are not", "wasn't": "was not", "weren't": "were not",
+        "don't": "do not", "doesn't": "does not", "didn't": "did not", "won't": "will not"
+    }
+    _filler = {
+        'please', 'sir', 'hey', 'hi', 'wavesai', 'jarvis', 'can', 'could', 'would', 'you', 'me',
+        'tell', 'give', 'show', 'i', 'want', 'to', 'know', 'the', 'a', 'an', 'about', 'us',
+        'is', 'are', 'what', 'whats', 'of', 'for', 'on', 'in', 'at', 'do', 'does', 'some',
+        'quick', 'now', 'today', 'right', 'current', 'currently', 'latest'
+    }
+
+    def __init__(self, db_path: str, similarity: float = 0.88, ttls: Dict[str, int] = None,
+                 max_entries: int = 2000):
+        self.db_path = db_path
+        self.similarity = similarity
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                intent TEXT,
+                query_key TEXT,
+                query TEXT,
+                embedding BLOB,
+                response TEXT,
+                created_at REAL,
+                hits INTEGER DEFAULT 0
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_key ON response_cache (intent, query_key)")
+        # Entries keyed by an older normalize() could match questions they do not answer
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.KEY_VERSION:
+            self.conn.execute("DELETE FROM response_cache")
+            self.conn.execute(f"PRAGMA user_version = {self.KEY_VERSION}")
+        self.conn.commit()
+
+    def normalize(self, query: str) -> str:
+        """Lowercase, expand contractions, strip punctuation and filler words"""
+        text = query.lower().strip()
+        for short, full in self._contractions.items():
+            text = re.sub(rf"\b{re.escape(short)}\b", full, text)
+        words = re.findall(r"[a-z0-9]+", text)
+        content = [w for w in words if w not in self._filler]
+        return " ".join(content or words)
+
+    def embed(self, normalized: str) -> array:
+        """Hashed bag of words and character trigrams, L2-normalized"""
+        vec = [0.0] * self.DIM
+        for word in normalized.split():
+            vec[zlib.crc32(word.encode('utf-8')) % self.DIM] += 2.0
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                vec[zlib.crc32(padded[i:i + 3].encode('utf-8')) % self.DIM] += 1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return array('f', (v / norm for v in vec))
+
+    def get(self, query: str, intent: str) -> Optional[Dict]:
+        """Return {'response', 'similarity', 'age'} for a fresh close-enough answer, else None"""
+        ttl = self.ttls.get(intent)
+        if not ttl:
+            return None
+        key = self.normalize(query)
+        now = time.time()
+        with self.lock:
+            try:
+                row = self.conn.execute(
+                    "SELECT id, response, created_at FROM response_cache "
+                    "WHERE intent = ? AND query_key = ? AND created_at > ? ORDER BY created_at DESC LIMIT 1",
+                    (intent, key, now - ttl)).fetchone()
+                similarity = 1.0
+                if row is None:
+                    row, similarity = self._nearest(key, intent, now - ttl)
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.conn.execute("UPDATE response_cache SET hits = hits + 1 WHERE id = ?", (row[0],))
+                self.conn.commit()
+            except sqlite3.Error:
+                self.misses += 1
+                return None
+        self.hits += 1
+        return {'response': row[1], 'similarity': similarity, 'age': now - row[2]}
+
+    def _nearest(self, key: str, intent: str, fresh_after: float):
+        query_vec = self.embed(key)
+        best, best_score = None, 0.0
+        markers = _markers(key)
+        for row_id, row_key, response, created_at, blob in self.conn.execute(
+                "SELECT id, query_key, response, created_at, embedding FROM response_cache "
+                "WHERE intent = ? AND created_at > ?", (intent, fresh_after)):
+            if _markers(row_key) != markers:
+                continue
+            vec = array('f')
+            vec.frombytes(blob)
+            score = sum(a * b for a, b in zip(query_vec, vec))
+            if score > best_score:
+                best, best_score = (row_id, response, created_at), score
+        if best_score >= self.similarity:
+            return best, best_score
+        return None, best_score
+
+    def put(self, query: str, intent: str, response: str):
+        """Store an answer, replacing any older one for the same normalized query"""
+        if intent not in self.ttls or not response.strip():
+            return
+        key = self.normalize(query)
+        with self.lock:
+            try:
+                self.conn.execute("DELETE FROM response_cache WHERE intent = ? AND query_key = ?", (intent, key))
+                self.conn.execute(
+                    "INSERT INTO response_cache (intent, query_key, query, embedding, response, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (intent, key, query, self.embed(key).tobytes(), response, time.time()))
+                self._prune()
+                self.conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def _prune(self):
+        """Drop expired entries and cap the table size"""
+        now = time.time()
+        for intent, ttl in self.ttls.items():
+            self.conn.execute("DELETE FROM response_cache WHERE intent = ? AND created_at < ?", (intent, now - ttl))
+        self.conn.execute(
+            "DELETE FROM response_cache WHERE id NOT IN "
+            "(SELECT id FROM response_cache ORDER BY created_at DESC LIMIT ?)", (self.max_entries,))
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM response_cache")
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        with self.lock:
+            try:
+                entries = self.conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+            except sqlite3.Error:
+                entries = 0
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries,
+                'hit_rate': self.hits / total if total else 0.0}
+
+
+# (cached question, new question, should reuse) near misses the similarity threshold must get right
+FIXTURES: List[Tuple[str, str, bool]] = [
+    ("who is the president of france", "who's the president of france", True),
+    ("who is the president of france", "tell me who the president of france is", True),
+    ("what is the capital of australia", "capital of australia", True),
+    ("who invented the telephone", "who invented the telephone please", True),
+    ("who is the president of france", "who was the president of france", False),
+    ("who is the president of france", "who is not the president of france", False),
+    ("who is the president of france", "who isn't the president of france", False),
+    ("what is the capital of australia", "what is the capital of austria", False),
+    ("who won the world cup", "who will win the world cup", False),
+    ("why did the roman empire fall", "why didn't the roman empire fall", False),
+    ("what is python", "what was python", False),
+]
+
+
+def evaluate_fixtures() -> List[Tuple[str, str, bool, float]]:
+    """(cached, asked, expected, similarity) for every fixture the cache gets wrong"""
+    cache = ResponseCache(':memory:')
+    wrong = []
+    for cached, asked, expected in FIXTURES:
+        cache.clear()
+        cache.put(cached, 'info', "answer")
+        hit = cache.get(asked, 'info')
+        if (hit is not None) != expected:
+            vectors = [cache.embed(cache.normalize(text)) for text in (cached, asked)]
+            wrong.append((cached, asked, expected, sum(a * b for a, b in zip(*vectors))))
+    return wrong
@@ -7,92 +7,195 @@ Handles Wikipedia and DuckDuckGo web searches
 import requests
 import re
 from html import unescape
-from typing import Optional
+from typing import Callable, Dict, Optional
 from bs4 import BeautifulSoup
 from datetime import datetime
 import xml.etree.ElementTree as ET
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 class SearchEngine:
     """Handles all search operations for WavesAI"""
     
-    def __init__(self):
+    def __init__(self, search_deadline: float = 4.0):
         self.user_agent = 'WavesAI/1.0 (https://github.com/wavesai/wavesai)'
         self.browser_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         
         # Caching system (5 minute cache)
         self.cache = {}
         self.cache_duration = 300  # 5 minutes in seconds
+        
+        # Concurrent retrieval (all sources in flight at once, bounded by one deadline)
+        self.search_deadline = search_deadline
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="wavesai-search")
+        self.last_retrieval = {}
     
     def search_wikipedia(self, query: str) -> str:
         """Search Wikipedia for comprehensive information"""
         try:
-            # Wikipedia API search
-            search_url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + query.replace(' ', '_')
-            
-            headers = {'User-Agent': self.user_agent}
-            response = requests.get(search_url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                result_parts = []
-                
-                # Get title
-                if data.get('title'):
-                    result_parts.append(f"**{data['title']}**")
-                
-                # Get extract (summary)
-                if data.get('extract'):
-                    extract = data['extract']
-                    result_parts.append(f"**Summary:**\n{extract}")
-                
-                # Get description
-                if data.get('description'):
-                    result_parts.append(f"**Description:** {data['description']}")
-                
-                # Get coordinates for places
-                if data.get('coordinates'):
-                    coords = data['coordinates']
-                    result_parts.append(f"**Location:** {coords.get('lat', 'N/A')}°N, {coords.get('lon', 'N/A')}°E")
-                
-                if result_parts:
-                    return "\n\n".join(result_parts)
+            summary = self._wikipedia_summary(query)
+            if summary:
+                return summary
             
             # If direct search fails, try search API
-            search_api_url = "https://en.wikipedia.org/w/api.php"
-            search_params = {
-                'action': 'query',
-                'format': 'json',
-                'list': 'search',
-                'srsearch': query,
-                'srlimit': 3
-            }
-            
-            search_response = requests.get(search_api_url, params=search_params, headers=headers, timeout=10)
-            
-            if search_response.status_code == 200:
-                search_data = search_response.json()
-                if search_data.get('query', {}).get('search'):
-                    results = []
-                    for result in search_data['query']['search'][:3]:
-                        title = result.get('title', '')
-                        snippet = result.get('snippet', '')
-                        # Clean HTML tags from snippet
-                        snippet = re.sub(r'<[^>]+>', '', snippet)
-                        snippet = unescape(snippet)
-                        
-                        if title and snippet:
-                            results.append(f"**{title}**\n{snippet}")
-                    
-                    if results:
-                        return "**Wikipedia Search Results:**\n\n" + "\n\n".join(results)
+            results = self._wikipedia_search(query)
+            if results:
+                return results
             
             return "No Wikipedia articles found for that query."
             
         except Exception as e:
             return f"Wikipedia search failed: {str(e)}"
     
+    def _wikipedia_summary(self, query: str, timeout: float = 10) -> str:
+        """Fetch the Wikipedia page summary for a query; empty string if there is no such page"""
+        cache_key = self._get_cache_key("wikipedia_summary", query)
+        cached = self._get_cached(cache_key)
+        if cached:
+            return cached
+        
+        search_url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + query.replace(' ', '_')
+        headers = {'User-Agent': self.user_agent}
+        response = requests.get(search_url, headers=headers, timeout=timeout)
+        
+        if response.status_code == 200:
+            data = response.json()
+            result_parts = []
+            
+            # Get title
+            if data.get('title'):
+                result_parts.append(f"**{data['title']}**")
+            
+            # Get extract (summary)
+            if data.get('extract'):
+                extract = data['extract']
+                result_parts.append(f"**Summary:**\n{extract}")
+            
+            # Get description
+            if data.get('description'):
+                result_parts.append(f"**Description:** {data['description']}")
+            
+            # Get coordinates for places
+            if data.get('coordinates'):
+                coords = data['coordinates']
+                result_parts.append(f"**Location:** {coords.get('lat', 'N/A')}°N, {coords.get('lon', 'N/A')}°E")
+            
+            if result_parts:
+                summary = "\n\n".join(result_parts)
+                self._set_cache(cache_key, summary)
+                return summary
+        return ""
+    
+    def _wikipedia_search(self, query: str, timeout: float = 10) -> str:
+        """Search Wikipedia articles matching a query; empty string if nothing matched"""
+        cache_key = self._get_cache_key("wikipedia_search", query)
+        cached = self._get_cached(cache_key)
+        if cached:
+            return cached
+        
+        search_api_url = "https://en.wikipedia.org/w/api.php"
+        search_params = {
+            'action': 'query',
+            'format': 'json',
+            'list': 'search',
+            'srsearch': query,
+            'srlimit': 3
+        }
+        headers = {'User-Agent': self.user_agent}
+        search_response = requests.get(search_api_url, params=search_params, headers=headers, timeout=timeout)
+        
+        if search_response.status_code == 200:
+            search_data = search_response.json()
+            if search_data.get('query', {}).get('search'):
+                results = []
+                for result in search_data['query']['search'][:3]:
+                    title = result.get('title', '')
+                    snippet = result.get('snippet', '')
+                    # Clean HTML tags from snippet
+                    snippet = re.sub(r'<[^>]+>', '', snippet)
+                    snippet = unescape(snippet)
+                    
+                    if title and snippet:
+                        results.append(f"**{title}**\n{snippet}")
+                
+                if results:
+                    formatted = "**Wikipedia Search Results:**\n\n" + "\n\n".join(results)
+                    self._set_cache(cache_key, formatted)
+                    return formatted
+        return ""
+    
+    def retrieve(self, query: str, sources: Dict[str, Callable[[str], str]],
+                 deadline: float = None, should_stop: Callable[[], bool] = None) -> Dict[str, str]:
+        """Run every source concurrently and return whatever arrived before the deadline
+        
+        sources maps a name to a callable taking the query. Sources still running when the
+        deadline passes (or should_stop() turns true) are abandoned and their results dropped.
+        """
+        deadline = self.search_deadline if deadline is None else deadline
+        start = time.time()
+        end = start + deadline
+        futures = {self.executor.submit(fn, query): name for name, fn in sources.items()}
+        pending = set(futures)
+        results = {}
+        timings = {}
+        canceled = False
+        
+        while pending:
+            if should_stop and should_stop():
+                canceled = True
+                break
+            remaining = end - time.time()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=min(0.1, remaining), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                timings[name] = time.time() - start
+                try:
+                    text = future.result()
+                except Exception:
+                    continue
+                if text:
+                    results[name] = text
+        
+        for future in pending:
+            future.cancel()
+        
+        self.last_retrieval = {
+            'seconds': time.time() - start,
+            'timings': timings,
+            'missed': [futures[f] for f in pending],
+            'canceled': canceled
+        }
+        return results
+    
+    def search_info(self, query: str, deadline: float = None, should_stop: Callable[[], bool] = None,
+                    web_search: Callable[[str], str] = None) -> Dict[str, str]:
+        """Fan out Wikipedia (summary and article search) and web search for an information query
+        
+        Returns {'wikipedia': ..., 'web': ...} with only the sources that answered in time.
+        """
+        deadline = self.search_deadline if deadline is None else deadline
+        end = time.time() + deadline
+        # Each request may only use what is left of the deadline when its worker starts
+        remaining = lambda: max(0.5, end - time.time())
+        sources = {
+            'wikipedia_summary': lambda q: self._wikipedia_summary(q, timeout=remaining()),
+            'wikipedia_search': lambda q: self._wikipedia_search(q, timeout=remaining()),
+            'web': web_search or (lambda q: self.search_web(q, timeout=remaining())),
+        }
+        results = self.retrieve(query, sources, deadline, should_stop)
+        
+        combined = {}
+        # The page summary is the better answer; article search is only a fallback
+        wiki = results.get('wikipedia_summary') or results.get('wikipedia_search')
+        if wiki:
+            combined['wikipedia'] = wiki
+        if results.get('web'):
+            combined['web'] = results['web']
+        return combined
+    
     def search_news(self, query: str = "latest news", region: str = "world") -> str:
         """Simple news search using web search"""
         try:
@@ -109,12 +212,12 @@ class SearchEngine:
             return f"Unable to fetch news at the moment. Please try again later."
     
     
-    def search_web(self, query: str) -> str:
+    def search_web(self, query: str, timeout: float = 10) -> str:
         """Enhanced web search using DuckDuckGo's full potential"""
         try:
             # Try DuckDuckGo Instant Answer API first
             api_url = f"https://api.duckduckgo.com/?q={query}&format=json&no_html=1&skip_disambig=1&t=wavesai"
-            api_response = requests.get(api_url, timeout=10)
+            api_response = requests.get(api_url, timeout=timeout)
             api_data = api_response.json()
             
             result_parts = []
@@ -142,6 +245,26 @@ class SearchEngine:
                 if related_info:
                     result_parts.append("**Related Information:**\n" + '\n'.join(related_info))
             
+            # Get definitions from definitions array
+            if api_data.get('Definitions'):
+                definitions = []
+                for def_item in api_data['Definitions'][:3]:
+                    if isinstance(def_item, dict) and 'Definition' in def_item:
+                        definitions.append(f"• {def_item['Definition']}")
+                if definitions:
+                    result_parts.append("**Definitions:**\n" + '\n'.join(definitions))
+            
+            # Get infobox data for biographical information
+            if api_data.get('Infobox'):
+                infobox = api_data['Infobox']
+                if isinstance(infobox, dict):
+                    infobox_info = []
+                    for key, value in infobox.items():
+                        if isinstance(value, str) and len(value) > 5:
+                            infobox_info.append(f"• **{key.replace('_', ' ').title()}:** {value}")
+                    if infobox_info:
+                        result_parts.append("**Key Details:**\n" + '\n'.join(infobox_info[:8]))  # Limit to 8 items
+            
             # If we have good results from API, return them
             if result_parts:
                 return "\n\n".join(result_parts)
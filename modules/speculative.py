@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+WavesAI Speculative Decoding Module
+Draft-model and prompt-lookup speculative decoding for llama.cpp, plus a benchmark
+"""
+
+import time
+import json
+import statistics
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from llama_cpp.llama_speculative import LlamaDraftModel, LlamaPromptLookupDecoding
+except ImportError:
+    LlamaDraftModel = object
+    LlamaPromptLookupDecoding = None
+
+
+MODES = ('off', 'prompt_lookup', 'draft')
+
+
+class GGUFDraftModel(LlamaDraftModel):
+    """A small GGUF model that greedily proposes the next few tokens for the main model
+
+    Must share the main model's tokenizer (e.g. Llama-3.2-1B drafting for Llama-3.2-3B).
+    Its own KV cache is reused across calls through llama.cpp's prefix matching, so each
+    call only evaluates the tokens accepted since the previous one.
+    """
+
+    def __init__(self, model_path: str, num_pred_tokens: int = 4, n_ctx: int = 4096,
+                 n_gpu_layers: int = 99, n_threads: int = None):
+        from llama_cpp import Llama
+        self.num_pred_tokens = num_pred_tokens
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_gpu_layers=n_gpu_layers,
+                         n_threads=n_threads, verbose=False)
+
+    def __call__(self, input_ids, /, **kwargs):
+        drafted = []
+        ids = input_ids.tolist()
+        if len(ids) >= self.llm.n_ctx() - self.num_pred_tokens:
+            return np.array([], dtype=np.intc)
+        for token in self.llm.generate(ids, top_k=1, temp=0.0, reset=True):
+            drafted.append(token)
+            if len(drafted) >= self.num_pred_tokens:
+                break
+        return np.array(drafted, dtype=np.intc)
+
+
+class CountingDraft(LlamaDraftModel):
+    """Wraps a draft model and counts proposals, to estimate how many drafted tokens are accepted
+
+    llama.cpp verifies each proposal in one batch and always emits at least one token of its
+    own per step, so accepted ≈ generated - steps.
+    """
+
+    def __init__(self, draft):
+        self.draft = draft
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.drafted = 0
+
+    def __call__(self, input_ids, /, **kwargs):
+        proposal = self.draft(input_ids, **kwargs)
+        self.steps += 1
+        self.drafted += len(proposal)
+        return proposal
+
+    def acceptance(self, generated: int) -> Optional[float]:
+        if not self.drafted:
+            return None
+        accepted = max(0, generated - self.steps)
+        return min(1.0, accepted / self.drafted)
+
+
+def create_draft(mode: str, draft_model_path: str = None, num_pred_tokens: int = None,
+                 n_ctx: int = 4096, n_gpu_layers: int = 99, n_threads: int = None):
+    """Build the draft model for a mode ('off' returns None)"""
+    if mode == 'prompt_lookup':
+        if LlamaPromptLookupDecoding is None:
+            raise ImportError("llama-cpp-python with speculative decoding support is required")
+        return LlamaPromptLookupDecoding(max_ngram_size=3, num_pred_tokens=num_pred_tokens or 10)
+    if mode == 'draft':
+        if not draft_model_path:
+            raise ValueError("speculative mode 'draft' needs model.speculative.draft_model")
+        return GGUFDraftModel(draft_model_path, num_pred_tokens or 4, n_ctx, n_gpu_layers, n_threads)
+    return None
+
+
+# Recorded retrieval-heavy turns: the answer mostly restates spans of the injected context
+_SYSTEM = ("<|start_header_id|>system<|end_header_id|>\n\nYou are WavesAI, a JARVIS-like assistant. "
+           "Answer using the fetched data below, conversationally and accurately.<|eot_id|>")
+
+RECORDED_PROMPTS = [
+    ('news', "Latest India news headlines:\n"
+             "1. ISRO successfully launches the PSLV-C58 mission carrying the XPoSat X-ray polarimetry satellite.\n"
+             "2. The Reserve Bank of India keeps the repo rate unchanged at 6.5 percent for the fifth time in a row.\n"
+             "3. Heavy rainfall alert issued for coastal Karnataka and Kerala as the monsoon strengthens.\n"
+             "4. India beat Australia by six wickets in the second one-day international in Indore.\n",
+     "What's the latest news in India?"),
+    ('news', "World headlines:\n"
+             "1. European Union leaders agree on a new package of sanctions after a two-day summit in Brussels.\n"
+             "2. Japan's central bank ends its negative interest rate policy for the first time in seventeen years.\n"
+             "3. A magnitude 6.1 earthquake strikes off the coast of Chile; no tsunami warning was issued.\n"
+             "4. NASA delays the Artemis crewed lunar mission to allow more time for heat shield testing.\n",
+     "Give me the world news."),
+    ('wiki', "Wikipedia - Linux kernel: The Linux kernel is a free and open-source, monolithic, modular, "
+             "multitasking, Unix-like operating system kernel. It was originally written in 1991 by Linus "
+             "Torvalds for his i386-based PC, and it was soon adopted as the kernel for the GNU operating "
+             "system. Linux is provided under the GNU General Public License version 2 only. Most of the "
+             "kernel code is written in C with GNU extensions, with some assembly and, since 2022, Rust.",
+     "What is the Linux kernel?"),
+    ('wiki', "Wikipedia - Alan Turing: Alan Mathison Turing was an English mathematician, computer scientist, "
+             "logician, cryptanalyst, philosopher and theoretical biologist. He was highly influential in the "
+             "development of theoretical computer science, providing a formalisation of the concepts of "
+             "algorithm and computation with the Turing machine. During the Second World War he worked at "
+             "Bletchley Park, where he devised techniques for speeding the breaking of German ciphers.",
+     "Who was Alan Turing?"),
+]
+
+
+def recorded_prompts(path: str = None) -> List[Dict]:
+    """Fixture prompts, plus any {"kind", "context", "question"} lines from a JSONL file"""
+    rows = [{'kind': k, 'context': c, 'question': q} for k, c, q in RECORDED_PROMPTS]
+    if path:
+        with open(path, 'r') as f:
+            rows.extend(json.loads(line) for line in f if line.strip())
+    return [dict(r, prompt=f"{_SYSTEM}<|start_header_id|>system<|end_header_id|>\n\nFETCHED DATA:\n{r['context']}"
+                           f"<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{r['question']}<|eot_id|>"
+                           f"<|start_header_id|>assistant<|end_header_id|>\n\n")
+            for r in rows]
+
+
+def benchmark(llm, modes: List[str], draft_model_path: str = None, max_tokens: int = 256,
+              prompts_path: str = None, repeats: int = 1, progress=None) -> Dict[str, Dict]:
+    """Greedy-decode the recorded prompts under each mode; tokens/sec and draft acceptance per mode
+
+    Greedy decoding makes every mode produce the same text, so only speed differs.
+    """
+    prompts = recorded_prompts(prompts_path)
+    results = {}
+    original = llm.draft_model
+    try:
+        for mode in modes:
+            draft = create_draft(mode, draft_model_path, n_ctx=llm.n_ctx())
+            counter = CountingDraft(draft) if draft is not None else None
+            llm.draft_model = counter
+            rates, acceptance = [], []
+            generated = 0
+            for _ in range(repeats):
+                for row in prompts:
+                    llm.reset()
+                    if counter:
+                        counter.reset()
+                    start = time.perf_counter()
+                    first = None
+                    n = 0
+                    for _chunk in llm(row['prompt'], max_tokens=max_tokens, temperature=0.0, top_k=1, stream=True):
+                        if first is None:
+                            first = time.perf_counter()
+                        n += 1
+                    end = time.perf_counter()
+                    generated += n
+                    if first is not None and n > 1:
+                        rates.append((n - 1) / (end - first))
+                    if counter and counter.acceptance(n) is not None:
+                        acceptance.append(counter.acceptance(n))
+            results[mode] = {
+                'tokens_per_sec': statistics.median(rates) if rates else 0.0,
+                'acceptance': statistics.mean(acceptance) if acceptance else None,
+                'tokens': generated, 'prompts': len(prompts) * repeats
+            }
+            if progress:
+                progress(mode, results[mode])
+    finally:
+        llm.draft_model = original
+    return results
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+WavesAI Speech Pipeline Module
+Cuts sentences out of the LLM token stream and overlaps synthesis with playback
+"""
+
+import os
+import re
+import time
+import queue
+import threading
+from typing import Callable, List, Optional
+
+
+class SentenceChunker:
+    """Splits a token stream into speakable sentences as soon as they complete"""
+
+    # Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace
+    _boundary = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+    _abbreviations = {'mr', 'mrs', 'ms', 'dr', 'vs', 'etc', 'e.g', 'i.e', 'st', 'no', 'approx'}
+
+    def __init__(self, min_chars: int = 12, max_chars: int = 240):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+        self.in_code_block = False
+
+    def feed(self, token: str) -> List[str]:
+        """Add a token; return any sentences completed by it"""
+        self.buffer += token
+        sentences = []
+        while True:
+            sentence = self._next_sentence()
+            if sentence is None:
+                break
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever is left once the stream has ended"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        if self.in_code_block or not rest:
+            return []
+        return [rest]
+
+    def _next_sentence(self) -> Optional[str]:
+        # Skip fenced code blocks entirely - they are never spoken
+        fence = self.buffer.find("```")
+        if self.in_code_block:
+            if fence == -1:
+                return None
+            self.buffer = self.buffer[fence + 3:]
+            self.in_code_block = False
+            return ""
+
+        search_from = 0
+        while True:
+            match = self._boundary.search(self.buffer, search_from)
+            if fence != -1 and (match is None or fence < match.start()):
+                before = self.buffer[:fence].strip()
+                self.buffer = self.buffer[fence + 3:]
+                self.in_code_block = True
+                return before
+            if match is None:
+                break
+            candidate = self.buffer[:match.end()].strip()
+            is_newline = '\n' in match.group()
+            last_word = candidate.rstrip('.!?"\')] ').split()[-1].lower() if candidate.split() else ''
+            if not is_newline and (len(candidate) < self.min_chars or last_word in self._abbreviations):
+                search_from = match.end()
+                continue
+            self.buffer = self.buffer[match.end():]
+            return candidate
+
+        # No boundary yet - cut overly long runs at the last comma or space
+        if len(self.buffer) > self.max_chars:
+            cut = max(self.buffer.rfind(', ', 0, self.max_chars), self.buffer.rfind(' ', 0, self.max_chars))
+            if cut > 0:
+                candidate = self.buffer[:cut + 1].strip()
+                self.buffer = self.buffer[cut + 1:]
+                return candidate
+        return None
+
+
+class SpeechPipeline:
+    """Text -> synthesis worker -> playback worker, with one flush that clears every stage
+
+    synthesize(text) returns a path to an audio file (or None); play(path) plays it and returns
+    False if playback was interrupted. should_stop() is polled between stages so an interrupt
+    drops queued sentences and pending audio at once.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Optional[str]], play: Callable[[str], bool],
+                 should_stop: Callable[[], bool], on_start: Callable[[], None] = None,
+                 on_finish: Callable[[], None] = None, max_pending_audio: int = 2):
+        self.synthesize = synthesize
+        self.play = play
+        self.should_stop = should_stop
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.text_queue = queue.Queue()
+        self.audio_queue = queue.Queue(maxsize=max_pending_audio)
+        self.flushed = threading.Event()
+        self.done = threading.Event()
+        self.started_playback = False
+        self.first_audio_time = None
+        self._synth_thread = None
+        self._play_thread = None
+
+    def start(self):
+        self._synth_thread = threading.Thread(target=self._synth_worker, name="wavesai-tts-synth", daemon=True)
+        self._play_thread = threading.Thread(target=self._play_worker, name="wavesai-tts-play", daemon=True)
+        self._synth_thread.start()
+        self._play_thread.start()
+        return self
+
+    def speak(self, text: str):
+        """Queue a sentence for synthesis"""
+        if text and not self.flushed.is_set():
+            self.text_queue.put(text)
+
+    def close(self):
+        """Signal that no more sentences will be queued"""
+        self.text_queue.put(None)
+
+    def flush(self):
+        """Drop all queued text and audio; the current clip stops via should_stop()"""
+        self.flushed.set()
+        self._drain(self.text_queue)
+        self._drain(self.audio_queue)
+        self.text_queue.put(None)
+
+    def wait(self, poll: float = 0.05) -> bool:
+        """Block until playback finishes; flushes on interrupt. Returns False if interrupted."""
+        while not self.done.wait(poll):
+            if not self.flushed.is_set() and self.should_stop():
+                self.flush()
+        return not self.flushed.is_set()
+
+    def _drain(self, q: queue.Queue):
+        while True:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, str) and q is self.audio_queue:
+                self._remove(item)
+
+    def _remove(self, path: str):
+        try:
+            os.unlink(path)
+        except Exception:
+            pass
+
+    def _synth_worker(self):
+        try:
+            while True:
+                text = self.text_queue.get()
+                if text is None or self.flushed.is_set():
+                    break
+                path = self.synthesize(text)
+                if not path:
+                    continue
+                if self.flushed.is_set():
+                    self._remove(path)
+                    break
+                # Bounded queue keeps synthesis at most a couple of sentences ahead of playback
+                while not self.flushed.is_set():
+                    try:
+                        self.audio_queue.put(path, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                else:
+                    self._remove(path)
+                    break
+        finally:
+            self.audio_queue.put(None)
+
+    def _play_worker(self):
+        try:
+            while True:
+                try:
+                    path = self.audio_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self.flushed.is_set() and not self._synth_thread.is_alive():
+                        break
+                    continue
+                if path is None:
+                    break
+                if self.flushed.is_set() or self.should_stop():
+                    self._remove(path)
+                    self.flushed.set()
+                    continue
+                if not self.started_playback:
+                    self.started_playback = True
+                    self.first_audio_time = time.time()
+                    if self.on_start:
+                        self.on_start()
+                try:
+                    completed = self.play(path)
+                finally:
+                    self._remove(path)
+                if not completed:
+                    self.flush()
+        finally:
+            if self.started_playback and self.on_finish:
+                try:
+                    self.on_finish()
+                except Exception:
+                    pass
+            self.done.set()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+WavesAI Startup Module
+Background model loading and a startup timeline for --profile-startup
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+import psutil
+
+
+class StartupProfiler:
+    """Records named spans relative to process start and prints them as a timeline"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        try:
+            self.origin = psutil.Process().create_time()
+        except Exception:
+            self.origin = time.time()
+        self.spans: List[dict] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str):
+        record = {'name': name, 'start': time.time(), 'end': None,
+                  'thread': threading.current_thread().name}
+        with self.lock:
+            self.spans.append(record)
+        try:
+            yield record
+        finally:
+            record['end'] = time.time()
+
+    def mark(self, name: str):
+        """Zero-length event (e.g. 'prompt ready')"""
+        now = time.time()
+        with self.lock:
+            self.spans.append({'name': name, 'start': now, 'end': now,
+                               'thread': threading.current_thread().name})
+
+    def print_timeline(self, title: str = "Startup timeline"):
+        if not self.enabled:
+            return
+        now = time.time()
+        print(f"\n\033[1;36m[{title}]\033[0m (seconds since process start)")
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: s['start'])
+        for span in spans:
+            start = span['start'] - self.origin
+            if span['end'] is None:
+                timing = f"{start:6.2f} → …      (running {now - span['start']:.2f}s)"
+            elif span['end'] == span['start']:
+                timing = f"{start:6.2f}"
+            else:
+                timing = f"{start:6.2f} → {span['end'] - self.origin:6.2f}  ({span['end'] - span['start']:.2f}s)"
+            thread = "" if span['thread'] == 'MainThread' else f"  [{span['thread']}]"
+            print(f"  {timing:<36} {span['name']}{thread}")
+
+
+class BackgroundLoader:
+    """Runs a loader function on a daemon thread; wait() blocks only the caller that needs it"""
+
+    def __init__(self, load: Callable[[], bool], name: str = "wavesai-model-load"):
+        self.load = load
+        self.name = name
+        self.ready = threading.Event()
+        self.result: Optional[bool] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = bool(self.load())
+        except Exception:
+            self.result = False
+        finally:
+            self.ready.set()
+
+    @property
+    def started(self) -> bool:
+        return self.thread is not None
+
+    def done(self) -> bool:
+        return self.ready.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until loading finished; returns whether it succeeded"""
+        self.ready.wait(timeout)
+        return bool(self.result)
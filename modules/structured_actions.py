@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+WavesAI Structured Actions Module
+Grammar-constrained JSON actions (command, file write, answer) and a one-pass parser
+"""
+
+import re
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+
+# Exactly one JSON object; once it closes the grammar only allows end-of-stream
+ACTION_GRAMMAR = r'''
+root    ::= "{" ws "\"action\":" ws action ws "}"
+action  ::= command | write | answer
+command ::= "\"command\"," ws "\"command\":" ws string
+write   ::= "\"write_file\"," ws "\"path\":" ws string "," ws "\"content\":" ws string
+answer  ::= "\"answer\"," ws "\"text\":" ws string
+string  ::= "\"" ( [^"\\\x7F\x00-\x1F] | "\\" ( ["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] ) )* "\""
+ws      ::= | " " | "\n"
+'''
+
+ACTION_INSTRUCTIONS = """RESPONSE FORMAT: reply with exactly one JSON object and nothing else:
+- run a shell command: {"action": "command", "command": "ls -lah ~/Downloads"}
+- write a file: {"action": "write_file", "path": "~/notes.txt", "content": "..."}
+- anything else: {"action": "answer", "text": "your reply"}"""
+
+_grammar = None
+
+
+def get_grammar():
+    """Compiled LlamaGrammar for ACTION_GRAMMAR (cached), or None if llama.cpp is unavailable"""
+    global _grammar
+    if _grammar is None:
+        try:
+            from llama_cpp import LlamaGrammar
+            _grammar = LlamaGrammar.from_string(ACTION_GRAMMAR, verbose=False)
+        except Exception:
+            _grammar = False
+    return _grammar or None
+
+
+@dataclass
+class Action:
+    kind: str                    # 'command', 'write_file' or 'answer'
+    text: str = ""
+    command: str = ""
+    path: str = ""
+    content: str = ""
+    structured: bool = False     # Parsed from a JSON action rather than legacy directives
+    suggested_command: str = ""  # ```bash block in a free-form answer (run only after confirmation)
+
+
+class ActionStream:
+    """Tracks a streamed JSON object so generation can stop the moment it closes"""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+        self.closed = False
+
+    def feed(self, token: str) -> bool:
+        """Returns True once the top-level object has closed"""
+        for ch in token:
+            if self.closed:
+                break
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"' and self.started:
+                self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+                self.started = True
+            elif ch == '}' and self.started:
+                self.depth -= 1
+                self.closed = self.depth == 0
+        return self.closed
+
+
+def _json_action(text: str) -> Optional[Action]:
+    start = text.find('{')
+    if start < 0:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text[start:])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    kind = data.get('action')
+    if kind == 'command' and str(data.get('command', '')).strip():
+        return Action('command', command=str(data['command']).strip(), structured=True)
+    if kind == 'write_file' and str(data.get('path', '')).strip():
+        return Action('write_file', path=str(data['path']).strip(), content=str(data.get('content', '')),
+                      structured=True)
+    if kind == 'answer':
+        return Action('answer', text=str(data.get('text', '')).strip(), structured=True)
+    return None
+
+
+def parse_action(response: str) -> Action:
+    """One pass over a model response: JSON action first, then the legacy directive formats"""
+    text = response.strip()
+    if text.startswith('{'):
+        action = _json_action(text)
+        if action:
+            return action
+
+    match = re.search(r'^WRITE_TO_FILE:[ \t]*(.+)$', text, re.MULTILINE)
+    if match:
+        body = re.search(r'^CONTENT_START[^\n]*\n(.*?)(?:^CONTENT_END|\Z)', text[match.end():], re.MULTILINE | re.DOTALL)
+        content = body.group(1).rstrip('\n') if body else ""
+        return Action('write_file', path=match.group(1).strip(), content=content)
+
+    match = re.search(r'EXECUTE_COMMAND:[ \t]*([^\n]+)', text)
+    if match and match.group(1).strip():
+        return Action('command', command=match.group(1).strip())
+
+    fence = re.search(r'```bash\s*\n?(.*?)```', text, re.DOTALL)
+    return Action('answer', text=text, suggested_command=fence.group(1).strip() if fence else "")
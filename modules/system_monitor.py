@@ -5,18 +5,28 @@ Handles system monitoring, stats, and process management
 """
 
 import os
+import time
 import psutil
-import subprocess
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 from .location_weather import LocationWeatherService
+from .gpu_telemetry import GPUTelemetry, format_gpu
+from .metrics_history import MetricsHistory, snapshot_values
+from .alert_engine import AlertEngine, default_rules
+from .process_table import ProcessTable
 
 
 class SystemMonitor:
     """Handles all system monitoring operations"""
     
-    def __init__(self):
+    def __init__(self, monitor_interval: float = 2.0, gpu_backend: str = 'auto', history_path: str = None,
+                 alert_thresholds: Dict = None):
         self.location_weather = LocationWeatherService()
+        self.gpu_telemetry = GPUTelemetry(gpu_backend)  # NVML or one streaming nvidia-smi, started on first read
+        self.metrics_history = MetricsHistory(history_path)  # Fed by the sampler, saved to history_path
+        self.alert_engine = AlertEngine(default_rules(alert_thresholds))  # Evaluated on every sampler snapshot
+        self.process_table = ProcessTable()  # Persistent handles: CPU% is the delta since the last refresh
         # Set user's actual location
         try:
             import sys
@@ -26,90 +36,167 @@ class SystemMonitor:
             setup_user_location(self.location_weather)
         except ImportError:
             pass  # Use IP geolocation if user_location.py doesn't exist
+        
+        # Background sampler state - keeps an always-fresh snapshot for get_system_context()
+        self.monitor_interval = monitor_interval
+        self._boot_time = psutil.boot_time()
+        self._snapshot = None
+        self._snapshot_time = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_ready = threading.Event()
+        self._sampler_stop = threading.Event()
+        self._sampler_thread = None
+    
+    def start_sampler(self, interval: Optional[float] = None):
+        """Start the background thread that refreshes the system snapshot every interval seconds"""
+        if interval:
+            self.monitor_interval = interval
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            return self._sampler_thread
+        self._sampler_stop.clear()
+        self._sampler_thread = threading.Thread(target=self._sampler_loop, name="wavesai-sampler", daemon=True)
+        self._sampler_thread.start()
+        return self._sampler_thread
+    
+    def stop_sampler(self):
+        """Stop the background sampler thread"""
+        self._sampler_stop.set()
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            self._sampler_thread.join(timeout=2)
+        self._sampler_thread = None
+        self.metrics_history.save()
+    
+    def is_sampling(self) -> bool:
+        return self._sampler_thread is not None and self._sampler_thread.is_alive()
+    
+    def _sampler_loop(self):
+        # First sample measures CPU over a short window; later ones use the delta since the previous sample
+        cpu_interval = 0.5
+        while not self._sampler_stop.is_set():
+            try:
+                snapshot = self._collect_snapshot(cpu_interval=cpu_interval)
+            except Exception as e:
+                snapshot = {"error": str(e)}
+            with self._snapshot_lock:
+                self._snapshot = snapshot
+                self._snapshot_time = time.time()
+            self._snapshot_ready.set()
+            if 'metrics' in snapshot:
+                try:
+                    values = snapshot_values(snapshot['metrics'])
+                    self.metrics_history.add(values)
+                    self.alert_engine.evaluate(dict(values, zombies=snapshot['metrics'].get('zombies')))
+                except Exception:
+                    pass
+            cpu_interval = None
+            self._sampler_stop.wait(self.monitor_interval)
+    
+    def get_snapshot_age(self) -> Optional[float]:
+        """Seconds since the latest background snapshot was taken (None if no snapshot yet)"""
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                return None
+            return time.time() - self._snapshot_time
     
     def get_system_context(self) -> Dict:
-        """Gather comprehensive system information for AI context"""
+        """Gather comprehensive system information for AI context
+        
+        Returns the latest background snapshot when the sampler is running (with its age in
+        'snapshot_age'), otherwise samples synchronously.
+        """
+        if self.is_sampling():
+            if not self._snapshot_ready.is_set():
+                self._snapshot_ready.wait(timeout=self.monitor_interval + 2)
+            with self._snapshot_lock:
+                snapshot = self._snapshot
+                taken_at = self._snapshot_time
+            if snapshot is not None:
+                context = dict(snapshot)
+                if 'error' not in context:
+                    now = datetime.now()
+                    context["current_time"] = now.strftime("%Y-%m-%d %H:%M:%S")
+                    context["uptime"] = str(now - datetime.fromtimestamp(self._boot_time)).split('.')[0]
+                context["snapshot_age"] = time.time() - taken_at
+                return context
+        
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = datetime.now() - boot_time
-            
-            # Get GPU info (NVIDIA)
-            gpu_info = "N/A"
-            try:
-                nvidia_smi = subprocess.check_output(
-                    ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,memory.total,temperature.gpu', 
-                     '--format=csv,noheader,nounits'],
-                    encoding='utf-8'
-                ).strip().split(',')
-                gpu_info = f"GPU: {nvidia_smi[0]}% | VRAM: {nvidia_smi[1]}/{nvidia_smi[2]}MB | Temp: {nvidia_smi[3]}°C"
-            except:
-                pass
-            
-            # Get CPU temperature
-            cpu_temp = "N/A"
-            try:
-                temps = psutil.sensors_temperatures()
-                if 'coretemp' in temps:
-                    cpu_temp = f"{temps['coretemp'][0].current}°C"
-            except:
-                pass
-            
-            # Get process count and top processes
-            process_count = len(psutil.pids())
-            top_processes = self.get_top_processes(5)
-            
-            # Get network stats
-            network_stats = self.get_network_stats()
-            
-            # Get system load
-            load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0]
-            
-            # Get location information
-            location_summary = self.location_weather.get_location_summary()
-            
-            return {
-                "username": os.getenv("USER"),
-                "hostname": os.uname().nodename,
-                "cpu_usage": f"{cpu_percent}%",
-                "cpu_temp": cpu_temp,
-                "ram_usage": f"{memory.percent}% ({memory.used // (1024**3)}GB/{memory.total // (1024**3)}GB)",
-                "disk_usage": f"{disk.percent}% ({disk.used // (1024**3)}GB/{disk.total // (1024**3)}GB)",
-                "gpu_info": gpu_info,
-                "uptime": str(uptime).split('.')[0],
-                "current_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "distro": "Arch Linux",
-                "process_count": process_count,
-                "top_processes": top_processes,
-                "network_stats": network_stats,
-                "load_avg": f"{load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}",
-                "location": location_summary
-            }
+            context = self._collect_snapshot(cpu_interval=1)
         except Exception as e:
             return {"error": str(e)}
+        context["snapshot_age"] = 0.0
+        return context
     
-    def get_top_processes(self, count: int = 10) -> List[Dict]:
-        """Get top processes by CPU and memory usage"""
+    def _collect_snapshot(self, cpu_interval: Optional[float] = None) -> Dict:
+        """Sample all system metrics once (blocks for cpu_interval seconds if given)"""
+        per_core = psutil.cpu_percent(interval=cpu_interval, percpu=True)
+        cpu_percent = round(sum(per_core) / len(per_core), 1) if per_core else 0.0
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        disk = psutil.disk_usage('/')
+        uptime = datetime.now() - datetime.fromtimestamp(self._boot_time)
+        
+        # Get GPU info (NVIDIA) - a cached reading, no process is spawned here
+        gpu = self.gpu_telemetry.read()
+        gpu_info = format_gpu(gpu)
+        
+        # Get CPU temperature
+        cpu_temp = "N/A"
+        cpu_temp_c = None
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info', 'status']):
-                try:
-                    processes.append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'cpu_percent': proc.info['cpu_percent'],
-                        'memory_percent': proc.info['memory_percent'],
-                        'memory_mb': proc.info['memory_info'].rss / (1024 * 1024),
-                        'status': proc.info['status']
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort by CPU usage
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:count]
+            temps = psutil.sensors_temperatures()
+            if 'coretemp' in temps:
+                cpu_temp_c = temps['coretemp'][0].current
+                cpu_temp = f"{cpu_temp_c}°C"
+        except:
+            pass
+        
+        # Get process count and top processes
+        process_count = len(psutil.pids())
+        top_processes = self.get_top_processes(5)
+        
+        # Get network stats
+        network_stats = self.get_network_stats()
+        
+        # Get system load
+        load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0]
+        
+        # Get location information
+        location_summary = self.location_weather.get_location_summary()
+        
+        return {
+            "username": os.getenv("USER"),
+            "hostname": os.uname().nodename,
+            "cpu_usage": f"{cpu_percent}%",
+            "cpu_temp": cpu_temp,
+            "ram_usage": f"{memory.percent}% ({memory.used // (1024**3)}GB/{memory.total // (1024**3)}GB)",
+            "disk_usage": f"{disk.percent}% ({disk.used // (1024**3)}GB/{disk.total // (1024**3)}GB)",
+            "gpu_info": gpu_info,
+            "uptime": str(uptime).split('.')[0],
+            "current_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "distro": "Arch Linux",
+            "process_count": process_count,
+            "top_processes": top_processes,
+            "network_stats": network_stats,
+            "load_avg": f"{load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}",
+            "location": location_summary,
+            # Raw values for consumers that need numbers rather than display strings
+            "metrics": {
+                "cpu_percent": cpu_percent,
+                "per_core": per_core,
+                "ram_percent": memory.percent,
+                "swap_percent": swap.percent,
+                "disk_percent": disk.percent,
+                "cpu_temp": cpu_temp_c,
+                "gpu": gpu,
+                "load_avg": tuple(load_avg),
+                "zombies": self.process_table.zombies  # Counted by the table refresh above
+            }
+        }
+    
+    def get_top_processes(self, count: int = 10, sort_by: str = 'cpu') -> List[Dict]:
+        """Get top processes by CPU, memory ('mem') or disk IO ('io') usage"""
+        try:
+            return self.process_table.top(count, sort_by)
         except Exception as e:
             return []
     
@@ -159,44 +246,16 @@ class SystemMonitor:
             return {"error": str(e)}
     
     def get_system_alerts(self) -> List[str]:
-        """Check for system alerts and warnings"""
-        alerts = []
+        """Check for system alerts and warnings
+        
+        Reads the latest snapshot rather than sampling, so this returns at once.
+        """
         try:
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            if cpu_percent > 90:
-                alerts.append(f"⚠️  High CPU usage: {cpu_percent}%")
-            
-            # Check memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
-                alerts.append(f"⚠️  High memory usage: {memory.percent}%")
-            
-            # Check disk usage
-            disk = psutil.disk_usage('/')
-            if disk.percent > 90:
-                alerts.append(f"⚠️  High disk usage: {disk.percent}%")
-            
-            # Check temperature
-            try:
-                temps = psutil.sensors_temperatures()
-                if 'coretemp' in temps:
-                    cpu_temp = temps['coretemp'][0].current
-                    if cpu_temp > 80:
-                        alerts.append(f"🌡️  High CPU temperature: {cpu_temp}°C")
-            except:
-                pass
-            
-            # Check for zombie processes
-            zombie_count = 0
-            for proc in psutil.process_iter(['status']):
-                if proc.info['status'] == psutil.STATUS_ZOMBIE:
-                    zombie_count += 1
-            
-            if zombie_count > 0:
-                alerts.append(f"🧟 Found {zombie_count} zombie processes")
-            
-            return alerts
+            context = self.get_system_context()
+            if 'metrics' not in context:
+                return [f"Error checking alerts: {context.get('error', 'no snapshot')}"]
+            metrics = context['metrics']
+            return self.alert_engine.check(dict(snapshot_values(metrics), zombies=metrics.get('zombies')))
         except Exception as e:
             return [f"Error checking alerts: {str(e)}"]
     
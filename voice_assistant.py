@@ -104,8 +104,7 @@ def main():
             sys.path.insert(0, str(wavesai_dir))
             from wavesai import WavesAI
             ai = WavesAI()
-            if ai.load_llm():
-                ai.interactive_mode()
+            ai.interactive_mode()  # Uses the daemon's model when one is running
             
         else:
             print("\033[1;31m[Error]\033[0m Invalid choice!")
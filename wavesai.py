@@ -24,6 +24,7 @@ import struct
 import queue
 import io
 from collections import deque
+from concurrent.futures import wait
 import re
 
 # Audio and ML dependencies
@@ -68,6 +69,23 @@ except ImportError:
 from modules.search_engine import SearchEngine
 from modules.system_monitor import SystemMonitor
 from modules.command_handler import CommandHandler
+from modules.intent_router import IntentRouter, Route
+from modules.prompt_cache import PromptCache
+from modules.speech_pipeline import SentenceChunker, SpeechPipeline
+from modules.prompt_builder import PromptBuilder, PromptSection
+from modules.context_compressor import ContextCompressor
+from modules.perf_metrics import PerfMetrics, cached_prefix_tokens, summarize, format_summary
+from modules.metrics_history import parse_history_query
+from modules.conversation_memory import ConversationMemory
+from modules.response_cache import ResponseCache, is_volatile
+from modules.startup import BackgroundLoader, StartupProfiler
+from modules.model_server import ModelClient, ModelServer
+from modules.speculative import create_draft
+from modules.model_router import ModelRouter, load_small_model
+from modules.length_policy import EarlyStopper, LengthPolicy
+from modules.presets import measure_speed, resolve_preset
+from modules.structured_actions import ACTION_INSTRUCTIONS, ActionStream, get_grammar, parse_action
+from modules.llm_scheduler import LLMScheduler, PRIORITY_INTERACTIVE, PRIORITY_ERROR, PRIORITY_BACKGROUND, PRIORITY_NAMES
 try:
     from modules.echo_cancellation import WavesAIEchoCancellation
 except Exception:
@@ -87,8 +105,48 @@ def load_config():
                     "context_length": cfg['model']['context_length'],
                     "gpu_layers": cfg['model']['gpu_layers'],
                     "threads": cfg['model']['threads'],
+                    "batch_size": cfg['model'].get('batch_size', 512),
+                    "seed": cfg['model'].get('seed', -1),
+                    "use_mmap": cfg['model'].get('use_mmap', True),
+                    "use_mlock": cfg['model'].get('use_mlock', False),
                     "temperature": cfg['generation']['temperature'],
-                    "max_tokens": cfg['generation']['max_tokens']
+                    "max_tokens": cfg['generation']['max_tokens'],
+                    "top_p": cfg['generation'].get('top_p', 0.95),
+                    "top_k": cfg['generation'].get('top_k', 40),
+                    "repeat_penalty": cfg['generation'].get('repeat_penalty', 1.1),
+                    "stop_sequences": cfg['generation'].get('stop_sequences', ["<|eot_id|>", "<|end_of_text|>", "User:", "[You]"]),
+                    "structured_actions": cfg['generation'].get('structured_actions', 'commands'),
+                    "length_policy": cfg['generation'].get('length_policy', {}).get('enabled', True),
+                    "length_budgets": cfg['generation'].get('length_policy', {}).get('budgets', {}),
+                    "prompt_cache": cfg['model'].get('prompt_cache', True),
+                    "speculative_mode": cfg['model'].get('speculative', {}).get('mode', 'off'),
+                    "speculative_draft_model": os.path.expanduser(cfg['model'].get('speculative', {}).get('draft_model', '')),
+                    "speculative_tokens": cfg['model'].get('speculative', {}).get('num_pred_tokens', 0),
+                    "speculative_scope": cfg['model'].get('speculative', {}).get('scope', 'retrieval'),
+                    "small_model_path": os.path.expanduser(cfg['model'].get('small', {}).get('path', '')),
+                    "small_model_gpu_layers": cfg['model'].get('small', {}).get('gpu_layers', 99),
+                    "small_model_context": cfg['model'].get('small', {}).get('context_length', 2048),
+                    "small_model_tasks": cfg['model'].get('small', {}).get('tasks', ['error_explanation', 'command_summary', 'intent_disambiguation']),
+                    "monitor_interval": cfg.get('performance', {}).get('monitor_interval', 2),
+                    "gpu_telemetry": cfg.get('performance', {}).get('gpu_telemetry', 'auto')
+                    if cfg.get('performance', {}).get('enable_gpu_monitoring', True) else 'off',
+                    "alert_thresholds": {name: cfg.get('performance', {}).get(key) for name, key in (
+                        ('cpu', 'max_cpu_percent'), ('ram', 'max_ram_usage_percent'), ('swap', 'max_swap_percent'),
+                        ('disk', 'max_disk_percent'), ('cpu_temp', 'max_cpu_temp'), ('gpu_temp', 'max_gpu_temp'))},
+                    "alert_cooldown": cfg.get('performance', {}).get('alert_cooldown', 300),
+                    "alert_notifications": cfg.get('performance', {}).get('alert_notifications', True),
+                    "cache_dir": os.path.expanduser(cfg['paths'].get('cache_dir', '~/.wavesai/cache')),
+                    "search_deadline": cfg.get('network', {}).get('search_deadline', 4),
+                    "retrieval_compression": cfg.get('network', {}).get('retrieval_compression', True),
+                    "retrieval_tokens": cfg.get('network', {}).get('retrieval_tokens', 512),
+                    "context_window_messages": cfg.get('memory', {}).get('context_window_messages', 10),
+                    "history_tokens": cfg.get('memory', {}).get('history_tokens', 2048),
+                    "response_cache": cfg.get('response_cache', {}).get('enabled', True),
+                    "response_cache_similarity": cfg.get('response_cache', {}).get('similarity', 0.88),
+                    "response_cache_ttl": cfg.get('response_cache', {}).get('ttl', {}),
+                    "use_daemon": cfg.get('daemon', {}).get('enabled', True),
+                    "daemon_socket": os.path.expanduser(cfg.get('daemon', {}).get('socket', '~/.wavesai/run/wavesai.sock')),
+                    "presets": cfg.get('presets', {})
                 }
         except:
             pass
@@ -101,29 +159,93 @@ def load_config():
         "context_length": 4096,
         "gpu_layers": 35,
         "threads": 8,
+        "batch_size": 512,
+        "seed": -1,
+        "use_mmap": True,
+        "use_mlock": False,
         "temperature": 0.7,
-        "max_tokens": 1024  # Increased from 512 for longer, complete responses
+        "max_tokens": 1024,  # Increased from 512 for longer, complete responses
+        "top_p": 0.95,
+        "top_k": 40,
+        "repeat_penalty": 1.1,
+        "stop_sequences": ["<|eot_id|>", "<|end_of_text|>", "User:", "[You]"],
+        "structured_actions": "commands",
+        "length_policy": True,
+        "length_budgets": {},
+        "prompt_cache": True,
+        "speculative_mode": "off",
+        "speculative_draft_model": "",
+        "speculative_tokens": 0,
+        "speculative_scope": "retrieval",
+        "small_model_path": "",
+        "small_model_gpu_layers": 99,
+        "small_model_context": 2048,
+        "small_model_tasks": ["error_explanation", "command_summary", "intent_disambiguation"],
+        "monitor_interval": 2,
+        "gpu_telemetry": "auto",
+        "alert_thresholds": {},
+        "alert_cooldown": 300,
+        "alert_notifications": True,
+        "cache_dir": str(Path.home() / ".wavesai/cache"),
+        "search_deadline": 4,
+        "retrieval_compression": True,
+        "retrieval_tokens": 512,
+        "context_window_messages": 10,
+        "history_tokens": 2048,
+        "response_cache": True,
+        "response_cache_similarity": 0.88,
+        "response_cache_ttl": {},
+        "use_daemon": True,
+        "daemon_socket": str(Path.home() / ".wavesai/run/wavesai.sock"),
+        "presets": {}
     }
 
 CONFIG = load_config()
 
 class WavesAI:
-    def __init__(self):
+    def __init__(self, startup_profiler: StartupProfiler = None):
+        self.startup_profiler = startup_profiler or StartupProfiler()
+        self.llm_loader = None  # Background model load started by start_llm_loading()
+        self.model_client = None  # Set when a running daemon serves the model instead
         self.setup_directories()
         self.init_database()
+        self.response_cache = ResponseCache(CONFIG["database"], CONFIG["response_cache_similarity"],
+                                            CONFIG["response_cache_ttl"])
         self.llm = None
-        self.conversation_history = []
+        self.speculative_draft = None  # Draft for speculative decoding (see model.speculative)
+        self.model_router = ModelRouter()  # Short tasks go to model.small once it is loaded
+        self.context_compressor = ContextCompressor()  # Keeps the retrieved sentences relevant to the query
+        self.conversation_memory = ConversationMemory(CONFIG["context_window_messages"], CONFIG["history_tokens"])
         self.sudo_password = None  # Store sudo password temporarily
         self.pending_dangerous_command = None  # Store dangerous command awaiting confirmation
         self.confirmation_code = None  # Store current confirmation code
+        self.last_generation_stats = {}  # Timing of the most recent LLM turn
+        self.perf_metrics = PerfMetrics(CONFIG["database"])  # Per-turn timings, summarised by 'perf'
+        self._interrupt_requested_at = None
+        # All generations run through here, most urgent first
+        self.llm_scheduler = LLMScheduler(on_finish=self._record_job)
+        self.length_policy = LengthPolicy(CONFIG["length_budgets"], CONFIG["length_policy"])
+        self.active_preset = 'default'
+        self.alert_interval = CONFIG["alert_cooldown"]  # Minimum seconds before the same alert is repeated
+        self.alerts_muted = False
+        self._pending_alerts = deque()  # Printed before the next prompt rather than over the user's typing
+        self.default_settings = {key: CONFIG[key] for key in ('gpu_layers', 'threads', 'batch_size', 'max_tokens',
+                                                              'monitor_interval')}
+        self.default_settings.update(alert_interval=self.alert_interval, mute_alerts=False, nice=None)
         
         # Initialize modules
-        self.search_engine = SearchEngine()
-        self.system_monitor = SystemMonitor()
-        self.command_handler = CommandHandler()
+        self.search_engine = SearchEngine(CONFIG["search_deadline"])
+        self.system_monitor = SystemMonitor(CONFIG["monitor_interval"], CONFIG["gpu_telemetry"],
+                                            os.path.join(CONFIG["cache_dir"], "metrics_history.npz"),
+                                            CONFIG["alert_thresholds"])
+        self.system_monitor.alert_engine.cooldown = self.alert_interval
+        self.system_monitor.start_sampler()
+        self.intent_router = IntentRouter()
+        self.command_handler = CommandHandler(self.intent_router, self.system_monitor.metrics_history)
         
         self.system_context = self.system_monitor.get_system_context()
         self.system_prompt_template = self.load_system_prompt()
+        self.prompt_cache = PromptCache(os.path.join(CONFIG["cache_dir"], "kv"))
         
         # Auto-detect device type and persist to config
         try:
@@ -142,7 +264,7 @@ class WavesAI:
         ]
     
     def get_system_context(self):
-        """Wrapper for system_monitor.get_system_context()"""
+        """Wrapper for system_monitor.get_system_context() - served from the background snapshot"""
         return self.system_monitor.get_system_context()
     
     def get_system_alerts(self):
@@ -179,51 +301,9 @@ class WavesAI:
     
     def _detect_news_region(self, user_input: str) -> str:
         """Detect news region from user input - globally aware"""
-        user_input_lower = user_input.lower()
-        
-        # Check for specific countries/regions mentioned
-        country_keywords = {
-            'usa': ['usa', 'america', 'american', 'united states', 'us news'],
-            'uk': ['uk', 'britain', 'british', 'england', 'united kingdom'],
-            'canada': ['canada', 'canadian'],
-            'australia': ['australia', 'australian'],
-            'germany': ['germany', 'german'],
-            'france': ['france', 'french'],
-            'italy': ['italy', 'italian'],
-            'spain': ['spain', 'spanish'],
-            'russia': ['russia', 'russian'],
-            'china': ['china', 'chinese'],
-            'japan': ['japan', 'japanese'],
-            'south korea': ['korea', 'korean', 'south korea'],
-            'india': ['india', 'indian'],
-            'brazil': ['brazil', 'brazilian'],
-            'mexico': ['mexico', 'mexican'],
-            'argentina': ['argentina', 'argentinian'],
-            'south africa': ['south africa', 'south african'],
-            'egypt': ['egypt', 'egyptian'],
-            'nigeria': ['nigeria', 'nigerian'],
-            'thailand': ['thailand', 'thai'],
-            'singapore': ['singapore', 'singaporean'],
-            'malaysia': ['malaysia', 'malaysian'],
-            'indonesia': ['indonesia', 'indonesian'],
-            'philippines': ['philippines', 'filipino'],
-            'vietnam': ['vietnam', 'vietnamese'],
-            'turkey': ['turkey', 'turkish'],
-            'israel': ['israel', 'israeli'],
-            'uae': ['uae', 'emirates', 'dubai'],
-            'saudi arabia': ['saudi', 'saudi arabia']
-        }
-        
-        # Check for country-specific keywords
-        for country, keywords in country_keywords.items():
-            if any(keyword in user_input_lower for keyword in keywords):
-                return country
+        region = self.intent_router.detect_region(user_input)
         
-        # Check for regional keywords
-        if any(keyword in user_input_lower for keyword in ['world', 'global', 'international']):
-            return 'world'
-        
-        if any(keyword in user_input_lower for keyword in ['local', 'here', 'my area', 'current location']):
+        if region == 'local':
             # Try to get user's location for local news
             try:
                 location_data = self.system_monitor.location_weather.get_location()
@@ -234,10 +314,11 @@ class WavesAI:
             return 'local'
         
         # Default to world news for global audience
-        return 'world'
+        return region or 'world'
     
     def smart_execute(self, user_input: str):
         """Wrapper for command_handler.smart_execute()"""
+        self.system_context = self.get_system_context()
         return self.command_handler.smart_execute(user_input, self.system_context)
     
     def is_safe_command(self, command: str) -> bool:
@@ -267,7 +348,14 @@ class WavesAI:
         except FileNotFoundError:
             print(f"[Warning] System prompt file not found at {prompt_path}")
             return "You are WavesAI, an AI assistant for Arch Linux."
-    
+
+    def get_static_prompt_prefix(self) -> str:
+        """Static head of every prompt (system prompt without per-turn data) - its KV state is cached"""
+        static_prompt = self.system_prompt_template.replace(
+            "{system_status}", "(live values are listed in the latest system message)"
+        ).rstrip()
+        return f"<|start_header_id|>system<|end_header_id|>\n\n{static_prompt}<|eot_id|>"
+
     def init_database(self):
         """Initialize SQLite database for persistent memory"""
         db_path = Path(CONFIG["database"])
@@ -306,88 +394,6 @@ class WavesAI:
         
         self.conn.commit()
     
-    def get_system_context(self) -> Dict:
-        """Gather comprehensive system information for AI context"""
-        try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = datetime.now() - boot_time
-            
-            # Get GPU info (NVIDIA)
-            gpu_info = "N/A"
-            try:
-                nvidia_smi = subprocess.check_output(
-                    ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,memory.total,temperature.gpu', 
-                     '--format=csv,noheader,nounits'],
-                    encoding='utf-8'
-                ).strip().split(',')
-                gpu_info = f"GPU: {nvidia_smi[0]}% | VRAM: {nvidia_smi[1]}/{nvidia_smi[2]}MB | Temp: {nvidia_smi[3]}°C"
-            except:
-                pass
-            
-            # Get CPU temperature
-            cpu_temp = "N/A"
-            try:
-                temps = psutil.sensors_temperatures()
-                if 'coretemp' in temps:
-                    cpu_temp = f"{temps['coretemp'][0].current}°C"
-            except:
-                pass
-            
-            # Get process count and top processes
-            process_count = len(psutil.pids())
-            top_processes = self.get_top_processes(5)
-            
-            # Get network stats
-            network_stats = self.get_network_stats()
-            
-            # Get system load
-            load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0]
-            
-            return {
-                "username": os.getenv("USER"),
-                "hostname": os.uname().nodename,
-                "cpu_usage": f"{cpu_percent}%",
-                "cpu_temp": cpu_temp,
-                "ram_usage": f"{memory.percent}% ({memory.used // (1024**3)}GB/{memory.total // (1024**3)}GB)",
-                "disk_usage": f"{disk.percent}% ({disk.used // (1024**3)}GB/{disk.total // (1024**3)}GB)",
-                "gpu_info": gpu_info,
-                "uptime": str(uptime).split('.')[0],
-                "current_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "distro": "Arch Linux",
-                "process_count": process_count,
-                "top_processes": top_processes,
-                "network_stats": network_stats,
-                "load_avg": f"{load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}"
-            }
-        except Exception as e:
-            return {"error": str(e)}
-    
-    def get_top_processes(self, count: int = 10) -> List[Dict]:
-        """Get top processes by CPU and memory usage"""
-        try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info', 'status']):
-                try:
-                    processes.append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'cpu_percent': proc.info['cpu_percent'],
-                        'memory_percent': proc.info['memory_percent'],
-                        'memory_mb': proc.info['memory_info'].rss / (1024 * 1024),
-                        'status': proc.info['status']
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort by CPU usage
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:count]
-        except Exception as e:
-            return []
-    
     def get_network_stats(self) -> Dict:
         """Get network statistics"""
         try:
@@ -433,62 +439,6 @@ class WavesAI:
         except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
             return {"error": str(e)}
     
-    def get_system_alerts(self) -> List[str]:
-        """Check for system alerts and warnings with proactive suggestions"""
-        alerts = []
-        try:
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            if cpu_percent > 95:
-                alerts.append(f"Sir, CPU usage is critically high at {cpu_percent}%. Would you like me to identify the process?")
-            elif cpu_percent > 85:
-                alerts.append(f"CPU usage is elevated at {cpu_percent}%")
-            
-            # Check memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
-                alerts.append(f"Sir, memory usage is at {memory.percent}%. Consider closing some applications.")
-            elif memory.percent > 80:
-                alerts.append(f"Memory usage is high at {memory.percent}%")
-            
-            # Check disk usage
-            disk = psutil.disk_usage('/')
-            if disk.percent > 95:
-                alerts.append(f"Sir, disk space is critically low ({disk.percent}% used). Shall I clean up temporary files?")
-            elif disk.percent > 85:
-                alerts.append(f"Disk space is running low ({disk.percent}% used)")
-            
-            # Check temperature
-            try:
-                temps = psutil.sensors_temperatures()
-                if 'coretemp' in temps:
-                    cpu_temp = temps['coretemp'][0].current
-                    if cpu_temp > 90:
-                        alerts.append(f"Sir, CPU temperature is critically high at {cpu_temp}°C. Consider checking cooling.")
-                    elif cpu_temp > 80:
-                        alerts.append(f"CPU temperature is elevated at {cpu_temp}°C")
-            except:
-                pass
-            
-            # Check for zombie processes
-            zombie_count = 0
-            for proc in psutil.process_iter(['status']):
-                if proc.info['status'] == psutil.STATUS_ZOMBIE:
-                    zombie_count += 1
-            
-            if zombie_count > 5:
-                alerts.append(f"Sir, found {zombie_count} zombie processes. Would you like me to clean them up?")
-            elif zombie_count > 0:
-                alerts.append(f"Found {zombie_count} zombie process(es)")
-            
-            # Check for high swap usage
-            swap = psutil.swap_memory()
-            if swap.percent > 80:
-                alerts.append(f"Swap usage is high at {swap.percent}%. System may be slow.")
-            
-            return alerts
-        except Exception as e:
-            return [f"Error checking alerts: {str(e)}"]
     
     def init_voice_components(self):
         """Initialize voice assistant components"""
@@ -511,6 +461,7 @@ class WavesAI:
             'whisper_model': os.getenv('WAVESAI_WHISPER_MODEL', 'base.en'),
             'piper_model': os.getenv('WAVESAI_PIPER_MODEL', '/home/bowser/.wavesai/models/tts/bryce.onnx'),
             'tts_speed': float(os.getenv('WAVESAI_TTS_SPEED', '1.0')),
+            'tts_max_chars': int(os.getenv('WAVESAI_TTS_MAX_CHARS', '500')),
             'enable_noise_reduction': os.getenv('WAVESAI_NOISE_REDUCTION', 'false').lower() == 'true',
             'smart_noise_cancellation': os.getenv('WAVESAI_SMART_NOISE_CANCELLATION', 'true').lower() == 'true',
             'noise_learning': os.getenv('WAVESAI_NOISE_LEARNING', 'true').lower() == 'true',
@@ -844,6 +795,7 @@ class WavesAI:
         """Request immediate interruption of AI speech"""
         self.conversation_state['interrupt_requested'] = True
         self.conversation_state['user_interrupted'] = True
+        self._interrupt_requested_at = time.time()
         try:
             self._processing_abort_event.set()
         except Exception:
@@ -860,7 +812,8 @@ class WavesAI:
             aborting = hasattr(self, '_processing_abort_event') and self._processing_abort_event.is_set()
         except Exception:
             aborting = False
-        return self.conversation_state['interrupt_requested'] or self.stop_listening or aborting
+        state = getattr(self, 'conversation_state', {})  # Only exists once voice components are set up
+        return state.get('interrupt_requested', False) or getattr(self, 'stop_listening', False) or aborting
 
     def clear_interrupts(self):
         """Clear interrupt flags when starting a new user utterance"""
@@ -1076,6 +1029,106 @@ class WavesAI:
             pass
         self._fast_intr_active = False
     
+    def _clean_tts_text(self, text: str) -> str:
+        """Strip markdown, code blocks and links so they are not read aloud"""
+        text = re.sub(r'\*{1,2}([^*]+)\*{1,2}', r'\1', text)  # Remove markdown
+        text = re.sub(r'```[^`]*```', '', text)  # Remove code blocks
+        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)  # Convert links
+        return text.strip()
+    
+    def _synthesize_speech(self, text: str) -> Optional[str]:
+        """Synthesize text to a temporary WAV file with piper (or espeak-ng); returns its path"""
+        model = self.voice_config.get('piper_model')
+        speed = self.voice_config.get('tts_speed', 1.0)
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            out = tmp.name
+        try:
+            # Try Piper first (best quality)
+            if model and shutil.which("piper"):
+                cmd = ["piper", "--model", model, "--output_file", out]
+                if speed != 1.0:
+                    cmd.extend(["--length_scale", str(1.0/speed)])
+                subprocess.run(cmd + ["--text", text], check=True, capture_output=True)
+            # Fallback to espeak-ng
+            elif shutil.which("espeak-ng"):
+                speed_param = str(int(175 * speed))
+                subprocess.run(["espeak-ng", "-s", speed_param, "-w", out, text], check=True, capture_output=True)
+            else:
+                os.unlink(out)
+                return None
+            return out
+        except Exception as e:
+            print(f"[TTS Error] {e}")
+            try:
+                os.unlink(out)
+            except Exception:
+                pass
+            return None
+    
+    def _begin_tts_playback(self) -> bool:
+        """Enter speaking state before the first clip plays; False if no audio player exists"""
+        if not (shutil.which("aplay") or shutil.which("ffplay")):
+            return False
+        self.start_speaking()
+        self._start_fast_interrupt_listener()
+        return True
+    
+    def _end_tts_playback(self):
+        """Leave speaking state and resume listening"""
+        self._stop_fast_interrupt_listener()
+        try:
+            if hasattr(self, 'echo_cancel'):
+                self.echo_cancel.on_tts_stop()
+        except Exception:
+            pass
+        self.stop_speaking()
+    
+    def _play_speech_file(self, path: str, interrupt_check=None) -> bool:
+        """Play a WAV file with enhanced interruption support; returns False if interrupted"""
+        guard_ms = int(os.getenv('WAVESAI_INTERRUPT_GUARD_MS', '200'))
+        try:
+            if self.voice_config.get('simple_interrupt', True) or hasattr(self, 'echo_cancel'):
+                guard_ms = 0
+        except Exception:
+            pass
+        
+        # Feed the clip to the echo canceller as its reference signal
+        try:
+            with wave.open(path, 'rb') as wf:
+                n_channels = wf.getnchannels()
+                n_frames = wf.getnframes()
+                sampwidth = wf.getsampwidth()
+                frames = wf.readframes(n_frames)
+            if np is not None and sampwidth == 2 and n_frames > 0:
+                audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+                if n_channels and n_channels > 1:
+                    audio = audio.reshape(-1, n_channels).mean(axis=1)
+                if hasattr(self, 'echo_cancel'):
+                    try:
+                        self.echo_cancel.on_tts_start(audio)
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+        
+        if shutil.which("aplay"):
+            player = ["aplay", "-q", path]
+        elif shutil.which("ffplay"):
+            player = ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", path]
+        else:
+            return True
+        
+        self._tts_guard_until = time.time() + guard_ms / 1000.0
+        proc = subprocess.Popen(player)
+        while proc.poll() is None:
+            now = time.time()
+            if now >= getattr(self, '_tts_guard_until', 0) and ((interrupt_check and interrupt_check()) or self.check_interrupt()):
+                proc.terminate()
+                print(" \033[1;33m[🛑 Interrupted]\033[0m")
+                return False
+            time.sleep(0.05)
+        return True
+    
     def tts_speak_advanced(self, text: str, interrupt_check=None):
         """Advanced TTS with echo prevention and interruption support"""
         # Initialize voice config if not exists
@@ -1091,178 +1144,110 @@ class WavesAI:
             }
             
         # Clean text for TTS
-        text = re.sub(r'\*{1,2}([^*]+)\*{1,2}', r'\1', text)  # Remove markdown
-        text = re.sub(r'```[^`]*```', '', text)  # Remove code blocks
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)  # Convert links
-        text = text.strip()
+        text = self._clean_tts_text(text)
         
         if not text:
             return
+        
+        # Last resort: print
+        if not (self.voice_config.get('piper_model') and shutil.which("piper")) and not shutil.which("espeak-ng"):
+            print(f"\n\033[1;35m[WavesAI]\033[0m ➜ {text}")
+            return
             
         started_speaking = False
-        guard_ms = int(os.getenv('WAVESAI_INTERRUPT_GUARD_MS', '200'))
         try:
-            if self.voice_config.get('simple_interrupt', True) or hasattr(self, 'echo_cancel'):
-                guard_ms = 0
-        except Exception:
-            pass
-        
-        try:
-            model = self.voice_config.get('piper_model')
-            speed = self.voice_config.get('tts_speed', 1.0)
-            
-            # Try Piper first (best quality)
-            if model and shutil.which("piper"):
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                    out = tmp.name
+            out = self._synthesize_speech(text)
+            if out:
                 try:
-                    # Generate speech
-                    cmd = ["piper", "--model", model, "--output_file", out]
-                    if speed != 1.0:
-                        cmd.extend(["--length_scale", str(1.0/speed)])
-                    
-                    subprocess.run(cmd + ["--text", text], check=True, capture_output=True)
-                    try:
-                        with wave.open(out, 'rb') as wf:
-                            n_channels = wf.getnchannels()
-                            n_frames = wf.getnframes()
-                            sampwidth = wf.getsampwidth()
-                            frames = wf.readframes(n_frames)
-                        if np is not None and sampwidth == 2 and n_frames > 0:
-                            audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-                            if n_channels and n_channels > 1:
-                                audio = audio.reshape(-1, n_channels).mean(axis=1)
-                            if hasattr(self, 'echo_cancel'):
-                                try:
-                                    self.echo_cancel.on_tts_start(audio)
-                                except Exception:
-                                    pass
-                    except Exception:
-                        pass
-                    
-                    # Play with enhanced interruption support
-                    guard_s = guard_ms / 1000.0
-                    if shutil.which("aplay"):
-                        if not started_speaking:
-                            self.start_speaking()
-                            self._start_fast_interrupt_listener()
-                            started_speaking = True
-                        self._tts_guard_until = time.time() + guard_s
-                        proc = subprocess.Popen(["aplay", "-q", out])
-                        while proc.poll() is None:
-                            now = time.time()
-                            if now >= getattr(self, '_tts_guard_until', 0) and ((interrupt_check and interrupt_check()) or self.check_interrupt()):
-                                proc.terminate()
-                                print(" \033[1;33m[🛑 Interrupted]\033[0m")
-                                break
-                            time.sleep(0.05)
-                    elif shutil.which("ffplay"):
-                        if not started_speaking:
-                            self.start_speaking()
-                            self._start_fast_interrupt_listener()
-                            started_speaking = True
-                        self._tts_guard_until = time.time() + guard_s
-                        proc = subprocess.Popen(["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", out])
-                        while proc.poll() is None:
-                            now = time.time()
-                            if now >= getattr(self, '_tts_guard_until', 0) and ((interrupt_check and interrupt_check()) or self.check_interrupt()):
-                                proc.terminate()
-                                print(" \033[1;33m[🛑 Interrupted]\033[0m")
-                                break
-                            time.sleep(0.05)
-                except Exception as e:
-                    print(f"[TTS Error] {e}")
+                    started_speaking = self._begin_tts_playback()
+                    if started_speaking:
+                        self._play_speech_file(out, interrupt_check)
                 finally:
                     try:
                         os.unlink(out)
                     except Exception:
                         pass
-                return
-                
-            # Fallback to espeak-ng  
-            elif shutil.which("espeak-ng"):
-                try:
-                    speed_param = str(int(175 * speed))
-                    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                        out = tmp.name
-                    try:
-                        subprocess.run(["espeak-ng", "-s", speed_param, "-w", out, text], check=True, capture_output=True)
-                        try:
-                            with wave.open(out, 'rb') as wf:
-                                n_channels = wf.getnchannels()
-                                n_frames = wf.getnframes()
-                                sampwidth = wf.getsampwidth()
-                                frames = wf.readframes(n_frames)
-                            if np is not None and sampwidth == 2 and n_frames > 0:
-                                audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-                                if n_channels and n_channels > 1:
-                                    audio = audio.reshape(-1, n_channels).mean(axis=1)
-                                if hasattr(self, 'echo_cancel'):
-                                    try:
-                                        self.echo_cancel.on_tts_start(audio)
-                                    except Exception:
-                                        pass
-                        except Exception:
-                            pass
-                        guard_s = guard_ms / 1000.0
-                        if shutil.which("aplay"):
-                            if not started_speaking:
-                                self.start_speaking()
-                                self._start_fast_interrupt_listener()
-                                started_speaking = True
-                            self._tts_guard_until = time.time() + guard_s
-                            proc = subprocess.Popen(["aplay", "-q", out])
-                            while proc.poll() is None:
-                                now = time.time()
-                                if now >= getattr(self, '_tts_guard_until', 0) and ((interrupt_check and interrupt_check()) or self.check_interrupt()):
-                                    proc.terminate()
-                                    print(" \033[1;33m[🛑 Interrupted]\033[0m")
-                                    break
-                                time.sleep(0.05)
-                        elif shutil.which("ffplay"):
-                            if not started_speaking:
-                                self.start_speaking()
-                                self._start_fast_interrupt_listener()
-                                started_speaking = True
-                            self._tts_guard_until = time.time() + guard_s
-                            proc = subprocess.Popen(["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", out])
-                            while proc.poll() is None:
-                                now = time.time()
-                                if now >= getattr(self, '_tts_guard_until', 0) and ((interrupt_check and interrupt_check()) or self.check_interrupt()):
-                                    proc.terminate()
-                                    print(" \033[1;33m[🛑 Interrupted]\033[0m")
-                                    break
-                                time.sleep(0.05)
-                    except Exception:
-                        pass
-                    finally:
-                        try:
-                            os.unlink(out)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                return
-                
-            # Last resort: print
-            else:
-                print(f"\n\033[1;35m[WavesAI]\033[0m ➜ {text}")
-        
         finally:
             # Always stop speaking state to resume listening
             if started_speaking:
-                self._stop_fast_interrupt_listener()
-                try:
-                    if hasattr(self, 'echo_cancel'):
-                        self.echo_cancel.on_tts_stop()
-                except Exception:
-                    pass
-                self.stop_speaking()
+                self._end_tts_playback()
             try:
                 self._tts_guard_until = 0
             except Exception:
                 pass
     
+    def speak_response_stream(self, user_input: str, generation: int) -> str:
+        """Generate and speak a response with sentence-level pipelining
+        
+        Sentences are cut from the token stream as soon as they complete, synthesized on a worker
+        while the previous sentence plays, and an interrupt flushes every stage at once.
+        """
+        if not hasattr(self, 'voice_config'):
+            self.init_voice_components()
+        max_chars = self.voice_config.get('tts_max_chars', 500)
+        should_stop = lambda: self.is_canceled(generation) or self.check_interrupt()
+        
+        def on_start():
+            try:
+                self.conversation_state['is_processing'] = False
+            except Exception:
+                pass
+            if not self._begin_tts_playback():
+                return
+            pipeline.owns_speaking_state = True
+        
+        def on_finish():
+            if getattr(pipeline, 'owns_speaking_state', False):
+                self._end_tts_playback()
+            self._tts_guard_until = 0
+        
+        pipeline = SpeechPipeline(
+            synthesize=self._synthesize_speech,
+            play=lambda path: self._play_speech_file(path),
+            should_stop=should_stop,
+            on_start=on_start,
+            on_finish=on_finish
+        )
+        pipeline.start()
+        chunker = SentenceChunker()
+        queued_chars = 0
+        pieces = []
+        pipeline_start = time.time()
+        
+        def queue_sentences(sentences):
+            nonlocal queued_chars
+            for sentence in sentences:
+                sentence = self._clean_tts_text(sentence)
+                if sentence and queued_chars < max_chars:
+                    pipeline.speak(sentence)
+                    queued_chars += len(sentence)
+        
+        print("\033[1;35m[WavesAI]\033[0m ", end='', flush=True)
+        # Spoken answers stay free-form text
+        job = self.submit_generation(user_input, PRIORITY_INTERACTIVE, generation, remember=True,
+                                     name="voice answer", allow_actions=False, spoken=True)
+        try:
+            for token in job.tokens():
+                pieces.append(token)
+                print(token, end='', flush=True)
+                if should_stop():
+                    break
+                queue_sentences(chunker.feed(token))
+        finally:
+            print()
+            if should_stop():
+                pipeline.flush()
+            else:
+                queue_sentences(chunker.flush())
+            pipeline.close()
+            pipeline.wait()
+        
+        self.last_generation_stats = job.stats
+        if pipeline.first_audio_time is not None:
+            self.last_generation_stats['ttfa_ms'] = (pipeline.first_audio_time - pipeline_start) * 1000
+            print(f"\033[2m[⏱ first audio {self.last_generation_stats['ttfa_ms'] / 1000:.2f}s]\033[0m")
+        return ''.join(pieces).strip()
+    
     def voice_mode(self):
         """New voice mode using sounddevice like the working prototype"""
         try:
@@ -1279,12 +1264,13 @@ class WavesAI:
         
         # Initialize voice configuration for TTS
         self.init_voice_components()
+        self.system_monitor.alert_engine.subscribe(self._speak_alert)
         
         # Initialize smart noise detection system
         self.init_smart_noise_detection()
         
-        # Load LLM if not already loaded
-        if not self.llm:
+        # Load LLM if not already loaded (a running daemon already has it)
+        if not self.llm and not self.connect_daemon():
             print("\033[1;33m[Loading]\033[0m Loading AI model...")
             if not self.load_llm():
                 print("\033[1;31m[Error]\033[0m Failed to load AI model. Voice mode cannot continue.")
@@ -1399,10 +1385,13 @@ class WavesAI:
         
         config['sample_rate'] = sample_rate
         
-        # Load Whisper model
+        # Load Whisper model (the daemon keeps its own copy resident)
         print("\033[1;33m[Loading]\033[0m Whisper model...", end='')
         try:
-            if CUDA_AVAILABLE:
+            if self.model_client:
+                whisper_model = None
+                print(" \033[1;32m✓ (model server)\033[0m")
+            elif CUDA_AVAILABLE:
                 whisper_model = WhisperModel(config['whisper_model'], device="cuda", compute_type="float16")
                 print(" \033[1;32m✓ (CUDA)\033[0m")
             else:
@@ -1724,23 +1713,26 @@ class WavesAI:
                         pass
                     continue
                 try:
-                    segments, _ = whisper_model.transcribe(
-                        tmp_path,
-                        beam_size=5,
-                        language="en",
-                        vad_filter=True,
-                        condition_on_previous_text=False
-                    )
-                    # Incremental transcription with cooperative cancel
-                    text_parts = []
-                    for s in segments:
-                        if self.is_canceled(gen):
-                            break
-                        try:
-                            text_parts.append(s.text)
-                        except Exception:
-                            pass
-                    text = " ".join(text_parts).strip()
+                    if whisper_model is None:
+                        text = self.model_client.transcribe(tmp_path, config['whisper_model'])
+                    else:
+                        segments, _ = whisper_model.transcribe(
+                            tmp_path,
+                            beam_size=5,
+                            language="en",
+                            vad_filter=True,
+                            condition_on_previous_text=False
+                        )
+                        # Incremental transcription with cooperative cancel
+                        text_parts = []
+                        for s in segments:
+                            if self.is_canceled(gen):
+                                break
+                            try:
+                                text_parts.append(s.text)
+                            except Exception:
+                                pass
+                        text = " ".join(text_parts).strip()
                     os.unlink(tmp_path)
                     
                     if text:
@@ -1775,22 +1767,12 @@ class WavesAI:
                             except Exception:
                                 pass
                             continue
-                        response = self.generate_response(text, generation=gen)
-                        if self.is_canceled(gen) or not response:
-                            try:
-                                self.conversation_state['is_processing'] = False
-                            except Exception:
-                                pass
-                            continue
-                        print(f"\033[1;35m[WavesAI]\033[0m {response}")
-                        
-                        # TTS if available (with echo prevention)
-                        if hasattr(self, 'tts_speak_advanced'):
-                            try:
-                                self.conversation_state['is_processing'] = False
-                            except Exception:
-                                pass
-                            self.tts_speak_advanced(response[:500])
+                        # Stream the answer: each sentence is spoken while the next one generates
+                        self.speak_response_stream(text, gen)
+                        try:
+                            self.conversation_state['is_processing'] = False
+                        except Exception:
+                            pass
                     else:
                         print(" (no speech)")
                         try:
@@ -2214,14 +2196,18 @@ class WavesAI:
     
     # Removed duplicate smart_execute method - now uses command_handler.smart_execute() only
     
-    def load_llm(self):
-        """Load LLM model using llama-cpp-python"""
+    def load_llm(self, announce: bool = True):
+        """Load LLM model using llama-cpp-python
+        
+        announce=False keeps progress lines quiet (errors are still printed) for background loads.
+        """
+        say = print if announce else (lambda *args, **kwargs: None)
         try:
             from llama_cpp import Llama
             
             # Extract model filename from path
             model_filename = os.path.basename(CONFIG["model_path"])
-            print(f"[WavesAI] Loading model: {model_filename}")
+            say(f"[WavesAI] Loading model: {model_filename}")
             
             # Check if model exists
             if not os.path.exists(CONFIG["model_path"]):
@@ -2231,17 +2217,29 @@ class WavesAI:
             
             # Show model size
             model_size_gb = os.path.getsize(CONFIG["model_path"]) / (1024**3)
-            print(f"[WavesAI] Model size: {model_size_gb:.2f} GB")
+            say(f"[WavesAI] Model size: {model_size_gb:.2f} GB")
             
             self.llm = Llama(
                 model_path=CONFIG["model_path"],
                 n_ctx=CONFIG["context_length"],
                 n_gpu_layers=CONFIG["gpu_layers"],
                 n_threads=CONFIG["threads"],
+                n_batch=CONFIG["batch_size"],
+                seed=CONFIG["seed"],
+                use_mmap=CONFIG["use_mmap"],
+                use_mlock=CONFIG["use_mlock"],
+                # Draft verification reads logits at every drafted position; llama-cpp-python only
+                # turns this on by itself when draft_model is passed here, not when attached per turn
+                logits_all=CONFIG["speculative_mode"] != 'off',
                 verbose=False
             )
-            print(f"[WavesAI] ✓ {model_filename} loaded successfully with GPU acceleration")
-            print(f"[WavesAI] Context: {CONFIG['context_length']} tokens | GPU Layers: {CONFIG['gpu_layers']} | Threads: {CONFIG['threads']}")
+            say(f"[WavesAI] ✓ {model_filename} loaded successfully with GPU acceleration")
+            say(f"[WavesAI] Context: {CONFIG['context_length']} tokens | GPU Layers: {CONFIG['gpu_layers']} | Threads: {CONFIG['threads']} | Batch: {CONFIG['batch_size']}")
+            self.load_speculative_draft(say)
+            self.load_small_model(say)
+            self.prompt_builder = PromptBuilder(self.llm, CONFIG["context_length"], CONFIG["max_tokens"])
+            self.conversation_memory.counter = self.prompt_builder.count
+            self.warm_prompt_cache(announce)
             return True
         except ImportError:
             print("[ERROR] llama-cpp-python not installed. Install with:")
@@ -2250,65 +2248,338 @@ class WavesAI:
         except Exception as e:
             print(f"[ERROR] Failed to load model: {e}")
             return False
+
+    def load_small_model(self, say=print):
+        """Load model.small for short-form tasks; without it everything runs on the main model"""
+        path = CONFIG["small_model_path"]
+        if not path or self.model_router.small_llm is not None:
+            return
+        if not os.path.exists(path):
+            print(f"[Warning] Small model not found at: {path}")
+            return
+        try:
+            small = load_small_model(path, CONFIG["small_model_context"], CONFIG["small_model_gpu_layers"],
+                                     CONFIG["threads"])
+            self.model_router = ModelRouter(small, CONFIG["small_model_tasks"])
+            say(f"[WavesAI] ✓ Small model {os.path.basename(path)} handles: {', '.join(CONFIG['small_model_tasks'])}")
+        except Exception as e:
+            print(f"[Warning] Small model disabled: {e}")
     
-    def generate_response(self, user_input: str, generation: int = None) -> str:
-        """Generate AI response using loaded LLM with search context; cancel if generation superseded"""
-        if not self.llm:
-            return "Error: Model not loaded"
+    def load_speculative_draft(self, say=print):
+        """Set up the configured speculative decoding draft; falls back to plain decoding on failure"""
+        mode = CONFIG["speculative_mode"]
+        if mode == 'off' or self.speculative_draft is not None:
+            return
+        try:
+            self.speculative_draft = create_draft(mode, CONFIG["speculative_draft_model"],
+                                                  CONFIG["speculative_tokens"] or None,
+                                                  CONFIG["context_length"], CONFIG["gpu_layers"], CONFIG["threads"])
+            say(f"[WavesAI] Speculative decoding: {mode} ({CONFIG['speculative_scope']} answers)")
+        except Exception as e:
+            self.speculative_draft = None
+            print(f"[Warning] Speculative decoding disabled: {e}")
+    
+    def apply_preset(self, name: str):
+        """Apply a config preset live; yields progress lines
         
-        system_info = self.get_system_context()
+        Runs on the LLM scheduler's worker (see run_preset) so no generation is in flight while
+        the model is reloaded. Offload and thread changes reload the Llama instance; with mmap
+        the weights come from the page cache, so the reload is much faster than a cold start.
+        """
+        settings = resolve_preset(CONFIG["presets"], name, self.default_settings)
+        if settings is None:
+            yield f"Unknown preset '{name}'. Available: {', '.join(['default'] + list(CONFIG['presets']))}"
+            return
+        if not self.wait_for_llm():
+            yield "Model not loaded"
+            return
+        before = measure_speed(self.llm)
+        if before:
+            yield f"Before: {before:.1f} tok/s"
         
-        # Check for file writing operations first
-        file_writing_keywords = ['write', 'create', 'generate']
-        file_indicators = [' in ', ' to ', '.txt', '.md', '.py', '.js', '.html', '.css']
+        previous = {key: CONFIG[key] for key in ('gpu_layers', 'threads', 'batch_size', 'max_tokens')}
+        reload = any(settings[key] != previous[key] for key in ('gpu_layers', 'threads', 'batch_size'))
+        CONFIG.update({key: settings[key] for key in previous})
+        if reload:
+            yield (f"Reloading model: gpu_layers {previous['gpu_layers']}→{settings['gpu_layers']}, "
+                   f"threads {previous['threads']}→{settings['threads']}, batch {previous['batch_size']}→{settings['batch_size']}")
+            start = time.time()
+            # Drop every reference so VRAM is freed before the new offload is allocated
+            self.llm = None
+            self.prompt_builder.llm = None
+            if not self.load_llm(announce=False):
+                yield "Reload failed, restoring the previous settings"
+                CONFIG.update(previous)
+                self.load_llm(announce=False)
+                return
+            yield f"Reloaded in {time.time() - start:.1f}s"
+        else:
+            self.prompt_builder.max_tokens = settings['max_tokens']
+        
+        self.system_monitor.monitor_interval = settings['monitor_interval']
+        self.alert_interval = settings['alert_interval']
+        self.system_monitor.alert_engine.cooldown = self.alert_interval
+        self.alerts_muted = settings.get('mute_alerts', False)
+        if settings.get('nice') is not None:
+            try:
+                psutil.Process().nice(settings['nice'])
+            except Exception:
+                yield "Could not raise process priority (needs CAP_SYS_NICE)"
+        self.active_preset = name
+        
+        after = measure_speed(self.llm)
+        if after:
+            change = f" ({after / before:.2f}x)" if before else ""
+            yield f"After: {after:.1f} tok/s{change}"
+        yield (f"Preset '{name}' active: gpu_layers {settings['gpu_layers']}, threads {settings['threads']}, "
+               f"max_tokens {settings['max_tokens']}, monitor every {settings['monitor_interval']}s")
+    
+    def run_preset(self, name: str):
+        """Apply a preset here or on the daemon; yields progress lines"""
+        if self.model_client is not None:
+            yield from self.model_client.preset(name)
+            return
+        job = self.llm_scheduler.submit(lambda job: self.apply_preset(name), PRIORITY_INTERACTIVE, name=f"preset {name}")
+        yield from job.tokens()
+    
+    def connect_daemon(self) -> bool:
+        """Use a running WavesAI daemon for generation instead of loading the model in this process"""
+        if self.model_client is not None:
+            return True
+        if not CONFIG["use_daemon"] or "--no-daemon" in sys.argv:
+            return False
+        client = ModelClient(CONFIG["daemon_socket"])
+        info = client.ping()
+        if not info:
+            return False
+        self.model_client = client
+        print(f"\033[1;32m[WavesAI]\033[0m Connected to model server (pid {info['pid']}"
+              f"{', model loading' if not info.get('ready') else ''})")
+        return True
+    
+    def start_llm_loading(self, use_daemon: bool = True) -> bool:
+        """Start loading the model on a background thread; returns False if it cannot be loaded
+        
+        With use_daemon (the default) a running daemon is used instead and nothing is loaded.
+        """
+        if self.llm is not None or self.llm_loader is not None:
+            return True
+        if use_daemon and self.connect_daemon():
+            return True
+        if not os.path.exists(CONFIG["model_path"]):
+            print(f"[ERROR] Model not found at: {CONFIG['model_path']}")
+            print("Please ensure the model file exists at the specified path.")
+            return False
+        
+        def load():
+            with self.startup_profiler.span("model load"):
+                return self.load_llm(announce=False)
+        
+        self.llm_loader = BackgroundLoader(load).start()
+        return True
+    
+    def wait_for_llm(self) -> bool:
+        """Block until the model is usable (only the first query that needs it ever waits)"""
+        if self.model_client is not None:
+            return True
+        if self.llm_loader is None:
+            return self.llm is not None or self.load_llm()
+        if not self.llm_loader.done():
+            print("\033[1;35m[WavesAI]\033[0m ➜ Finishing model load...", end='\r', flush=True)
+            with self.startup_profiler.span("first query waits for model"):
+                self.llm_loader.wait()
+        if not getattr(self, '_startup_reported', False):
+            self._startup_reported = True
+            self.startup_profiler.print_timeline("Startup timeline - model ready")
+        return self.llm_loader.wait() and self.llm is not None
+    
+    def warm_prompt_cache(self, announce: bool = True):
+        """Restore (or build and persist) the KV state of the static system prompt prefix"""
+        if not self.llm or not CONFIG.get("prompt_cache", True):
+            return
+        try:
+            result = self.prompt_cache.prepare(
+                self.llm, CONFIG["model_path"], self.get_static_prompt_prefix(), CONFIG["context_length"]
+            )
+            if announce:
+                print(f"[WavesAI] Prompt cache {result['status']}: {result['tokens']} tokens in {result['seconds']:.2f}s")
+        except Exception as e:
+            print(f"[Warning] Prompt cache unavailable: {e}")
+
+    def _is_file_writing_request(self, user_input: str) -> bool:
+        """Detect file writing requests that bypass the LLM"""
+        return self.intent_router.route(user_input).intent == 'file'
+    
+    def generate_response(self, user_input: str, generation: int = None, priority: int = PRIORITY_INTERACTIVE,
+                          task: str = None) -> str:
+        """Generate AI response using loaded LLM with search context; cancel if generation superseded
         
-        if (any(keyword in user_input.lower() for keyword in file_writing_keywords) and 
-            any(indicator in user_input.lower() for indicator in file_indicators)):
+        task names a short-form task class that may run on the small model (see ModelRouter).
+        """
+        if not self.wait_for_llm():
+            return "Error: Model not loaded"
+        
+        # Check for file writing operations first
+        if self._is_file_writing_request(user_input):
             return self._handle_file_writing(user_input)
         
+        if self.llm_scheduler.in_worker():
+            # Already on the model thread (e.g. from a job callback): run inline
+            response = ''.join(self.generate_response_stream(user_input, generation, allow_actions=False,
+                                                             task=task)).strip()
+            return "" if self.last_generation_stats.get('canceled') else response
+        job = self.submit_generation(user_input, priority, generation,
+                                     name=PRIORITY_NAMES.get(priority, "generation"), allow_actions=False, task=task)
+        response = job.result().strip()
+        self.last_generation_stats = job.stats
+        return response
+    
+    def submit_generation(self, user_input: str, priority: int = PRIORITY_INTERACTIVE, generation: int = None,
+                          remember: bool = False, name: str = "answer", on_done=None, allow_actions: bool = True,
+                          spoken: bool = False, task: str = None):
+        """Queue a generation on the LLM scheduler; canceled when the generation is superseded"""
+        if generation is None:
+            generation = getattr(self, '_processing_generation', 0)
+        
+        def run(job):
+            try:
+                yield from self.generate_response_stream(user_input, generation, remember, allow_actions, spoken, task,
+                                                         priority)
+            finally:
+                job.stats.update(self.last_generation_stats)
+        
+        return self.llm_scheduler.submit(run, priority, should_cancel=lambda: self.is_canceled(generation),
+                                         name=name, on_done=on_done)
+    
+    def _response_cache_intent(self, user_input: str, is_news: bool, is_weather: bool,
+                               is_location: bool, is_info: bool) -> Optional[str]:
+        """Cache bucket (and TTL) for a query, or None if its answer should not be reused"""
+        if not CONFIG.get("response_cache", True):
+            return None
+        # Follow-ups like "tell me more about it" depend on the conversation, not just the text
+        if self.conversation_memory.turns and re.search(r"\b(it|its|that|this|they|them|those|he|she|more)\b",
+                                                        user_input.lower()):
+            return None
+        if is_news:
+            return 'news'
+        if is_weather:
+            return 'weather'
+        if is_location:
+            return 'location'
+        # Machine state, the clock and prices change under a week-long info TTL
+        if is_info and not is_volatile(user_input):
+            return 'info'
+        return None
+    
+    def generate_response_stream(self, user_input: str, generation: int = None, remember: bool = False,
+                                 allow_actions: bool = True, spoken: bool = False, task: str = None,
+                                 priority: int = PRIORITY_INTERACTIVE):
+        """Stream the AI response token by token; stops early if the generation is superseded
+        
+        Per-turn timing (time to first token, tokens/sec) is recorded in last_generation_stats.
+        With remember=True the finished exchange is added to the conversation memory.
+        With allow_actions, command-like turns are constrained to a JSON action (see
+        generation.structured_actions) that the caller parses with parse_action().
+        The reply is budgeted by the length policy (spoken answers get the voice budget).
+        Short-form tasks (task=...) run on the small model when one is loaded.
+        priority is passed on to the daemon's scheduler when the model runs there.
+        """
+        turn_start = time.time()
+        self.last_generation_stats = {'canceled': False}
+        if not self.wait_for_llm():
+            yield "Error: Model not loaded"
+            return
+        
+        if self._is_file_writing_request(user_input):
+            self._handle_file_writing(user_input)
+            return
+        
+        if self.model_client is not None:
+            yield from self._remote_response_stream(user_input, generation, remember, allow_actions, spoken, task,
+                                                    priority)
+            return
+        
+        system_info = self.get_system_context()
+        
         # Initialize generation snapshot
         if generation is None:
             generation = getattr(self, '_processing_generation', 0)
         # Check for pending interrupt before any heavy prep
         if self.is_canceled(generation) or self.check_interrupt():
-            return ""
+            self.last_generation_stats['canceled'] = True
+            return
+        if self.model_router.use_small(task):
+            yield from self._small_model_stream(user_input, task, generation, turn_start)
+            return
         # Check if this is an information query - ALWAYS search the internet for facts
+        # Fetched data goes in retrieval_data; search_context wraps it via a "{data}" slot
         search_context = ""
+        retrieval_data = None
         
-        # Keywords that indicate the user wants information (not system commands)
-        info_keywords = ['what', 'who', 'when', 'where', 'why', 'how', 'tell me', 'explain', 'about', 'is', 'are', 'was', 'were', 'define', 'meaning', 'search']
-        news_keywords = ['news', 'headlines', 'breaking', 'latest news', 'current events', 'updates', 'indian news', 'us news', 'uk news', 'world news', 'local news', 'ndtv', 'bbc', 'cnn', 'reuters', 'news today', 'current news', 'breaking news']
+        # Classify the input once (commands never trigger a search)
+        route = self.intent_router.route(user_input)
+        # Several specific search intents matched ('info' is the catch-all): let the small model pick
+        # instead of the fixed priority order
+        search_matches = sorted(route.matches & {'news', 'weather', 'location'})
+        if len(search_matches) > 1 and not route.is_command and self.model_router.use_small('intent_disambiguation'):
+            choice = self.model_router.disambiguate(user_input, search_matches)
+            if choice and choice != route.intent:
+                print(f"[DEBUG] Intent disambiguated: {route.intent} → {choice}")
+                route = Route(choice, route.matches, route.region)
+        self.last_generation_stats['intent'] = route.intent
+        is_info_query = route.intent == 'info'
+        is_command = route.is_command
+        is_news_query = route.intent == 'news'
+        is_weather_query = route.intent == 'weather'
+        is_location_query = route.intent == 'location'
+        structured_mode = CONFIG["structured_actions"]
+        grammar = get_grammar() if allow_actions and (
+            structured_mode == 'always' or (structured_mode == 'commands' and (is_command or route.intent == 'file'))) else None
         
-        # System command keywords (don't search for these)
-        command_keywords = ['open', 'close', 'kill', 'start', 'stop', 'install', 'remove', 'delete', 'create file', 'write to', 'execute', 'run', 'launch']
-        
-        # Determine if this is an information query
-        is_info_query = any(keyword in user_input.lower() for keyword in info_keywords)
-        is_command = any(keyword in user_input.lower() for keyword in command_keywords)
-        is_news_query = any(keyword in user_input.lower() for keyword in news_keywords)
+        # Repeated and near-duplicate questions are answered from the response cache
+        cache_intent = self._response_cache_intent(user_input, is_news_query, is_weather_query,
+                                                   is_location_query, is_info_query and not is_command)
+        if cache_intent:
+            cached = self.response_cache.get(user_input, cache_intent)
+            if cached:
+                print(f"[DEBUG] Response cache hit ({cache_intent}, similarity {cached['similarity']:.2f}, "
+                      f"age {int(cached['age'])}s)")
+                self.last_generation_stats.update({'cache_hit': True, 'tokens': 0,
+                                                   'ttft_ms': (time.time() - turn_start) * 1000,
+                                                   'total_ms': (time.time() - turn_start) * 1000})
+                if remember:
+                    self.conversation_memory.add_turn(user_input, cached['response'])
+                yield cached['response']
+                return
         
         # For news queries, use specialized news fetching
         if is_news_query:
             if self.is_canceled(generation) or self.check_interrupt():
-                return ""
+                self.last_generation_stats['canceled'] = True
+                return
             try:
                 # Handle news queries with AI processing
                 region = self._detect_news_region(user_input)
                 print(f"\n[DEBUG] Fetching {region} news from internet...")
                 if self.is_canceled(generation) or self.check_interrupt():
-                    return ""
+                    self.last_generation_stats['canceled'] = True
+                    return
+                fetch_start = time.time()
                 news_results = self.search_news(user_input, region)
+                self.last_generation_stats['retrieval_ms'] = (time.time() - fetch_start) * 1000
+                self.last_generation_stats['retrieval_sources'] = {'news': self.last_generation_stats['retrieval_ms']}
                 print(f"[DEBUG] Fetched {len(news_results)} characters of news data")
                 print(f"[DEBUG] First 200 chars: {news_results[:200]}...")
                 
                 # AI should ALWAYS process and refine the results
+                retrieval_data = news_results
                 search_context = f"""
 
 🚨 CRITICAL - REAL-TIME NEWS DATA FETCHED FROM INTERNET 🚨
 
 The following news was JUST FETCHED from live news websites RIGHT NOW in {datetime.now().strftime('%B %Y')}. This is NOT from your training data. This is CURRENT, REAL-TIME news:
 
-{news_results}
+{{data}}
 
 ⚠️ INSTRUCTIONS:
 - PROCESS these 7 articles conversationally (NOT raw data)
@@ -2322,19 +2593,30 @@ The following news was JUST FETCHED from live news websites RIGHT NOW in {dateti
         # For ALL other information queries (not news, not commands), search the internet
         elif is_info_query and not is_command:
             if self.is_canceled(generation) or self.check_interrupt():
-                return ""
+                self.last_generation_stats['canceled'] = True
+                return
             try:
                 print(f"\n[DEBUG] Information query detected, searching internet...")
                 
-                # Search both Wikipedia and Web for comprehensive results
-                if self.is_canceled(generation) or self.check_interrupt():
-                    return ""
-                wiki_results = self.search_wikipedia(user_input)
-                if self.is_canceled(generation) or self.check_interrupt():
-                    return ""
-                web_results = self.search_web(user_input)
+                # Search Wikipedia and the Web concurrently; take whatever arrives within the deadline
+                should_stop = lambda: self.is_canceled(generation) or self.check_interrupt()
+                results = self.search_engine.search_info(
+                    user_input,
+                    deadline=CONFIG["search_deadline"],
+                    should_stop=should_stop
+                )
+                if should_stop():
+                    self.last_generation_stats['canceled'] = True
+                    return
+                wiki_results = results.get('wikipedia', '')
+                web_results = results.get('web', '')
+                retrieval = self.search_engine.last_retrieval
+                self.last_generation_stats['retrieval_ms'] = retrieval.get('seconds', 0) * 1000
+                self.last_generation_stats['retrieval_sources'] = {
+                    name: seconds * 1000 for name, seconds in retrieval.get('timings', {}).items()}
                 
-                print(f"[DEBUG] Wikipedia: {len(wiki_results)} chars, Web: {len(web_results)} chars")
+                print(f"[DEBUG] Wikipedia: {len(wiki_results)} chars, Web: {len(web_results)} chars "
+                      f"in {retrieval.get('seconds', 0):.2f}s" + (f" (missed: {', '.join(retrieval['missed'])})" if retrieval.get('missed') else ""))
                 
                 # Combine results intelligently
                 combined_results = []
@@ -2346,13 +2628,14 @@ The following news was JUST FETCHED from live news websites RIGHT NOW in {dateti
                     combined_results.append(f"🌐 WEB SEARCH RESULTS (Current):\n{web_results}")
                 
                 if combined_results:
+                    retrieval_data = "\n\n".join(combined_results)
                     search_context = f"""
 
 🚨 CRITICAL - REAL-TIME INTERNET DATA 🚨
 
 The following information was JUST FETCHED from the internet RIGHT NOW in {datetime.now().strftime('%B %Y')}:
 
-{chr(10).join(combined_results)}
+{{data}}
 
 ⚠️ INSTRUCTIONS:
 - PROCESS data conversationally (NOT raw)
@@ -2366,14 +2649,10 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
                 pass
         
         # Check for weather and location queries
-        weather_keywords = ['weather', 'temperature', 'climate', 'forecast', 'rain', 'sunny', 'cloudy', 'hot', 'cold', 'warm']
-        location_keywords = ['location', 'where am i', 'my location', 'current location', 'where i am']
-        
-        if (any(keyword in user_input.lower() for keyword in weather_keywords) or 
-            any(keyword in user_input.lower() for keyword in location_keywords)):
+        if is_weather_query or is_location_query:
             try:
                 # For location queries, provide location info
-                if any(keyword in user_input.lower() for keyword in location_keywords):
+                if 'location' in route.matches:
                     location_data = self.system_monitor.location_weather.get_location()
                     if not location_data.get('error'):
                         city = location_data.get('city', 'Unknown')
@@ -2387,7 +2666,7 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
                         search_context = f"\n\nLOCATION INFORMATION:\nCurrent Location: {location_str}\nTimezone: {location_data.get('timezone', 'Unknown')}\n\nIMPORTANT: Process this location data and respond conversationally like JARVIS. Be sophisticated, friendly, and natural. Don't just state the raw data - present it in an engaging, helpful way."
                 
                 # For weather queries, provide weather info
-                if any(keyword in user_input.lower() for keyword in weather_keywords):
+                if 'weather' in route.matches:
                     # Extract location from query if specified
                     location = None
                     if " in " in user_input.lower():
@@ -2401,7 +2680,11 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
                         location = None
                     
                     # Get weather information
+                    fetch_start = time.time()
                     weather_results = self.system_monitor.location_weather.get_weather_summary(location)
+                    weather_ms = (time.time() - fetch_start) * 1000
+                    self.last_generation_stats['retrieval_ms'] = self.last_generation_stats.get('retrieval_ms', 0) + weather_ms
+                    self.last_generation_stats.setdefault('retrieval_sources', {})['weather'] = weather_ms
                     
                     if weather_results and not ("error" in weather_results.lower()):
                         search_context = f"\n\nWEATHER INFORMATION:\n{weather_results}\n\nIMPORTANT: Process this weather data and respond conversationally like JARVIS. Don't just repeat the raw data - analyze it and present it in a sophisticated, engaging way. Comment on the conditions, temperature, and any relevant details. Be helpful and natural."
@@ -2425,94 +2708,241 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
 - Uptime: {system_info['uptime']}
 - Time: {system_info['current_time']}
 - {system_info.get('location', 'Location: Unknown')}"""
+        # Questions about the machine get the recent trend, not just the instantaneous values
+        if re.search(r"\b(cpu|ram|memory|gpu|vram|swap|temp|temperature|slow|lag|laggy|load|fan|hot|heat)\b",
+                     user_input.lower()):
+            trend = self.system_monitor.metrics_history.context()
+            if trend:
+                system_status += f"\n- {trend}"
         
-        # Load system prompt from file and inject system status
-        system_prompt = self.system_prompt_template.replace("{system_status}", system_status)
-
         # Llama 3.1 prompt format (without <|begin_of_text|> - model adds it automatically)
+        # assembled by the prompt builder so long retrievals are trimmed to the context window.
+        # The static system prompt comes first so its cached KV state is reused; only the
+        # per-turn status, search context and user input below are evaluated each turn.
         if self.is_canceled(generation) or self.check_interrupt():
-            return ""
-        prompt = f"""<|start_header_id|>system<|end_header_id|>
-
-{system_prompt}{search_context}<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-{user_input}<|eot_id|><|start_header_id|>assistant<|end_header_id|>
-
-"""
+            self.last_generation_stats['canceled'] = True
+            return
+        stats = self.last_generation_stats
+        compress = None
+        if retrieval_data is None:
+            retrieval = PromptSection("context", search_context)
+        else:
+            # Long retrievals keep only the sentences that best match the question
+            compressing = CONFIG["retrieval_compression"]
+            retrieval = PromptSection("retrieval", retrieval_data, priority=10, trimmable=True, template=search_context,
+                                      max_tokens=CONFIG["retrieval_tokens"] if compressing else None)
+            if compressing:
+                self.context_compressor.last = {}
+                compress = lambda text, budget: self.context_compressor.compress(text, user_input, budget,
+                                                                                 self.prompt_builder.count)
+        prompt, prompt_report = self.prompt_builder.build([
+            PromptSection("system", self.get_static_prompt_prefix(), static=True),
+            PromptSection("history", self.conversation_memory.render()),
+            PromptSection("status", f"<|start_header_id|>system<|end_header_id|>\n\nCURRENT SYSTEM STATUS:\n{system_status}"),
+            retrieval,
+            PromptSection("actions", f"\n\n{ACTION_INSTRUCTIONS}" if grammar else ""),
+            PromptSection("user", f"<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{user_input}"
+                                  f"<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"),
+        ], compress=compress)
+        stats['prompt_tokens'] = prompt_report['prompt_tokens']
+        compressed = self.context_compressor.last if compress else None
+        if compressed and compressed.get('units'):
+            section = prompt_report['sections']['retrieval']
+            stats['prompt_tokens_uncompressed'] = prompt_report['prompt_tokens'] + section['requested'] - section['tokens']
+            print(f"[DEBUG] Retrieval compressed: kept {compressed['kept']}/{compressed['units']} sentences, "
+                  f"{compressed['before']} → {compressed['after']} tokens | prompt "
+                  f"{stats['prompt_tokens_uncompressed']} → {stats['prompt_tokens']} tokens")
+        # Speculation pays off when the answer restates the fetched context
+        use_draft = self.speculative_draft is not None and not grammar and (
+            CONFIG["speculative_scope"] == 'all' or retrieval_data is not None)
+        self.llm.draft_model = self.speculative_draft if use_draft else None
+        if use_draft:
+            stats['speculative'] = CONFIG["speculative_mode"]
+        print(f"[DEBUG] {self.prompt_builder.format_report(prompt_report)}")
+        if CONFIG.get("prompt_cache", True):
+            self.prompt_cache.ensure_loaded(self.llm)
+        stats['cached_tokens'] = cached_prefix_tokens(self.llm, prompt)
 
-        # Cooperative cancellation: try streaming generation and break on interrupt
+        # Cooperative cancellation: stream tokens to the caller and stop on interrupt
+        stop_sequences = CONFIG["stop_sequences"]
+        action_kwargs = {'grammar': grammar} if grammar else {}
+        action_stream = ActionStream() if grammar else None
+        if grammar:
+            stats['structured'] = True
+        # Budget the reply from the requested length; file writes keep the full budget
+        default_cap = prompt_report['reply_tokens']
+        budget = None if grammar and route.intent == 'file' else self.length_policy.budget(user_input, route.intent, spoken)
+        max_tokens = min(default_cap, budget['max_tokens']) if budget else default_cap
+        stopper = EarlyStopper(budget['soft']) if budget and not grammar else None
+        stats['max_tokens'] = max_tokens
+        if budget:
+            stats.update(length_tier=budget['tier'], token_budget=budget['soft'])
         try:
-            stream = self.llm(
-                prompt,
-                max_tokens=CONFIG["max_tokens"],
-                temperature=CONFIG["temperature"],
-                stop=["<|eot_id|>", "<|end_of_text|>", "User:", "[You]"],
-                echo=False,
-                stream=True
-            )
-            pieces = []
-            for chunk in stream:
-                if self.is_canceled(generation) or self.check_interrupt():
-                    try:
-                        stream.close()
-                    except Exception:
-                        pass
-                    return ""
-                try:
-                    token = chunk['choices'][0].get('text', '')
-                except Exception:
-                    token = ''
-                if token:
-                    pieces.append(token)
-            return ''.join(pieces).strip()
-        except TypeError:
-            # Fallback if streaming not supported
-            if self.is_canceled(generation) or self.check_interrupt():
-                return ""
+            llm_start = time.time()
             try:
+                stream = self.llm(
+                    prompt,
+                    max_tokens=max_tokens,
+                    temperature=CONFIG["temperature"],
+                    top_p=CONFIG["top_p"],
+                    top_k=CONFIG["top_k"],
+                    repeat_penalty=CONFIG["repeat_penalty"],
+                    stop=stop_sequences,
+                    echo=False,
+                    stream=True,
+                    **action_kwargs
+                )
+            except TypeError:
+                # Fallback if streaming not supported
                 response = self.llm(
                     prompt,
-                    max_tokens=CONFIG["max_tokens"],
+                    max_tokens=max_tokens,
                     temperature=CONFIG["temperature"],
-                    stop=["<|eot_id|>", "<|end_of_text|>", "User:", "[You]"],
-                    echo=False
+                    top_p=CONFIG["top_p"],
+                    top_k=CONFIG["top_k"],
+                    repeat_penalty=CONFIG["repeat_penalty"],
+                    stop=stop_sequences,
+                    echo=False,
+                    **action_kwargs
                 )
-                return response['choices'][0]['text'].strip()
-            except Exception as e:
-                return f"Error: {e}"
+                stream = [response]
+            first_token_time = None
+            token_count = 0
+            pieces = []
+            try:
+                for chunk in stream:
+                    if self.is_canceled(generation) or self.check_interrupt():
+                        stats['canceled'] = True
+                        try:
+                            stream.close()
+                        except Exception:
+                            pass
+                        return
+                    try:
+                        token = chunk['choices'][0].get('text', '')
+                    except Exception:
+                        token = ''
+                    if token:
+                        if first_token_time is None:
+                            first_token_time = time.time()
+                            stats['ttft_ms'] = (first_token_time - turn_start) * 1000
+                            stats['prompt_eval_ms'] = (first_token_time - llm_start) * 1000
+                        if stopper and stopper.feed(token):
+                            # Past the budget and this token starts a new sentence: stop before it
+                            stats['early_stop'] = True
+                            try:
+                                stream.close()
+                            except Exception:
+                                pass
+                            break
+                        token_count += 1
+                        pieces.append(token)
+                        yield token
+                        if action_stream and action_stream.feed(token):
+                            # The action object is complete: nothing useful can follow
+                            try:
+                                stream.close()
+                            except Exception:
+                                pass
+                            break
+            except GeneratorExit:
+                stats['canceled'] = True  # Consumer stopped early: don't remember or cache a partial answer
+                raise
+            finally:
+                end_time = time.time()
+                stats['tokens'] = token_count
+                stats['total_ms'] = (end_time - turn_start) * 1000
+                if first_token_time is not None and token_count > 1 and end_time > first_token_time:
+                    stats['tokens_per_sec'] = (token_count - 1) / (end_time - first_token_time)
+                if not stats['canceled']:
+                    self.length_policy.record(stats, default_cap)
+                if remember and not stats['canceled'] and pieces:
+                    self.conversation_memory.add_turn(user_input, ''.join(pieces))
+                response = ''.join(pieces).strip()
+                # Info answers are only reused when fetched data backed them, not bare model knowledge
+                backed = retrieval_data if cache_intent == 'info' else search_context
+                if (cache_intent and not stats['canceled'] and not grammar and response and backed
+                        and not response.startswith("Error") and "EXECUTE_COMMAND:" not in response
+                        and "WRITE_TO_FILE:" not in response):
+                    self.response_cache.put(user_input, cache_intent, response)
+        except GeneratorExit:
+            raise
+        except Exception as e:
+            yield f"Error: {e}"
+    
+    def _remote_response_stream(self, user_input: str, generation: int = None, remember: bool = False,
+                                allow_actions: bool = True, spoken: bool = False, task: str = None,
+                                priority: int = PRIORITY_INTERACTIVE):
+        """Stream the response from the daemon; falls back to a local model if it goes away"""
+        if generation is None:
+            generation = getattr(self, '_processing_generation', 0)
+        received = False
+        try:
+            stream = self.model_client.stream(user_input, remember, priority, allow_actions=allow_actions, spoken=spoken,
+                                              task=task)
+            try:
+                for token in stream:
+                    if self.is_canceled(generation) or self.check_interrupt():
+                        self.last_generation_stats['canceled'] = True
+                        return  # Closing the stream cancels the generation on the daemon
+                    received = True
+                    yield token
+            finally:
+                stream.close()
+            self.last_generation_stats = dict(self.model_client.last_stats, remote=True)
+        except (OSError, RuntimeError) as e:
+            print(f"\n\033[1;33m[Warning]\033[0m Model server unavailable ({e}), loading the model locally")
+            self.model_client = None
+            if received or not self.start_llm_loading(use_daemon=False):
+                return
+            yield from self.generate_response_stream(user_input, generation, remember, allow_actions, spoken, task,
+                                                     priority)
+    
+    def _small_model_stream(self, user_input: str, task: str, generation: int, turn_start: float):
+        """Run a short-form task on the small model: compact prompt, no retrieval or history"""
+        stats = self.last_generation_stats
+        stats.update(model='small', task=task)
+        first_token_time = None
+        token_count = 0
+        stream = self.model_router.stream(user_input, task)
+        try:
+            for token in stream:
+                if self.is_canceled(generation) or self.check_interrupt():
+                    stats['canceled'] = True
+                    return
+                if first_token_time is None:
+                    first_token_time = time.time()
+                    stats['ttft_ms'] = (first_token_time - turn_start) * 1000
+                token_count += 1
+                yield token
+        except GeneratorExit:
+            stats['canceled'] = True
+            raise
         except Exception as e:
-            return f"Error: {e}"
+            yield f"Error: {e}"
+        finally:
+            stream.close()
+            end_time = time.time()
+            stats['tokens'] = token_count
+            stats['total_ms'] = (end_time - turn_start) * 1000
+            if first_token_time is not None and token_count > 1 and end_time > first_token_time:
+                stats['tokens_per_sec'] = (token_count - 1) / (end_time - first_token_time)
     
     def _handle_file_writing(self, response: str):
         """Handle file writing operations smoothly"""
+        action = parse_action(response)
+        if action.kind != 'write_file':
+            print(f"\033[1;31m[Error]\033[0m No file path specified")
+            return
+        self._write_file(action.path, action.content)
+    
+    def _write_file(self, file_path: str, content: str):
+        """Write a file requested by the model (from a write_file action)"""
         try:
-            # Extract file path and content
-            lines = response.split('\n')
-            file_path = None
-            content_lines = []
-            in_content = False
-            
-            for line in lines:
-                if line.startswith("WRITE_TO_FILE:"):
-                    file_path = line.replace("WRITE_TO_FILE:", "").strip()
-                elif line.startswith("CONTENT_START"):
-                    in_content = True
-                elif line.startswith("CONTENT_END"):
-                    in_content = False
-                elif in_content:
-                    content_lines.append(line)
-            
-            if not file_path:
-                print(f"\033[1;31m[Error]\033[0m No file path specified")
-                return
-            
             # Expand home directory
             if file_path.startswith("~/"):
                 file_path = os.path.expanduser(file_path)
             
-            # Write content to file
-            content = '\n'.join(content_lines)
-            
             print(f"\033[1;35m[WavesAI]\033[0m ➜ Writing {len(content)} characters to {file_path}")
             
             # Create directory if it doesn't exist
@@ -2522,7 +2952,7 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
                 f.write(content)
             
             print(f"\033[1;32m[Success]\033[0m File written successfully: {file_path}")
-            print(f"\033[1;36m[Info]\033[0m Content length: {len(content)} characters, {len(content_lines)} lines")
+            print(f"\033[1;36m[Info]\033[0m Content length: {len(content)} characters, {len(content.splitlines())} lines")
             
         except Exception as e:
             print(f"\033[1;31m[Error]\033[0m Failed to write file: {e}")
@@ -2987,233 +3417,6 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
         except Exception as e:
             return f"Wikipedia content retrieval failed: {str(e)}"
     
-    def search_web(self, query: str) -> str:
-        """Enhanced web search using DuckDuckGo's full potential"""
-        try:
-            # Try DuckDuckGo Instant Answer API first with enhanced parameters
-            api_url = f"https://api.duckduckgo.com/?q={query}&format=json&no_html=1&skip_disambig=1&t=wavesai"
-            api_response = requests.get(api_url, timeout=10)
-            api_data = api_response.json()
-            
-            result_parts = []
-            
-            # Get instant answer/abstract
-            if api_data.get('AbstractText'):
-                abstract = api_data['AbstractText']
-                abstract_source = api_data.get('AbstractSource', 'Wikipedia')
-                result_parts.append(f"**{api_data.get('Abstract', 'Information')}:**\n{abstract}\n*Source: {abstract_source}*")
-            
-            # Get definition if available
-            if api_data.get('Definition'):
-                result_parts.append(f"**Definition:** {api_data['Definition']}")
-            
-            # Get answer (for direct questions)
-            if api_data.get('Answer'):
-                result_parts.append(f"**Answer:** {api_data['Answer']}")
-            
-            # Get related topics
-            if api_data.get('RelatedTopics'):
-                related_info = []
-                for topic in api_data['RelatedTopics'][:5]:
-                    if isinstance(topic, dict) and 'Text' in topic:
-                        related_info.append(f"• {topic['Text']}")
-                if related_info:
-                    result_parts.append("**Related Information:**\n" + '\n'.join(related_info))
-            
-            # Get definitions from definitions array
-            if api_data.get('Definitions'):
-                definitions = []
-                for def_item in api_data['Definitions'][:3]:
-                    if isinstance(def_item, dict) and 'Definition' in def_item:
-                        definitions.append(f"• {def_item['Definition']}")
-                if definitions:
-                    result_parts.append("**Definitions:**\n" + '\n'.join(definitions))
-            
-            # Get infobox data for biographical information
-            if api_data.get('Infobox'):
-                infobox = api_data['Infobox']
-                if isinstance(infobox, dict):
-                    infobox_info = []
-                    for key, value in infobox.items():
-                        if isinstance(value, str) and len(value) > 5:
-                            infobox_info.append(f"• **{key.replace('_', ' ').title()}:** {value}")
-                    if infobox_info:
-                        result_parts.append("**Key Details:**\n" + '\n'.join(infobox_info[:8]))  # Limit to 8 items
-            
-            # If we have good results from API, return them
-            if result_parts:
-                return "\n\n".join(result_parts)
-            
-            # If API doesn't have enough info, try HTML search for more comprehensive results
-            html_result = self.search_web_html(query)
-            
-            # If HTML search also fails or returns generic error, try to provide some basic info
-            if ("couldn't extract" in html_result.lower() or 
-                "couldn't find" in html_result.lower() or
-                "no results were found" in html_result.lower()):
-                
-                # Try one more fallback: return basic API info even if minimal
-                if api_data.get('AbstractText') or api_data.get('RelatedTopics'):
-                    fallback_parts = []
-                    if api_data.get('AbstractText'):
-                        fallback_parts.append(f"**Basic Information:** {api_data['AbstractText']}")
-                    if api_data.get('RelatedTopics'):
-                        related = []
-                        for topic in api_data['RelatedTopics'][:2]:
-                            if isinstance(topic, dict) and 'Text' in topic:
-                                related.append(f"• {topic['Text']}")
-                        if related:
-                            fallback_parts.append("**Related:**\n" + '\n'.join(related))
-                    
-                    if fallback_parts:
-                        return "\n\n".join(fallback_parts) + "\n\n*Note: Limited information available. For more details, please check the source websites directly.*"
-            
-            return html_result
-            
-        except Exception as e:
-            return f"Search failed: {str(e)}. Please try again or check your internet connection, sir."
-    
-    def search_web_html(self, query: str) -> str:
-        """Enhanced HTML search using DuckDuckGo for comprehensive results"""
-        try:
-            search_url = f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                content = response.text
-                results = []
-                
-                import re
-                
-                # Strategy 1: Try DuckDuckGo's current HTML structure patterns
-                # Look for result containers with various possible class names
-                result_patterns = [
-                    r'<div class="result"[^>]*>(.*?)</div>',
-                    r'<div class="web-result"[^>]*>(.*?)</div>',
-                    r'<div class="result__body"[^>]*>(.*?)</div>',
-                    r'<article[^>]*>(.*?)</article>',
-                    r'<div class="result__snippet"[^>]*>(.*?)</div>'
-                ]
-                
-                for pattern in result_patterns:
-                    result_blocks = re.findall(pattern, content, re.DOTALL)
-                    if result_blocks:
-                        break
-                
-                if result_blocks:
-                    for block in result_blocks[:5]:  # Get top 5 results
-                        # Try multiple title extraction patterns
-                        title_patterns = [
-                            r'<a[^>]*class="[^"]*result__a[^"]*"[^>]*href="[^"]*"[^>]*>(.*?)</a>',
-                            r'<a[^>]*href="[^"]*"[^>]*class="[^"]*result__a[^"]*"[^>]*>(.*?)</a>',
-                            r'<h2[^>]*><a[^>]*href="[^"]*"[^>]*>(.*?)</a></h2>',
-                            r'<h3[^>]*><a[^>]*href="[^"]*"[^>]*>(.*?)</a></h3>',
-                            r'<a[^>]*href="[^"]*"[^>]*>(.*?)</a>'
-                        ]
-                        
-                        title = None
-                        for title_pattern in title_patterns:
-                            title_match = re.search(title_pattern, block)
-                            if title_match:
-                                title = re.sub(r'<[^>]+>', '', title_match.group(1)).strip()
-                                if title and len(title) > 5:
-                                    break
-                        
-                        # Try multiple snippet extraction patterns
-                        snippet_patterns = [
-                            r'<a[^>]*class="[^"]*result__snippet[^"]*"[^>]*>(.*?)</a>',
-                            r'<div[^>]*class="[^"]*result__snippet[^"]*"[^>]*>(.*?)</div>',
-                            r'<span[^>]*class="[^"]*result__snippet[^"]*"[^>]*>(.*?)</span>',
-                            r'<p[^>]*>(.*?)</p>',
-                            r'<div[^>]*class="[^"]*snippet[^"]*"[^>]*>(.*?)</div>',
-                            r'<div[^>]*class="[^"]*result__body[^"]*"[^>]*>(.*?)</div>',
-                            r'<span[^>]*class="[^"]*result__body[^"]*"[^>]*>(.*?)</span>',
-                            r'<div[^>]*class="[^"]*web-result[^"]*"[^>]*>(.*?)</div>'
-                        ]
-                        
-                        snippet = None
-                        for snippet_pattern in snippet_patterns:
-                            snippet_match = re.search(snippet_pattern, block)
-                            if snippet_match:
-                                snippet = re.sub(r'<[^>]+>', '', snippet_match.group(1)).strip()
-                                if snippet and len(snippet) > 15:
-                                    break
-                        
-                        # If no snippet found, try to extract any meaningful text from the block
-                        if not snippet:
-                            # Remove HTML tags and get clean text
-                            clean_block = re.sub(r'<[^>]+>', ' ', block)
-                            clean_block = re.sub(r'\s+', ' ', clean_block).strip()
-                            
-                            # Look for sentences that might be descriptions
-                            sentences = clean_block.split('.')
-                            for sentence in sentences:
-                                sentence = sentence.strip()
-                                if (len(sentence) > 30 and len(sentence) < 300 and 
-                                    not sentence.lower().startswith('http') and
-                                    'click' not in sentence.lower() and
-                                    'visit' not in sentence.lower()):
-                                    snippet = sentence
-                                    break
-                        
-                        # Format the result with title and snippet
-                        if title and len(title) > 5:
-                            if snippet and len(snippet) > 10:
-                                results.append(f"**{title}**\n{snippet}")
-                            else:
-                                results.append(f"**{title}**\n*No additional details available*")
-                
-                # Strategy 2: If no results from structured parsing, try general text extraction
-                if not results:
-                    # Look for any links that might be search results
-                    link_patterns = [
-                        r'<a[^>]*href="http[^"]*"[^>]*>(.*?)</a>',
-                        r'<h[2-4][^>]*>(.*?)</h[2-4]>'
-                    ]
-                    
-                    for pattern in link_patterns:
-                        matches = re.findall(pattern, content)
-                        for match in matches[:5]:
-                            clean_text = re.sub(r'<[^>]+>', '', match).strip()
-                            if clean_text and len(clean_text) > 10 and len(clean_text) < 200:
-                                results.append(f"• {clean_text}")
-                        if results:
-                            break
-                
-                # Strategy 3: Fallback to simple text extraction
-                if not results:
-                    # Extract any meaningful text content
-                    text_content = re.sub(r'<[^>]+>', ' ', content)
-                    text_content = re.sub(r'\s+', ' ', text_content).strip()
-                    
-                    # Look for sentences that might be relevant
-                    sentences = text_content.split('.')
-                    for sentence in sentences[:10]:
-                        sentence = sentence.strip()
-                        if (len(sentence) > 30 and len(sentence) < 300 and 
-                            any(word in sentence.lower() for word in query.lower().split())):
-                            results.append(f"• {sentence}")
-                            if len(results) >= 3:
-                                break
-                
-                if results:
-                    return "**Search Results:**\n\n" + "\n\n".join(results[:5])
-                else:
-                    # Debug information for troubleshooting
-                    debug_info = f"Debug: Found {len(content)} characters in response. "
-                    debug_info += f"Tried {len(result_patterns)} result patterns. "
-                    debug_info += f"Response contains 'result' class: {'result' in content}. "
-                    return f"I found search results but couldn't extract meaningful content. {debug_info}Please try rephrasing your query, sir."
-            
-            return "Search completed but no results were found. Please try a different query, sir."
-            
-        except Exception as e:
-            return f"Search failed: {str(e)}. Please try again, sir."
-    
     def debug_search_html(self, query: str) -> str:
         """Debug function to help troubleshoot HTML parsing issues"""
         try:
@@ -3263,8 +3466,17 @@ The following information was JUST FETCHED from the internet RIGHT NOW in {datet
             print("\n\033[1;32m[WavesAI]\033[0m ➜ System initialized with limited monitoring.")
             return
         
-        weather = self.get_weather()
-        alerts = self.get_system_alerts()
+        # Weather and alerts are fetched concurrently; a slow weather service does not hold up the prompt
+        def timed(name, fn):
+            def run():
+                with self.startup_profiler.span(name):
+                    return fn()
+            return run
+        weather_future = self.search_engine.executor.submit(timed("weather fetch", self.get_weather))
+        alerts_future = self.search_engine.executor.submit(timed("alerts scan", self.get_system_alerts))
+        wait([weather_future, alerts_future], timeout=2.5)
+        weather = weather_future.result() if weather_future.done() else "Still fetching (ask me 'weather' any time)"
+        alerts = alerts_future.result() if alerts_future.done() else []
         
         briefing = f"""
 ╔══════════════════════════════════════════════════════════╗
@@ -3300,20 +3512,41 @@ How may I assist you?
         print(briefing)
     
     def start_monitoring_thread(self):
-        """Start background monitoring thread"""
-        def monitor_loop():
-            while True:
-                try:
-                    alerts = self.get_system_alerts()
-                    if alerts:
-                        print(f"\n\033[1;33m[WavesAI Alert]\033[0m ➜ {'; '.join(alerts)}")
-                    time.sleep(30)  # Check every 30 seconds
-                except:
-                    time.sleep(60)  # If error, wait longer
-        
-        monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
-        monitor_thread.start()
-        return monitor_thread
+        """Subscribe to alert events from the sampler's alert engine (terminal and desktop notifications)"""
+        engine = self.system_monitor.alert_engine
+        engine.subscribe(self._queue_alert)
+        if CONFIG["alert_notifications"] and shutil.which('notify-send'):
+            engine.subscribe(self._notify_alert)
+    
+    def _queue_alert(self, event):
+        if not self.alerts_muted:
+            self._pending_alerts.append(event)
+    
+    def _notify_alert(self, event):
+        """Desktop notification for newly raised alerts"""
+        if self.alerts_muted or event.kind == 'clear':
+            return
+        urgency = 'critical' if event.severity == 'critical' else 'normal'
+        subprocess.run(['notify-send', '-a', 'WavesAI', '-u', urgency, 'WavesAI Alert', event.message],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+    
+    def _speak_alert(self, event):
+        """Voice mode: say critical alerts out loud unless WavesAI is already talking"""
+        if self.alerts_muted or event.severity != 'critical':
+            return
+        if getattr(self, 'conversation_state', {}).get('is_speaking'):
+            return
+        self.tts_speak_advanced(event.message)
+    
+    def print_pending_alerts(self):
+        """Print alert events queued since the last prompt"""
+        while self._pending_alerts:
+            event = self._pending_alerts.popleft()
+            if event.kind == 'clear':
+                print(f"\n\033[1;32m[WavesAI Alert]\033[0m ➜ Cleared: {event.message}")
+            else:
+                color = '31' if event.severity == 'critical' else '33'
+                print(f"\n\033[1;{color}m[WavesAI Alert]\033[0m ➜ {event.message}")
 
     def detect_device_type(self) -> str:
         """Detect whether the system is a laptop or desktop.
@@ -3547,20 +3780,90 @@ How may I assist you?
         
         return False
     
+    def stream_response_to_terminal(self, user_input: str) -> Tuple[str, bool]:
+        """Render the response stream to the terminal as tokens arrive
+        
+        Responses that open with an EXECUTE_COMMAND/WRITE_TO_FILE directive or a JSON action are
+        not echoed, since the caller handles those. Returns (full response, whether it was rendered).
+        """
+        directives = ("EXECUTE_COMMAND:", "WRITE_TO_FILE:", "{")
+        pieces = []
+        rendering = False
+        suppressed = False
+        job = self.submit_generation(user_input, PRIORITY_INTERACTIVE, remember=True)
+        for token in job.tokens():
+            pieces.append(token)
+            if suppressed:
+                continue
+            if rendering:
+                print(token, end='', flush=True)
+                continue
+            text = ''.join(pieces).lstrip()
+            if not text or any(d.startswith(text) for d in directives):
+                continue  # Could still turn into a directive - hold back
+            if text.startswith(directives):
+                suppressed = True
+                continue
+            rendering = True
+            print(f"\r\033[K\033[1;35m[WavesAI]\033[0m ➜ {text}", end='', flush=True)
+        
+        self.last_generation_stats = stats = job.stats
+        if rendering:
+            print()
+            if stats.get('ttft_ms') is not None:
+                rate = f" | {stats['tokens_per_sec']:.1f} tok/s" if stats.get('tokens_per_sec') else ""
+                queued = f" | queued {stats['queue_ms'] / 1000:.2f}s" if stats.get('queue_ms', 0) >= 50 else ""
+                budget = f" | {stats['length_tier']} budget, ≤{stats['tokens_saved']} saved" if stats.get('tokens_saved') else ""
+                print(f"\033[2m[⏱ first token {stats['ttft_ms'] / 1000:.2f}s{rate} | {stats.get('tokens', 0)} tokens{queued}{budget}]\033[0m")
+        return ''.join(pieces).strip(), rendering
+    
+    def _record_job(self, job):
+        """LLM scheduler on_finish hook: add the finished turn to the performance metrics"""
+        stats = dict(job.stats, name=job.name, status=job.status, preemptions=job.preemptions)
+        if stats.get('remote'):
+            stats['model'] = 'remote'
+        canceled = job.status == 'canceled' or stats.get('canceled')
+        requested = job.cancel_requested_at or self._interrupt_requested_at
+        if canceled and requested and job.submitted <= requested <= job.finished_at:
+            stats['cancel_latency_ms'] = (job.finished_at - requested) * 1000
+        # Turns served by the daemon are stored by the daemon itself
+        self.perf_metrics.record(stats, persist=not stats.get('remote'))
+    
+    def show_perf(self):
+        """Print p50/p95 of this session's turn timings"""
+        rows = self.perf_metrics.recent()
+        print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Performance over the last {len(rows)} turns"
+              f"{' (served by the daemon)' if self.model_client else ''}:")
+        for line in format_summary(summarize(rows)):
+            print(line)
+    
+    def _print_background_summary(self, job):
+        """on_done callback for background jobs: print the result and redraw the prompt"""
+        text = job.result().strip()
+        if job.status == 'done' and text:
+            print(f"\r\033[K\033[1;35m[WavesAI]\033[0m ➜ {text}")
+            print("\n\033[1;36m[You]\033[0m ➜ ", end='', flush=True)
+    
     def interactive_mode(self):
         """Main interactive loop"""
-        if not self.load_llm():
+        # The model loads in the background; only the first query that needs it waits
+        if not self.start_llm_loading():
             return
         
         # Start background monitoring
         self.start_monitoring_thread()
-        self.startup_briefing()
+        with self.startup_profiler.span("briefing"):
+            self.startup_briefing()
         
         # Setup sudo access
-        self.setup_sudo_access()
+        with self.startup_profiler.span("sudo setup"):
+            self.setup_sudo_access()
+        self.startup_profiler.mark("prompt ready")
+        self.startup_profiler.print_timeline()
         
         while True:
             try:
+                self.print_pending_alerts()
                 user_input = input("\n\033[1;36m[You]\033[0m ➜ ").strip()
                 
                 if not user_input:
@@ -3598,7 +3901,7 @@ Solution: {analysis['solution']}
 
 Explain this error conversationally like JARVIS would."""
                             print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
-                            conversational_response = self.generate_response(error_prompt)
+                            conversational_response = self.generate_response(error_prompt, priority=PRIORITY_ERROR, task='error_explanation')
                             print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
                     continue
                 
@@ -3610,11 +3913,53 @@ Explain this error conversationally like JARVIS would."""
                 if user_input.lower() == 'status':
                     self.startup_briefing()
                     continue
+                elif user_input.lower() == 'cache stats':
+                    cache_stats = self.model_client.request('cache') if self.model_client else self.response_cache.stats()
+                    print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Response cache: {cache_stats['hits']} hits, "
+                          f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%}), {cache_stats['entries']} entries")
+                    continue
+                elif user_input.lower() == 'perf':
+                    self.show_perf()
+                    continue
+                elif user_input.lower() == 'alerts':
+                    self._pending_alerts.clear()
+                    active = self.system_monitor.alert_engine.active()
+                    if active:
+                        for event in active:
+                            since = datetime.fromtimestamp(event.at).strftime('%H:%M')
+                            print(f"\n\033[1;33m[WavesAI Alert]\033[0m ➜ {event.message} (since {since})")
+                    else:
+                        print(f"\n\033[1;32m[WavesAI]\033[0m ➜ No active alerts, sir. All systems operational.")
+                    continue
+                elif user_input.lower() == 'cache clear':
+                    if self.model_client:
+                        self.model_client.request('cache', action='clear')
+                    self.response_cache.clear()
+                    print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Response cache cleared, sir.")
+                    continue
+                elif user_input.lower() == 'preset' or user_input.lower().startswith('preset '):
+                    name = user_input[6:].strip().lower()
+                    if not name:
+                        presets = ', '.join(['default'] + list(CONFIG['presets']))
+                        print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Active preset: {self.active_preset}. Available: {presets}")
+                        continue
+                    print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Switching to {name}, sir.")
+                    for line in self.run_preset(name):
+                        print(f"  {line}")
+                    continue
+                elif user_input.lower() in ['forget', 'new conversation', 'clear memory']:
+                    if self.model_client:
+                        self.model_client.request('forget')
+                    self.conversation_memory.clear()
+                    print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Conversation memory cleared, sir.")
+                    continue
                 elif user_input.lower().startswith('weather'):
                     location = user_input[7:].strip() or None
                     print(f"\n\033[1;35m[WavesAI]\033[0m ➜ {self.get_weather(location)}")
                     continue
-                elif user_input.lower().startswith('search') or user_input.lower().startswith('news') or user_input.lower().startswith('what is') or user_input.lower().startswith('who is') or user_input.lower().startswith('how to') or user_input.lower().startswith('explain') or user_input.lower().startswith('wikipedia'):
+                elif parse_history_query(user_input):
+                    pass  # Trend question: answered from the metrics history by smart_execute below
+                elif self.intent_router.route(user_input).intent in ('info', 'news'):
                     # Let AI handle search queries conversationally
                     print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Let me look that up for you, sir.")
                     # Continue to AI processing below
@@ -3631,24 +3976,25 @@ Explain this error conversationally like JARVIS would."""
                     print(f"\n\033[1;35m[WavesAI]\033[0m ➜ {smart_response}")
                     continue
                 
-                # Generate AI response
-                print("\n\033[1;35m[WavesAI]\033[0m ➜ Processing...", end='\r')
-                response = self.generate_response(user_input)
-                # Validate response to prevent hallucinations
-                response = self.validate_response(user_input, response)
+                # Generate AI response, rendering tokens as they arrive
+                print("\n\033[1;35m[WavesAI]\033[0m ➜ Processing...", end='\r', flush=True)
+                response, streamed = self.stream_response_to_terminal(user_input)
+                # One pass over the response: JSON action, or the legacy directive formats
+                action = parse_action(response)
+                if action.kind == 'answer':
+                    # Validate response to prevent hallucinations
+                    validated = self.validate_response(user_input, action.text)
+                    if validated != response:
+                        response, streamed = validated, False
                 
                 # Check if AI wants to write to a file
-                if "WRITE_TO_FILE:" in response:
-                    self._handle_file_writing(response)
+                if action.kind == 'write_file':
+                    self._write_file(action.path, action.content)
                     continue
                 
                 # Check if AI wants to execute a command
-                elif "EXECUTE_COMMAND:" in response:
-                    command = response.split("EXECUTE_COMMAND:")[1].strip().split()[0] if " " in response.split("EXECUTE_COMMAND:")[1] else response.split("EXECUTE_COMMAND:")[1].strip()
-                    # Extract full command line
-                    cmd_start = response.find("EXECUTE_COMMAND:") + 16
-                    cmd_end = response.find("\n", cmd_start) if "\n" in response[cmd_start:] else len(response)
-                    command = response[cmd_start:cmd_end].strip()
+                elif action.kind == 'command':
+                    command = action.command
                     
                     print(f"\033[1;35m[WavesAI]\033[0m ➜ Executing: {command}                    ")
                     
@@ -3674,8 +4020,9 @@ Explain this error conversationally like JARVIS would."""
                             monitoring_keywords = ['ps aux', 'du -', 'df -', 'free', 'top -', 'htop', 'awk', 'grep']
                             if any(keyword in command.lower() for keyword in monitoring_keywords):
                                 summary_prompt = f"The user asked: '{user_input}'\nCommand executed: {command}\nOutput:\n{result['output']}\n\nProvide a brief, conversational summary of this information like JARVIS would."
-                                summary = self.generate_response(summary_prompt)
-                                print(f"\n\033[1;35m[WavesAI]\033[0m ➜ {summary}")
+                                # Summarized in the background; a new question preempts it
+                                self.submit_generation(summary_prompt, PRIORITY_BACKGROUND, name="command summary",
+                                                       on_done=self._print_background_summary, task='command_summary')
                     else:
                         # Pass error through LLM for conversational response
                         if 'error_analysis' in result:
@@ -3690,7 +4037,7 @@ Recommended Solution: {analysis['solution']}
 Explain this error to the user conversationally like JARVIS would. Be brief (2-3 sentences), explain what went wrong, and tell them how to fix it. Address them as 'sir' if appropriate."""
                             
                             print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
-                            conversational_response = self.generate_response(error_prompt)
+                            conversational_response = self.generate_response(error_prompt, priority=PRIORITY_ERROR, task='error_explanation')
                             print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
                         else:
                             # Fallback for errors without analysis
@@ -3700,34 +4047,32 @@ The command failed with this error: {result.get('error', 'Unknown error')}
 Explain this error to the user conversationally like JARVIS would. Be brief (2-3 sentences), explain what went wrong, and suggest how to fix it. Address them as 'sir' if appropriate."""
                             
                             print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
-                            conversational_response = self.generate_response(error_prompt)
+                            conversational_response = self.generate_response(error_prompt, priority=PRIORITY_ERROR, task='error_explanation')
                             print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
                     
                     self.save_interaction(user_input, f"Executed: {command}", command)
                     continue
                 
-                print(f"\033[1;35m[WavesAI]\033[0m ➜ {response}                    ")
+                if not streamed:
+                    print(f"\033[1;35m[WavesAI]\033[0m ➜ {response}                    ")
                 
                 # Check if response contains bash code blocks
-                if "```bash" in response:
-                    cmd_start = response.find("```bash") + 7
-                    cmd_end = response.find("```", cmd_start)
-                    if cmd_end > cmd_start:
-                        command = response[cmd_start:cmd_end].strip()
-                        
-                        confirm = input(f"\n\033[1;33m[Execute?]\033[0m {command} (y/n): ")
-                        if confirm.lower() == 'y':
-                            result = self.execute_command(command)
-                            if result['success']:
-                                if result['output']:
-                                    print(f"\n\033[1;32m[Output]\033[0m\n{result['output']}")
-                                else:
-                                    print(f"\n\033[1;32m[Success]\033[0m Command executed successfully")
+                if action.suggested_command:
+                    command = action.suggested_command
+                    
+                    confirm = input(f"\n\033[1;33m[Execute?]\033[0m {command} (y/n): ")
+                    if confirm.lower() == 'y':
+                        result = self.execute_command(command)
+                        if result['success']:
+                            if result['output']:
+                                print(f"\n\033[1;32m[Output]\033[0m\n{result['output']}")
                             else:
-                                # Pass error through LLM for conversational response
-                                if 'error_analysis' in result:
-                                    analysis = result['error_analysis']
-                                    error_prompt = f"""The user tried to execute: {command}
+                                print(f"\n\033[1;32m[Success]\033[0m Command executed successfully")
+                        else:
+                            # Pass error through LLM for conversational response
+                            if 'error_analysis' in result:
+                                analysis = result['error_analysis']
+                                error_prompt = f"""The user tried to execute: {command}
 The command failed with this error:
 
 Error Type: {analysis['summary']}
@@ -3735,24 +4080,24 @@ Error Details: {analysis.get('original_error', result.get('error', 'Unknown erro
 Recommended Solution: {analysis['solution']}
 
 Explain this error to the user conversationally like JARVIS would. Be brief (2-3 sentences), explain what went wrong, and tell them how to fix it. Address them as 'sir' if appropriate."""
-                                    
-                                    print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
-                                    conversational_response = self.generate_response(error_prompt)
-                                    print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
-                                else:
-                                    # Fallback for errors without analysis
-                                    error_prompt = f"""The user tried to execute: {command}
+                                
+                                print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
+                                conversational_response = self.generate_response(error_prompt, priority=PRIORITY_ERROR, task='error_explanation')
+                                print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
+                            else:
+                                # Fallback for errors without analysis
+                                error_prompt = f"""The user tried to execute: {command}
 The command failed with this error: {result.get('error', 'Unknown error')}
 
 Explain this error to the user conversationally like JARVIS would. Be brief (2-3 sentences), explain what went wrong, and suggest how to fix it. Address them as 'sir' if appropriate."""
-                                    
-                                    print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
-                                    conversational_response = self.generate_response(error_prompt)
-                                    print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
-                            
-                            self.save_interaction(user_input, response, command)
-                        else:
-                            print("\n\033[1;33m[Skipped]\033[0m Command not executed")
+                                
+                                print(f"\n\033[1;35m[WavesAI]\033[0m ➜ Analyzing error...", end='\r')
+                                conversational_response = self.generate_response(error_prompt, priority=PRIORITY_ERROR, task='error_explanation')
+                                print(f"\033[1;35m[WavesAI]\033[0m ➜ {conversational_response}                    ")
+                        
+                        self.save_interaction(user_input, response, command)
+                    else:
+                        print("\n\033[1;33m[Skipped]\033[0m Command not executed")
                 else:
                     self.save_interaction(user_input, response)
                 
@@ -3762,6 +4107,25 @@ Explain this error to the user conversationally like JARVIS would. Be brief (2-3
             except Exception as e:
                 print(f"\n\033[1;31m[Error]\033[0m {e}")
 
+def run_daemon():
+    """Serve the model, Whisper and caches to thin clients over a Unix socket"""
+    import signal
+    
+    ai = WavesAI()
+    server = ModelServer(ai, CONFIG["daemon_socket"], os.path.basename(CONFIG["model_path"]))
+    if server.socket_path.exists() and ModelClient(CONFIG["daemon_socket"]).ping():
+        print(f"\033[1;33m[Daemon]\033[0m Already running on {CONFIG['daemon_socket']}")
+        return
+    if not ai.start_llm_loading(use_daemon=False):
+        return
+    signal.signal(signal.SIGTERM, lambda *args: server.shutdown())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"\033[1;31m[Daemon]\033[0m {e}")
+
 def main():
     print("""
     ╦ ╦┌─┐┬  ┬┌─┐┌─┐╔═╗╦  
@@ -3770,7 +4134,13 @@ def main():
     Advanced AI Assistant System
     """)
     
-    ai = WavesAI()
+    if "--daemon" in sys.argv:
+        run_daemon()
+        return
+    
+    startup_profiler = StartupProfiler(enabled="--profile-startup" in sys.argv)
+    with startup_profiler.span("init"):
+        ai = WavesAI(startup_profiler)
     
     # Check for voice modes
     if any(arg in sys.argv for arg in ["--voice", "voice"]):
@@ -35,6 +35,7 @@ from modules.command_handler import CommandHandler
 from modules.search_engine import SearchEngine
 from modules.process_detector import ProcessDetector
 from modules.location_weather import LocationWeatherService
+from modules.model_server import DEFAULT_SOCKET, ModelClient
 
 class WavesAICLI:
     def __init__(self):
@@ -70,14 +71,16 @@ class WavesAICLI:
     
     def cmd_top(self, args):
         """Show top processes"""
-        processes = self.process_detector.get_all_processes()[:20]
+        processes = self.system_monitor.get_top_processes(args.count, args.sort)
         
-        print(f"\nTop 20 Processes:\n")
-        print(f"{'PID':<8} {'NAME':<30} {'CPU%':<8} {'MEM%':<8} {'USER':<12}")
-        print("="*70)
+        print(f"\nTop {len(processes)} Processes by {args.sort.upper()}:\n")
+        print(f"{'PID':<8} {'NAME':<30} {'CPU%':<8} {'MEM%':<8} {'IO/s':<10} {'USER':<12}")
+        print("="*80)
         
         for proc in processes:
-            print(f"{proc['pid']:<8} {proc['name'][:30]:<30} {proc['cpu']:<8} {proc['mem']:<8} {proc['user']:<12}")
+            io = f"{proc['io_rate'] / 1024:.0f}K" if proc['io_rate'] else "-"
+            print(f"{proc['pid']:<8} {proc['name'][:30]:<30} {proc['cpu_percent']:<8.1f} "
+                  f"{proc['memory_percent']:<8.1f} {io:<10} {proc['user'][:12]:<12}")
         print()
     
     def cmd_kill(self, args):
@@ -233,6 +236,383 @@ class WavesAICLI:
         except Exception as e:
             print(f"❌ Error viewing logs: {e}")
             print(f"📁 Log file location: {log_file}")
+    
+    def cmd_bench(self, args):
+        """Run a micro-benchmark"""
+        getattr(self, f'bench_{args.target}')(args)
+    
+    def bench_intent(self, args):
+        """Intent router: per-call cost and misroutes on the labelled fixtures"""
+        from modules.intent_router import benchmark, evaluate_fixtures
+        from modules.metrics_history import FIXTURES as HISTORY_FIXTURES, evaluate_fixtures as evaluate_history
+        
+        timing = benchmark(args.iterations)
+        result = evaluate_fixtures()
+        print("\n🧭 Intent Router Benchmark\n")
+        print(f"  Build:          {timing['build_ms']:.2f} ms (once at startup)")
+        print(f"  Route:          {timing['route_us']:.1f} µs/call")
+        print(f"  Legacy scans:   {timing['legacy_us']:.1f} µs/call")
+        print(f"\n  Misroutes:      {len(result['misroutes'])}/{result['total']}")
+        print(f"  Legacy misroutes: {len(result['legacy_misroutes'])}/{result['total']}")
+        for text, expected, got in result['misroutes']:
+            print(f"    ✗ \"{text}\" → {got} (expected {expected})")
+        history = evaluate_history()
+        print(f"  History misparses: {len(history)}/{len(HISTORY_FIXTURES)}")
+        for text, expected, got in history:
+            print(f"    ✗ \"{text}\" → {got} (expected {expected})")
+        if args.verbose:
+            for text, expected, got in result['legacy_misroutes']:
+                print(f"    legacy ✗ \"{text}\" → {got} (expected {expected})")
+        print()
+    
+    def bench_cache(self, args):
+        """Response cache: reuse decisions on the labelled near-miss pairs"""
+        from modules.response_cache import FIXTURES, evaluate_fixtures
+        
+        wrong = evaluate_fixtures()
+        print("\n🗃️  Response Cache Near Misses\n")
+        print(f"  Wrong reuse decisions: {len(wrong)}/{len(FIXTURES)}")
+        for cached, asked, expected, score in wrong:
+            verdict = "missed" if expected else "reused"
+            print(f"    ✗ \"{asked}\" {verdict} \"{cached}\" (similarity {score:.2f})")
+        print()
+    
+    def bench_processes(self, args):
+        """Process table: incremental refresh + top-N vs a fresh process_iter scan"""
+        from modules.process_table import benchmark
+        
+        result = benchmark(max(1, min(args.iterations, 50)))
+        print(f"\n🔎 Process Table Benchmark ({result['processes']} processes)\n")
+        print(f"  Incremental refresh + top 10: {result['incremental_ms']:.1f} ms")
+        print(f"  process_iter scan + sort:     {result['scan_ms']:.1f} ms")
+        print()
+    
+    def bench_detector(self, args):
+        """Process detector: /proc listing + cached scan vs `ps aux` + nested scans"""
+        from modules.process_detector import benchmark
+        
+        result = benchmark(max(1, min(args.iterations, 50)))
+        print(f"\n🔍 Process Detector Benchmark ({result['processes']} processes)\n")
+        print(f"  /proc listing:          {result['refresh_ms']:.1f} ms")
+        print(f"  ps aux listing:         {result['ps_ms']:.1f} ms")
+        print(f"  Lookup (cached list):   {result['lookup_ms']:.3f} ms")
+        print(f"  Legacy lookup:          {result['legacy_lookup_ms']:.1f} ms (ps aux + scan per call)")
+        differences = result['differences']
+        print(f"\n  Lookups that differ from legacy: {len(differences)}")
+        for name, diff in differences.items():
+            print(f"    ✗ {name}: missing {diff['missing']}, extra {diff['extra']}")
+        print()
+    
+    def _model_config(self) -> dict:
+        import json
+        with open(wavesai_dir / "config" / "config.json", 'r') as f:
+            return json.load(f)['model']
+    
+    def bench_speculative(self, args):
+        """Speculative decoding: tokens/sec and draft acceptance per mode on recorded news/wiki prompts"""
+        from llama_cpp import Llama
+        from modules.speculative import benchmark
+        
+        model_cfg = self._model_config()
+        draft_path = args.draft_model or model_cfg.get('speculative', {}).get('draft_model') or None
+        draft_path = os.path.expanduser(draft_path) if draft_path else None
+        modes = ['off', 'prompt_lookup'] + (['draft'] if draft_path else [])
+        
+        print("\n⚡ Speculative Decoding Benchmark\n")
+        print(f"  Model: {os.path.basename(model_cfg['path'])}")
+        if draft_path:
+            print(f"  Draft: {os.path.basename(draft_path)}")
+        llm = Llama(model_path=os.path.expanduser(model_cfg['path']), n_ctx=min(model_cfg.get('context_length', 4096), 4096),
+                    n_gpu_layers=model_cfg.get('gpu_layers', 0), n_threads=model_cfg.get('threads'),
+                    n_batch=model_cfg.get('batch_size', 512), logits_all=True, verbose=False)
+        
+        def progress(mode, r):
+            acceptance = f"{r['acceptance'] * 100:5.1f}%" if r['acceptance'] is not None else "    -"
+            print(f"  {mode:<14} {r['tokens_per_sec']:7.1f} tok/s   accepted {acceptance}   ({r['tokens']} tokens)")
+        
+        print()
+        results = benchmark(llm, modes, draft_path, args.max_tokens, args.prompts, progress=progress)
+        base = results['off']['tokens_per_sec']
+        if base:
+            best = max(results, key=lambda m: results[m]['tokens_per_sec'])
+            print(f"\n  Fastest: {best} ({results[best]['tokens_per_sec'] / base:.2f}x vs off)")
+        print()
+    
+    def bench_models(self, args):
+        """Model routing: latency per short-form task class on the main and the small model"""
+        from llama_cpp import Llama
+        from modules.model_router import benchmark, load_small_model
+        
+        model_cfg = self._model_config()
+        small_cfg = model_cfg.get('small', {})
+        small_path = args.small_model or small_cfg.get('path')
+        models = {'main': Llama(model_path=os.path.expanduser(model_cfg['path']),
+                                n_ctx=min(model_cfg.get('context_length', 4096), 4096),
+                                n_gpu_layers=model_cfg.get('gpu_layers', 0), n_threads=model_cfg.get('threads'),
+                                n_batch=model_cfg.get('batch_size', 512), verbose=False)}
+        
+        print("\n🔀 Model Routing Benchmark\n")
+        print(f"  Main:  {os.path.basename(model_cfg['path'])}")
+        if small_path:
+            print(f"  Small: {os.path.basename(small_path)}")
+            models['small'] = load_small_model(os.path.expanduser(small_path), small_cfg.get('context_length', 2048),
+                                               small_cfg.get('gpu_layers', 99), model_cfg.get('threads'))
+        else:
+            print("  Small: not configured (set model.small.path or pass --small-model)")
+        
+        def progress(name, task, r):
+            print(f"  {name:<6} {task:<22} first token {r['ttft_ms']:7.0f} ms   total {r['total_ms']:7.0f} ms"
+                  f"   ({r['tokens']} tokens)")
+        
+        print()
+        results = benchmark(models, args.repeats, progress=progress)
+        if 'small' in results:
+            print()
+            for task, r in results['small'].items():
+                if r['total_ms']:
+                    print(f"  {task:<22} {results['main'][task]['total_ms'] / r['total_ms']:.2f}x faster on the small model")
+        print()
+    
+    def _daemon_client(self) -> ModelClient:
+        """Client for the socket configured in config.json"""
+        import json
+        socket_path = DEFAULT_SOCKET
+        try:
+            with open(wavesai_dir / "config" / "config.json", 'r') as f:
+                socket_path = os.path.expanduser(json.load(f).get('daemon', {}).get('socket', DEFAULT_SOCKET))
+        except Exception:
+            pass
+        return ModelClient(socket_path)
+    
+    def cmd_daemon(self, args):
+        """Start, stop or inspect the background model server"""
+        import time
+        client = self._daemon_client()
+        info = client.ping()
+        
+        if args.action == 'status':
+            if not info:
+                print("\n⚪ WavesAI daemon is not running\n")
+                return
+            stats = client.request('stats')
+            print("\n🟢 WavesAI daemon running\n")
+            print(f"  PID:        {info['pid']}")
+            print(f"  Model:      {info.get('model', '?')} ({'ready' if info.get('ready') else 'loading'})")
+            print(f"  Whisper:    {'loaded' if stats.get('whisper_loaded') else 'not loaded'}")
+            print(f"  Uptime:     {int(stats['uptime'] // 60)} min")
+            print(f"  Requests:   {stats['requests']}")
+            print(f"  Socket:     {client.socket_path}\n")
+        
+        elif args.action == 'stop':
+            if not info:
+                print("⚪ WavesAI daemon is not running")
+                return
+            client.request('shutdown')
+            print(f"✓ Stopped WavesAI daemon (pid {info['pid']})")
+        
+        elif args.action == 'start':
+            if info:
+                print(f"✓ WavesAI daemon already running (pid {info['pid']})")
+                return
+            venv_python = venv_dir / "bin" / "python"
+            python = str(venv_python) if venv_python.exists() else sys.executable
+            log_file = wavesai_dir / "config" / "logs" / "daemon.log"
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_file, 'a') as log:
+                process = subprocess.Popen([python, str(wavesai_dir / "wavesai.py"), "--daemon"],
+                                           stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                           cwd=str(wavesai_dir), start_new_session=True)
+            # The socket comes up before the model finishes loading in the background
+            for _ in range(100):
+                time.sleep(0.1)
+                info = client.ping()
+                if info or process.poll() is not None:
+                    break
+            if info:
+                print(f"✓ WavesAI daemon started (pid {info['pid']}), loading model in the background")
+            else:
+                print(f"❌ WavesAI daemon did not start, see {log_file}")
+    
+    def cmd_ask(self, args):
+        """Ask the running daemon a question and stream the answer"""
+        client = self._daemon_client()
+        if not client.ping():
+            print("❌ WavesAI daemon is not running. Start it with: wavesctl daemon start")
+            return
+        print("\n🤖 ", end='', flush=True)
+        try:
+            # Plain text only: this prints tokens as they come and never runs actions
+            for token in client.stream(' '.join(args.question), allow_actions=False):
+                print(token, end='', flush=True)
+        except KeyboardInterrupt:
+            pass
+        except (OSError, RuntimeError) as e:
+            print(f"\n❌ {e}")
+        print("\n")
+    
+    def cmd_preset(self, args):
+        """List presets, or apply one live on the running daemon"""
+        import json
+        config_file = wavesai_dir / "config" / "config.json"
+        with open(config_file, 'r') as f:
+            cfg = json.load(f)
+        presets = cfg.get('presets', {})
+        client = self._daemon_client()
+        info = client.ping()
+        
+        if not args.name:
+            print("\n🎛️  Presets\n")
+            active = info.get('preset') if info else None
+            for name in ['default'] + list(presets):
+                mark = "●" if name == active else " "
+                values = ', '.join(f"{k}={v}" for k, v in presets.get(name, {}).items())
+                print(f"  {mark} {name:<18} {values or '(config.json settings)'}")
+            print()
+            return
+        if args.name != 'default' and args.name not in presets:
+            print(f"❌ Unknown preset: {args.name}")
+            return
+        
+        if args.save:
+            # Persist the model/generation values so every future start uses them
+            preset = presets.get(args.name, {})
+            for key in ('gpu_layers', 'threads', 'batch_size'):
+                if key in preset:
+                    cfg['model'][key] = preset[key]
+            if 'max_tokens' in preset:
+                cfg['generation']['max_tokens'] = preset['max_tokens']
+            with open(config_file, 'w') as f:
+                json.dump(cfg, f, indent=2, ensure_ascii=False)
+            print(f"✓ Saved {args.name} settings to {config_file}")
+        
+        if not info:
+            if not args.save:
+                print("⚪ WavesAI daemon is not running; start it with 'wavesctl daemon start' or use --save")
+            return
+        print(f"\n🎛️  Applying {args.name} on the daemon (pid {info['pid']})\n")
+        try:
+            for line in client.preset(args.name):
+                print(f"  {line}")
+        except (OSError, RuntimeError) as e:
+            print(f"❌ {e}")
+        print()
+    
+    def cmd_tune(self, args):
+        """Sweep llama.cpp runtime parameters and save the fastest stable settings"""
+        import json
+        from modules.llm_tuner import tune, write_settings
+        
+        config_file = Path(args.config) if args.config else wavesai_dir / "config" / "config.json"
+        try:
+            with open(config_file, 'r') as f:
+                model_cfg = json.load(f)['model']
+        except Exception as e:
+            print(f"❌ Could not read {config_file}: {e}")
+            return
+        model_path = os.path.expanduser(model_cfg['path'])
+        if not os.path.exists(model_path):
+            print(f"❌ Model not found at: {model_path}")
+            return
+        
+        print("\n⚙️  llama.cpp Auto-Tune\n")
+        print(f"  Model:   {os.path.basename(model_path)}")
+        print(f"  Current: threads={model_cfg.get('threads')} batch={model_cfg.get('batch_size', 512)} "
+              f"gpu_layers={model_cfg.get('gpu_layers')}\n")
+        
+        def progress(r):
+            label = f"threads={r['threads']:<3} batch={r['batch_size']:<5} gpu_layers={r['gpu_layers']:<3}"
+            if not r['ok']:
+                print(f"  ✗ {label} failed: {r.get('error', 'unknown error')}")
+                return
+            mark = "✓" if r['stable'] else "~"
+            print(f"  {mark} {label} prompt {r['prompt_tps']:7.1f} tok/s  gen {r['gen_tps']:6.1f} tok/s  "
+                  f"turn {r['turn_s']:5.2f}s  spread {r['spread'] * 100:4.1f}%")
+        
+        try:
+            best = tune(model_path, min(model_cfg.get('context_length', 4096), 4096), model_cfg,
+                        quick=args.quick, repeats=args.repeats, progress=progress)
+        except KeyboardInterrupt:
+            print("\n✓ Tuning cancelled, config unchanged")
+            return
+        
+        if not best:
+            print("\n❌ No stable configuration found, config unchanged")
+            return
+        print(f"\n  Best: threads={best['threads']} batch={best['batch_size']} gpu_layers={best['gpu_layers']} "
+              f"({best['turn_s']:.2f}s per typical turn)")
+        if args.dry_run:
+            print("  (dry run, config unchanged)\n")
+            return
+        backup = write_settings(config_file, best)
+        print(f"  ✓ Saved to {config_file} (previous config: {backup.name})\n")
+    
+    def cmd_perf(self, args):
+        """p50/p95 of recorded LLM turn timings (prompt eval, first token, tokens/sec, ...)"""
+        import json
+        import time
+        from modules.perf_metrics import PerfMetrics, summarize, format_summary
+        
+        db_path = wavesai_dir / "config" / "memory.db"
+        try:
+            with open(wavesai_dir / "config" / "config.json", 'r') as f:
+                db_path = Path(os.path.expanduser(json.load(f)['paths']['database']))
+        except Exception:
+            pass
+        if not db_path.exists():
+            print(f"❌ No metrics database at {db_path}")
+            return
+        since = None if args.all else time.time() - args.hours * 3600
+        rows = PerfMetrics(str(db_path)).load(since=since, limit=args.last)
+        if args.model:
+            rows = [r for r in rows if r.get('model') == args.model]
+        window = "all time" if args.all else f"last {args.hours:g}h"
+        print(f"\n📈 LLM Performance ({len(rows)} turns, {window})\n")
+        for line in format_summary(summarize(rows)):
+            print(line)
+        if args.verbose and rows:
+            print()
+            for r in rows[-10:]:
+                when = time.strftime('%H:%M:%S', time.localtime(r['created_at']))
+                ttft = f"{r['ttft_ms']:.0f}ms" if r.get('ttft_ms') is not None else "-"
+                rate = f"{r['tokens_per_sec']:.1f} tok/s" if r.get('tokens_per_sec') else "-"
+                print(f"  {when}  {r.get('name', '?'):<16} {r.get('intent') or '-':<9} {r.get('status', '?'):<9} "
+                      f"first token {ttft:>7}  {rate}")
+        print()
+
+    def cmd_history(self, args):
+        """Min/avg/max/p95 of the sampled system metrics over a recent window"""
+        import re
+        import json
+        import time
+        from modules.metrics_history import METRICS, MetricsHistory
+        
+        match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhd]?)", args.window.strip().lower())
+        if not match:
+            print(f"❌ Window must look like 30m, 2h or 1d, not {args.window!r}")
+            return
+        window = float(match.group(1)) * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}.get(match.group(2), 60)
+        cache_dir = wavesai_dir / "cache"
+        try:
+            with open(wavesai_dir / "config" / "config.json", 'r') as f:
+                cache_dir = Path(os.path.expanduser(json.load(f)['paths']['cache_dir']))
+        except Exception:
+            pass
+        history = MetricsHistory(str(cache_dir / "metrics_history.npz"))
+        if not history.load():
+            print(f"❌ No metrics history at {cache_dir / 'metrics_history.npz'} (it is written while WavesAI runs)")
+            return
+        
+        print(f"\n📊 System History (last {args.window})\n")
+        print(f"  {'':<18} {'avg':>8} {'min':>8} {'max':>8} {'p95':>8}   peak at")
+        for metric in ([args.metric] if args.metric else METRICS):
+            s = history.stats(metric, window)
+            if not s:
+                continue
+            label, unit = METRICS[metric]
+            peak = time.strftime('%H:%M:%S', time.localtime(s['max_at']))
+            print(f"  {label + (f' ({unit})' if unit else ''):<18} {s['avg']:8.1f} {s['min']:8.1f} "
+                  f"{s['max']:8.1f} {s['p95']:8.1f}   {peak}")
+        print()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -242,7 +622,8 @@ def main():
                '  wavesctl status             # Show system status\n'
                '  wavesctl top                # Show top processes\n'
                '  wavesctl weather Mumbai     # Get weather\n'
-               '  wavesctl search "AI"        # Search web\n',
+               '  wavesctl search "AI"        # Search web\n'
+               '  wavesctl daemon start       # Keep the model loaded for all clients\n',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -267,6 +648,8 @@ def main():
     
     # Top command
     top_parser = subparsers.add_parser('top', help='Show top processes')
+    top_parser.add_argument('-n', '--count', type=int, default=20, help='How many processes to show')
+    top_parser.add_argument('--sort', choices=['cpu', 'mem', 'io'], default='cpu', help='Sort by CPU, memory or disk IO')
     
     # Kill command
     kill_parser = subparsers.add_parser('kill', help='Kill a process by name')
@@ -294,6 +677,51 @@ def main():
     location_parser = subparsers.add_parser('location', help='Get current location information')
     location_parser.add_argument('-r', '--refresh', action='store_true', help='Force refresh location detection')
     
+    # Bench command
+    bench_parser = subparsers.add_parser('bench', help='Run a performance benchmark')
+    bench_parser.add_argument('target', choices=['intent', 'cache', 'speculative', 'models', 'processes', 'detector'], help='What to benchmark')
+    bench_parser.add_argument('-n', '--iterations', type=int, default=2000, help='Iterations per measurement')
+    bench_parser.add_argument('-v', '--verbose', action='store_true', help='Show more detail')
+    bench_parser.add_argument('--max-tokens', type=int, default=256, help='Tokens generated per prompt (speculative)')
+    bench_parser.add_argument('--draft-model', help='Draft GGUF to compare (speculative)')
+    bench_parser.add_argument('--prompts', help='Extra JSONL prompts with kind/context/question (speculative)')
+    bench_parser.add_argument('--small-model', help='Small GGUF to compare against the main model (models)')
+    bench_parser.add_argument('--repeats', type=int, default=3, help='Runs per task class (models)')
+    
+    # Daemon command
+    daemon_parser = subparsers.add_parser('daemon', help='Manage the background model server')
+    daemon_parser.add_argument('action', choices=['start', 'stop', 'status'], nargs='?', default='status')
+    
+    # Ask command
+    ask_parser = subparsers.add_parser('ask', help='Ask the running daemon a question')
+    ask_parser.add_argument('question', nargs='+', help='Question to ask')
+    
+    # Preset command
+    preset_parser = subparsers.add_parser('preset', help='List presets or switch the daemon to one live')
+    preset_parser.add_argument('name', nargs='?', help='Preset to apply (power_saver, performance, mission_mode, default)')
+    preset_parser.add_argument('--save', action='store_true', help="Also write the preset's model settings to config.json")
+    
+    # Perf command
+    perf_parser = subparsers.add_parser('perf', help='Show p50/p95 LLM timings from recorded turns')
+    perf_parser.add_argument('--hours', type=float, default=24, help='Only turns from the last N hours')
+    perf_parser.add_argument('--all', action='store_true', help='Use every recorded turn')
+    perf_parser.add_argument('--last', type=int, help='Only the last N turns')
+    perf_parser.add_argument('--model', choices=['main', 'small'], help='Only turns served by this model')
+    perf_parser.add_argument('-v', '--verbose', action='store_true', help='Also list the most recent turns')
+    
+    # History command
+    history_parser = subparsers.add_parser('history', help='Show CPU/RAM/GPU trends recorded while WavesAI runs')
+    history_parser.add_argument('metric', nargs='?', choices=['cpu', 'ram', 'swap', 'disk', 'load', 'cpu_temp', 'gpu',
+                                                              'vram', 'gpu_temp'], help='Only this metric')
+    history_parser.add_argument('--window', default='1h', help='How far back to look, e.g. 10m, 2h, 1d (default 1h)')
+    
+    # Tune command
+    tune_parser = subparsers.add_parser('tune', help='Find the fastest llama.cpp settings for this machine')
+    tune_parser.add_argument('--quick', action='store_true', help='Sweep fewer values')
+    tune_parser.add_argument('--repeats', type=int, default=2, help='Runs of the prompt set per setting')
+    tune_parser.add_argument('--dry-run', action='store_true', help='Report the best settings without saving them')
+    tune_parser.add_argument('--config', help='Config file to update (default: ~/.wavesai/config/config.json)')
+    
     args = parser.parse_args()
     
     # Default to 'start' if no command provided